@@ -0,0 +1,134 @@
+"""
+Compare the active JSON codec against the standard library on EventSub frames.
+
+The 'decode' rows time the active codec against the standard library. The
+'Message.parse' rows time parsing a frame into a Message against a plain decode of
+the same frame with the active codec, showing the overhead of building a Message.
+
+Usage:
+    python benchmarks/codec_benchmark.py [rounds]
+
+Install the 'fast' extra (orjson) to see the difference; without it both sides of
+the 'decode' rows use the standard library.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from eggbot_twitch import _codec
+from eggbot_twitch.twitchevent import Message
+
+# A channel.chat.message notification as delivered by the EventSub websocket
+NOTIFICATION_FRAME = json.dumps(
+    {
+        "metadata": {
+            "message_id": "befa7b53-d79d-478f-86b9-120f112b044e",
+            "message_type": "notification",
+            "message_timestamp": "2023-11-16T10:11:12.464757833Z",
+            "subscription_type": "channel.chat.message",
+            "subscription_version": "1",
+        },
+        "payload": {
+            "subscription": {
+                "id": "0b7f3361-672b-4d39-b307-dd5b576c9b27",
+                "status": "enabled",
+                "type": "channel.chat.message",
+                "version": "1",
+                "condition": {"broadcaster_user_id": "1971641", "user_id": "2914196"},
+                "transport": {"method": "websocket", "session_id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB"},
+                "created_at": "2023-11-06T18:11:47.492253549Z",
+                "cost": 0,
+            },
+            "event": {
+                "broadcaster_user_id": "1971641",
+                "broadcaster_user_login": "streamer",
+                "broadcaster_user_name": "streamer",
+                "chatter_user_id": "4145994",
+                "chatter_user_login": "viewer32",
+                "chatter_user_name": "viewer32",
+                "message_id": "cc106a89-1814-919d-454c-f4f2f970aae7",
+                "message": {
+                    "text": "Hi chat",
+                    "fragments": [
+                        {
+                            "type": "text",
+                            "text": "Hi chat",
+                            "cheermote": None,
+                            "emote": None,
+                            "mention": None,
+                        }
+                    ],
+                },
+                "color": "#00FF7F",
+                "badges": [
+                    {"set_id": "moderator", "id": "1", "info": ""},
+                    {"set_id": "subscriber", "id": "12", "info": "16"},
+                    {"set_id": "sub-gifter", "id": "1", "info": ""},
+                ],
+                "message_type": "text",
+                "cheer": None,
+                "reply": None,
+                "channel_points_custom_reward_id": None,
+            },
+        },
+    }
+)
+
+KEEPALIVE_FRAME = json.dumps(
+    {
+        "metadata": {
+            "message_id": "84c1e79a-2a4b-4c13-ba0b-4312293e9308",
+            "message_type": "session_keepalive",
+            "message_timestamp": "2023-07-19T10:11:12.634234626Z",
+        },
+        "payload": {},
+    }
+)
+
+
+def _time(function: Callable[[], Any], rounds: int) -> float:
+    """Return the best per-call time in microseconds over five repeats."""
+    return min(timeit.repeat(function, number=rounds, repeat=5)) / rounds * 1_000_000
+
+
+def main(rounds: int = 50_000) -> None:
+    cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        (
+            "decode notification",
+            lambda: _codec._stdlib_loads(NOTIFICATION_FRAME),
+            lambda: _codec.loads(NOTIFICATION_FRAME),
+        ),
+        (
+            "decode keepalive",
+            lambda: _codec._stdlib_loads(KEEPALIVE_FRAME),
+            lambda: _codec.loads(KEEPALIVE_FRAME),
+        ),
+        (
+            "Message.parse notification",
+            lambda: _codec.loads(NOTIFICATION_FRAME)["payload"],
+            lambda: Message.parse(NOTIFICATION_FRAME).payload,
+        ),
+        (
+            "Message.parse keepalive",
+            lambda: _codec.loads(KEEPALIVE_FRAME)["metadata"]["message_type"],
+            lambda: Message.parse(KEEPALIVE_FRAME).message_type,
+        ),
+    ]
+
+    print(f"codec backend: {_codec.BACKEND}, {rounds} rounds")
+    print(f"{'case':<28}{'baseline (us)':>15}{'candidate (us)':>16}{'speedup':>10}")
+
+    for name, baseline, candidate in cases:
+        baseline_us = _time(baseline, rounds)
+        candidate_us = _time(candidate, rounds)
+        speedup = baseline_us / candidate_us
+        print(f"{name:<28}{baseline_us:>15.2f}{candidate_us:>16.2f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,42 @@
+"""
+JSON codec shared by the auth, API and event modules.
+
+Uses orjson when it is installed (pip install eggbot-twitch[fast]), falling back to
+the standard library json module otherwise. Both implementations raise a subclass
+of json.JSONDecodeError on invalid input.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+__all__ = ["BACKEND", "dumps", "loads"]
+
+
+def _stdlib_loads(data: str | bytes) -> Any:
+    """Deserialize a JSON document using the standard library."""
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes using the standard library."""
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+loads: Callable[[str | bytes], Any]
+dumps: Callable[[Any], bytes]
+
+try:
+    import orjson
+
+except ImportError:  # pragma: no cover
+    BACKEND = "json"
+    loads = _stdlib_loads
+    dumps = _stdlib_dumps
+
+else:
+    BACKEND = "orjson"
+    loads = orjson.loads
+    dumps = orjson.dumps
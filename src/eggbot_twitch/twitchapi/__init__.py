@@ -1,11 +1,53 @@
 from __future__ import annotations
 
+from ._asyncclient import AsyncAPIClient
+from ._asyncusers import async_get_users_bulk
+from ._asyncusers import async_get_users_raw
+from ._authpool import AuthPool
+from ._client import APIClient
+from ._client import get_default_client
+from ._eventsub import BulkResult
+from ._eventsub import SubscriptionRequest
+from ._eventsub import create_subscription
+from ._eventsub import create_subscriptions_bulk
+from ._eventsub import delete_subscription
+from ._eventsub import delete_subscriptions_bulk
+from ._eventsub import get_subscriptions
+from ._eventsub import get_subscriptions_raw
 from ._exceptions import BadRequestError
+from ._exceptions import NoTokensError
 from ._exceptions import UnauthorizedError
+from ._paginate import Paginator
+from ._ratelimit import Priority
+from ._ratelimit import RateLimiter
+from ._usercache import CacheStats
+from ._usercache import UserCache
+from ._users import get_users_bulk
 from ._users import get_users_raw
 
 __all__ = [
+    "APIClient",
+    "AsyncAPIClient",
+    "AuthPool",
     "BadRequestError",
+    "BulkResult",
+    "CacheStats",
+    "NoTokensError",
+    "Paginator",
+    "Priority",
+    "RateLimiter",
+    "SubscriptionRequest",
     "UnauthorizedError",
+    "UserCache",
+    "async_get_users_bulk",
+    "async_get_users_raw",
+    "create_subscription",
+    "create_subscriptions_bulk",
+    "delete_subscription",
+    "delete_subscriptions_bulk",
+    "get_default_client",
+    "get_subscriptions",
+    "get_subscriptions_raw",
+    "get_users_bulk",
     "get_users_raw",
 ]
@@ -0,0 +1,172 @@
+"""Pooled asyncio HTTP client that async Helix API calls are sent through."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .. import _codec
+from ._client import _BASE_URL
+from ._client import _DEFAULT_MAX_RETRIES
+from ._client import _DEFAULT_POOL_SIZE
+from ._client import error_from_response
+from ._client import refresh_auth
+
+_DEFAULT_THROTTLE_SECONDS = 1.0
+
+logger = logging.getLogger("twitchapi")
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Any
+    from typing import Self
+
+    from ._client import AuthType
+
+
+class AsyncAPIClient:
+    """
+    Asyncio counterpart of APIClient, holding a pooled, keep-alive httpx.AsyncClient.
+
+    All requests share one connection pool, allowing many concurrent calls to run on a
+    single event loop. Responses of 429 Too Many Requests are retried up to max_retries
+    times once the reported Ratelimit-Reset time passes.
+
+    The client is bound to the event loop it is first used in. Close it with 'aclose',
+    or use it as an async context manager.
+
+    Args:
+        pool_size: Maximum number of connections open to the API at the same time.
+        keep_alive: When False, connections are closed after each request.
+        base_url: Root url of the Helix API.
+        max_retries: Number of times a rate limited request is retried.
+        transport: Optional httpx transport replacing the default network transport.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        base_url: str = _BASE_URL,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.base_url = base_url
+        self.max_retries = max_retries
+
+        limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if keep_alive else 0,
+        )
+
+        self.session = httpx.AsyncClient(limits=limits, transport=transport)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.session.aclose()
+
+    async def get(
+        self,
+        path: str,
+        auth: AuthType,
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Send a GET request to the API and return the decoded JSON body.
+
+        Args:
+            path: Endpoint path relative to the base url (e.g. '/users')
+            auth: Any Auth object that provides an 'access_token' attribute.
+            params: Query parameters of the request.
+
+        Raises:
+            UnauthorizedError: On a 401 response
+            BadRequestError: On any other failed response
+        """
+        return await self.request("GET", path, auth, params=params)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        auth: AuthType,
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Send a request to the API and return the decoded JSON body.
+
+        If auth is refreshable, as a TokenManager, a 401 response refreshes it and the
+        request is replayed once with the new token.
+
+        Args:
+            method: HTTP method of the request
+            path: Endpoint path relative to the base url (e.g. '/users')
+            auth: Any Auth object that provides an 'access_token' attribute.
+            params: Query parameters of the request.
+
+        Raises:
+            UnauthorizedError: On a 401 response
+            BadRequestError: On any other failed response
+        """
+        url = self.base_url + path
+        refreshed = False
+        retry_count = 0
+
+        while True:
+            sent_token = auth.access_token
+            response = await self.session.request(
+                method,
+                url,
+                params=params,
+                headers=auth.headers,
+            )
+
+            if response.status_code == 401 and not refreshed:
+                refreshed = True
+
+                # Refreshing blocks on a token request, so it runs off the event loop
+                if await asyncio.to_thread(refresh_auth, auth, sent_token):
+                    continue
+
+                break
+
+            if response.status_code != 429 or retry_count >= self.max_retries:
+                break
+
+            retry_count += 1
+            logger.warning("Rate limited: Retry %d of %d", retry_count, self.max_retries)
+            await asyncio.sleep(_seconds_until_reset(response.headers))
+
+        if not response.is_success:
+            raise error_from_response(response.status_code, str(response.url), response.content)
+
+        return _codec.loads(response.content)
+
+
+def _seconds_until_reset(headers: httpx.Headers) -> float:
+    """Internal: Seconds until the Ratelimit-Reset time of a response."""
+    try:
+        return max(0.0, float(headers["Ratelimit-Reset"]) - time.time())
+
+    except (KeyError, ValueError):
+        return _DEFAULT_THROTTLE_SECONDS
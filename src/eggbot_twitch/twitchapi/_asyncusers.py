@@ -0,0 +1,98 @@
+"""Talk to the API's User category from asyncio code."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from ._users import _DEFAULT_MAX_WORKERS
+from ._users import _MAX_USERS_PER_REQUEST
+from ._users import merge_lookups
+from ._users import split_lookups
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Any
+
+    from ._asyncclient import AsyncAPIClient
+    from ._client import AuthType
+    from ._usercache import UserCache
+
+
+async def async_get_users_raw(
+    auth: AuthType,
+    *,
+    client: AsyncAPIClient,
+    user_ids: Sequence[str] | None = None,
+    user_logins: Sequence[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Get raw response of user data given a maximum of 100 user ids or user logins.
+
+    Source:
+        https://dev.twitch.tv/docs/api/reference/#get-users
+
+    Authorization:
+        Requires an app access token or user access token.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute.
+        client: The AsyncAPIClient to send the request through.
+        user_ids: A sequence of string user ids.
+        user_logins: A sequence of string user logins (user names).
+    """
+    if len(user_ids or []) + len(user_logins or []) > _MAX_USERS_PER_REQUEST:
+        raise ValueError("Total number of user_ids and user_logins exceeded 100.")
+
+    params = {
+        "id": list(user_ids) if user_ids else [],
+        "login": list(user_logins) if user_logins else [],
+    }
+
+    return await client.get("/users", auth, params=params)
+
+
+async def async_get_users_bulk(
+    auth: AuthType,
+    *,
+    client: AsyncAPIClient,
+    user_ids: Sequence[str] | None = None,
+    user_logins: Sequence[str] | None = None,
+    max_concurrency: int = _DEFAULT_MAX_WORKERS,
+    cache: UserCache | None = None,
+) -> dict[str, Any]:
+    """
+    Get user data for any number of user ids or user logins.
+
+    Behaves as get_users_bulk, with batches requested as concurrent tasks instead of
+    on a thread pool.
+
+    Source:
+        https://dev.twitch.tv/docs/api/reference/#get-users
+
+    Authorization:
+        Requires an app access token or user access token.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute.
+        client: The AsyncAPIClient to send the requests through.
+        user_ids: A sequence of string user ids.
+        user_logins: A sequence of string user logins (user names).
+        max_concurrency: Maximum number of batches requested at the same time.
+        cache: A UserCache to serve lookups from, and to store fetched users in.
+    """
+    cached, batches = split_lookups(user_ids, user_logins, cache)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(batch: tuple[list[str], list[str]]) -> dict[str, Any]:
+        async with semaphore:
+            return await async_get_users_raw(
+                auth,
+                client=client,
+                user_ids=batch[0],
+                user_logins=batch[1],
+            )
+
+    results = await asyncio.gather(*(fetch(batch) for batch in batches))
+
+    return merge_lookups(cached, results, cache)
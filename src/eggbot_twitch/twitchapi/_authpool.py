@@ -0,0 +1,165 @@
+"""Spread API requests across several tokens, each with its own rate limit."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from ._exceptions import NoTokensError
+from ._ratelimit import _DEFAULT_LIMIT
+from ._ratelimit import _DEFAULT_WINDOW_SECONDS
+from ._ratelimit import Priority
+from ._ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ._client import AuthType
+
+logger = logging.getLogger("twitchapi")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _PoolEntry:
+    """Internal: A token in rotation and the limiter pacing it."""
+
+    auth: AuthType
+    rate_limiter: RateLimiter
+
+
+class AuthPool:
+    """
+    Pool of tokens handing each request the one with the most remaining budget.
+
+    Helix rate limits apply per token, so spreading requests over several tokens
+    multiplies the requests that can be sent per window. Each token is paced by its
+    own RateLimiter, kept current from the Ratelimit-* headers of the responses sent
+    with it. Ties go to the token added first.
+
+    Tokens whose 'expires_at' has passed are pulled out of rotation when next
+    considered. An APIClient retires a token refused with a 401 that cannot be
+    refreshed, then replays the request with another token. Once none are left,
+    requests raise NoTokensError, an UnauthorizedError.
+
+    Pass the pool to an APIClient call, or any sync twitchapi function, in place of
+    an Auth. The client's own rate limiters are not used for pooled requests.
+
+    Args:
+        auths: The initial tokens. Any Auth object, or a TokenManager.
+        limit: Size of each token's bucket until a response reports otherwise.
+        window_seconds: Number of seconds for an empty bucket to refill.
+    """
+
+    def __init__(
+        self,
+        auths: Iterable[AuthType] = (),
+        *,
+        limit: int = _DEFAULT_LIMIT,
+        window_seconds: float = _DEFAULT_WINDOW_SECONDS,
+    ) -> None:
+        self._limit = limit
+        self._window_seconds = window_seconds
+        self._entries: list[_PoolEntry] = []
+        self._lock = threading.Lock()
+
+        for auth in auths:
+            self.add(auth)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def auths(self) -> list[AuthType]:
+        """The tokens in rotation."""
+        with self._lock:
+            return [entry.auth for entry in self._entries]
+
+    def add(self, auth: AuthType, rate_limiter: RateLimiter | None = None) -> None:
+        """
+        Put a token into rotation. Does nothing if it already is.
+
+        Args:
+            auth: Any Auth object that provides an 'access_token' attribute.
+            rate_limiter: Limiter pacing the token. Pass the limiter of another client
+                using the same token to share its budget. Created if not provided.
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(limit=self._limit, window_seconds=self._window_seconds)
+
+        with self._lock:
+            if self._find(auth) is None:
+                self._entries.append(_PoolEntry(auth, rate_limiter))
+
+    def retire(self, auth: AuthType) -> None:
+        """Pull a token out of rotation, such as after it was revoked."""
+        with self._lock:
+            entry = self._find(auth)
+
+            if entry is not None:
+                self._entries.remove(entry)
+                logger.warning(
+                    "Retired token of client %s, %d left", auth.client_id, len(self._entries)
+                )
+
+    def rate_limiter(self, auth: AuthType) -> RateLimiter:
+        """
+        The limiter pacing a token.
+
+        Raises:
+            KeyError: If the token is not in rotation.
+        """
+        with self._lock:
+            entry = self._find(auth)
+
+        if entry is None:
+            raise KeyError("Token is not in rotation.")
+
+        return entry.rate_limiter
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE) -> tuple[AuthType, RateLimiter]:
+        """
+        Pick the token with the most remaining budget and wait for a request slot on it.
+
+        Returns:
+            The token to send the request with, and the limiter to update from its
+            response.
+
+        Raises:
+            NoTokensError: If no unexpired token is in rotation.
+        """
+        now = time.time()
+
+        with self._lock:
+            expired = [entry for entry in self._entries if _expired(entry.auth, now)]
+
+            for entry in expired:
+                self._entries.remove(entry)
+                logger.warning("Retired expired token of client %s", entry.auth.client_id)
+
+            if not self._entries:
+                raise NoTokensError(
+                    status_code=401,
+                    url="Undefined",
+                    error="Unauthorized",
+                    message="No tokens in rotation.",
+                )
+
+            entry = max(self._entries, key=lambda each: each.rate_limiter.remaining)
+
+        entry.rate_limiter.acquire(priority)
+
+        return entry.auth, entry.rate_limiter
+
+    def _find(self, auth: AuthType) -> _PoolEntry | None:
+        """Internal: The entry of a token, by identity. Caller holds the lock."""
+        return next((entry for entry in self._entries if entry.auth is auth), None)
+
+
+def _expired(auth: AuthType, now: float) -> bool:
+    """Internal: True if the token reports an 'expires_at' that has passed."""
+    expires_at = getattr(auth, "expires_at", None)
+    return expires_at is not None and expires_at <= now
@@ -0,0 +1,417 @@
+"""Pooled HTTP client that all Helix API calls are sent through."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+import requests
+import requests.adapters
+
+from .. import _codec
+from ._authpool import AuthPool
+from ._exceptions import BadRequestError
+from ._exceptions import TwitchAPIError
+from ._exceptions import UnauthorizedError
+from ._paginate import Paginator
+from ._ratelimit import Priority
+from ._ratelimit import RateLimiter
+
+_BASE_URL = "https://api.twitch.tv/helix"
+_DEFAULT_POOL_SIZE = 10
+_DEFAULT_MAX_RETRIES = 3
+
+logger = logging.getLogger("twitchapi")
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+    from typing import Any
+    from typing import Protocol
+    from typing import Self
+
+    class AuthType(Protocol):
+        """Any Auth object that provides an 'access_token' attribute."""
+
+        @property
+        def access_token(self) -> str: ...
+
+        @property
+        def client_id(self) -> str: ...
+
+        @property
+        def headers(self) -> dict[str, str]: ...
+
+    Credentials = AuthType | AuthPool
+
+
+class APIClient:
+    """
+    Reusable client holding a pooled, keep-alive requests.Session for the Helix API.
+
+    Connections to the API are kept open and reused between calls, avoiding a new
+    TCP connection and TLS handshake on every request.
+
+    Helix rate limits apply per token, so by default each token gets a RateLimiter of
+    its own, created on its first request and kept for as long as the auth object is
+    alive. A refreshed auth that keeps its identity, such as a TokenManager, keeps its
+    limiter along with any 429 hold on it. Every request waits on the limiter of its token before being sent. Responses of
+    429 Too Many Requests hold the token's requests until the reported reset time,
+    then are retried up to max_retries times.
+
+    Args:
+        pool_size: Maximum number of connections kept open to the API. Should be at
+            least the number of threads expected to share the client.
+        keep_alive: When False, connections are closed after each request.
+        base_url: Root url of the Helix API.
+        rate_limiter: Scheduler pacing every request, whatever its token. Only for a
+            client used with a single token, such as to share the limiter with
+            another client using it. One RateLimiter per token when not provided.
+        max_retries: Number of times a rate limited request is retried.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        base_url: str = _BASE_URL,
+        rate_limiter: RateLimiter | None = None,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+    ) -> None:
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self._rate_limiters: dict[int, tuple[Callable[[], object], RateLimiter]] = {}
+        self._rate_limiters_lock = threading.RLock()
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+    def rate_limiter_for(self, auth: AuthType) -> RateLimiter:
+        """
+        The limiter pacing requests sent with a token, created on first use.
+
+        Always the client's rate_limiter, if one was given.
+        """
+        if self.rate_limiter is not None:
+            return self.rate_limiter
+
+        key = id(auth)
+
+        with self._rate_limiters_lock:
+            entry = self._rate_limiters.get(key)
+
+            if entry is not None and entry[0]() is auth:
+                return entry[1]
+
+            rate_limiter = RateLimiter()
+            self._rate_limiters[key] = (self._reference(key, auth), rate_limiter)
+
+        return rate_limiter
+
+    def _reference(self, key: int, auth: AuthType) -> Callable[[], object]:
+        """Weak reference to auth that drops its limiter once auth is collected."""
+
+        def forget(reference: weakref.ref[AuthType]) -> None:
+            with self._rate_limiters_lock:
+                entry = self._rate_limiters.get(key)
+
+                if entry is not None and entry[0] is reference:
+                    del self._rate_limiters[key]
+
+        try:
+            return weakref.ref(auth, forget)
+
+        except TypeError:
+            # Auth objects without weak reference support are kept for the client's life
+            return lambda: auth
+
+    def get(
+        self,
+        path: str,
+        auth: Credentials,
+        *,
+        params: dict[str, Any] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> dict[str, Any]:
+        """
+        Send a GET request to the API and return the decoded JSON body.
+
+        Args:
+            path: Endpoint path relative to the base url (e.g. '/users')
+            auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+            params: Query parameters of the request.
+            priority: Order in which the request is released when rate limited.
+
+        Raises:
+            UnauthorizedError: On a 401 response
+            BadRequestError: On any other failed response
+        """
+        return self.request("GET", path, auth, params=params, priority=priority)
+
+    def paginate(
+        self,
+        path: str,
+        auth: Credentials,
+        *,
+        params: dict[str, Any] | None = None,
+        after: str | None = None,
+        max_pages: int | None = None,
+        prefetch: bool = True,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Paginator:
+        """
+        Return a Paginator lazily yielding every item of a Helix list endpoint.
+
+        Args:
+            path: Endpoint path relative to the base url (e.g. '/channels/followers')
+            auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+            params: Query parameters sent with every page, such as 'first'.
+            after: Cursor to resume from, as saved from 'cursor' of an earlier Paginator.
+            max_pages: Stop after this many pages. Walks every page if None.
+            prefetch: Request the next page while the current one is being handled.
+            priority: Order in which the requests are released when rate limited.
+        """
+
+        def fetch(cursor: str | None) -> dict[str, Any]:
+            page_params = dict(params or {})
+            if cursor is not None:
+                page_params["after"] = cursor
+
+            return self.get(path, auth, params=page_params, priority=priority)
+
+        return Paginator(fetch, after=after, max_pages=max_pages, prefetch=prefetch)
+
+    def post(
+        self,
+        path: str,
+        auth: Credentials,
+        *,
+        json: dict[str, Any] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> dict[str, Any]:
+        """
+        Send a POST request with a JSON body to the API and return the decoded JSON body.
+
+        Args:
+            path: Endpoint path relative to the base url (e.g. '/eventsub/subscriptions')
+            auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+            json: Body of the request, encoded as JSON.
+            priority: Order in which the request is released when rate limited.
+
+        Raises:
+            UnauthorizedError: On a 401 response
+            BadRequestError: On any other failed response
+        """
+        return self.request("POST", path, auth, json=json, priority=priority)
+
+    def delete(
+        self,
+        path: str,
+        auth: Credentials,
+        *,
+        params: dict[str, Any] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> dict[str, Any]:
+        """
+        Send a DELETE request to the API and return the decoded JSON body, if any.
+
+        Args:
+            path: Endpoint path relative to the base url (e.g. '/eventsub/subscriptions')
+            auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+            params: Query parameters of the request.
+            priority: Order in which the request is released when rate limited.
+
+        Raises:
+            UnauthorizedError: On a 401 response
+            BadRequestError: On any other failed response
+        """
+        return self.request("DELETE", path, auth, params=params, priority=priority)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        auth: Credentials,
+        *,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> dict[str, Any]:
+        """
+        Send a request to the API and return the decoded JSON body.
+
+        An empty body, such as that of a 204 response, is returned as an empty dict.
+
+        If auth is refreshable, as a TokenManager, a 401 response refreshes it and the
+        request is replayed once with the new token. Each token of an AuthPool gets
+        its own refresh.
+
+        Given an AuthPool, each attempt is sent with the token it picks and paced by
+        that token's limiter. A pooled token refused with a 401, and not refreshed, is
+        retired and the request replayed with another while any remain.
+
+        Args:
+            method: HTTP method of the request
+            path: Endpoint path relative to the base url (e.g. '/users')
+            auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+            params: Query parameters of the request.
+            json: Body of the request, encoded as JSON.
+            priority: Order in which the request is released when rate limited.
+
+        Raises:
+            UnauthorizedError: On a 401 response
+            NoTokensError: If an AuthPool has no token left
+            BadRequestError: On any other failed response
+        """
+        url = self.base_url + path
+        body = _codec.dumps(json) if json is not None else None
+        # Ids of the tokens already refreshed, each is refreshed at most once
+        refreshed: set[int] = set()
+        retry_count = 0
+
+        while True:
+            if isinstance(auth, AuthPool):
+                token, rate_limiter = auth.acquire(priority)
+
+            else:
+                token, rate_limiter = auth, self.rate_limiter_for(auth)
+                rate_limiter.acquire(priority)
+
+            sent_token = token.access_token
+            headers = token.headers
+            if body is not None:
+                headers = {**headers, "Content-Type": "application/json"}
+
+            response = self.session.request(
+                method,
+                url,
+                params=params,
+                data=body,
+                headers=headers,
+            )
+
+            if response.status_code == 401:
+                rate_limiter.update(response.headers)
+
+                if id(token) not in refreshed and refresh_auth(token, sent_token):
+                    refreshed.add(id(token))
+                    continue
+
+                # A pooled token that cannot be refreshed is revoked; try another
+                if isinstance(auth, AuthPool):
+                    auth.retire(token)
+
+                    if len(auth):
+                        continue
+
+                break
+
+            if response.status_code != 429:
+                rate_limiter.update(response.headers)
+                break
+
+            rate_limiter.throttle(response.headers)
+
+            if retry_count >= self.max_retries:
+                break
+
+            retry_count += 1
+            logger.warning("Rate limited: Retry %d of %d", retry_count, self.max_retries)
+
+        if not response.ok:
+            url = response.request.url or "Undefined"
+            raise error_from_response(response.status_code, url, response.content)
+
+        return _codec.loads(response.content) if response.content else {}
+
+
+def refresh_auth(auth: AuthType, sent_token: str) -> bool:
+    """
+    Renew a refreshable auth after a request sent with sent_token was refused (401).
+
+    Auth objects with a 'refresh()' method returning True on success are refreshable.
+    If another request has already swapped in a new token, nothing is refreshed and
+    the request can be replayed with it.
+
+    Returns:
+        True if the request should be replayed with the current token of auth.
+    """
+    refresh = getattr(auth, "refresh", None)
+
+    if refresh is None:
+        return False
+
+    if auth.access_token != sent_token:
+        return True
+
+    logger.info("Unauthorized: Refreshing token and replaying request")
+    return bool(refresh())
+
+
+def error_from_response(status_code: int, url: str, content: bytes) -> TwitchAPIError:
+    """
+    Build the exception matching a failed response's status code and body.
+
+    Helix errors carry a JSON body with 'error' and 'message'. Any other body, such
+    as the HTML page of a gateway error, is used as the message as is.
+    """
+    error_type = UnauthorizedError if status_code == 401 else BadRequestError
+
+    try:
+        body = _codec.loads(content)
+
+    except ValueError:
+        body = None
+
+    if not isinstance(body, dict):
+        text = content.decode("utf-8", errors="replace").strip()
+        body = {"message": text} if text else {}
+
+    return error_type(
+        status_code=status_code,
+        url=url,
+        error=body.get("error", "Undefined"),
+        message=body.get("message", "Undefined"),
+    )
+
+
+_DEFAULT_CLIENT = APIClient()
+
+
+def get_default_client() -> APIClient:
+    """
+    Return the shared APIClient used by API calls when no client is provided.
+
+    Requests are paced per token, so any number of tokens can share it.
+    """
+    return _DEFAULT_CLIENT
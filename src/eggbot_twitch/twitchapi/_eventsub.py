@@ -0,0 +1,301 @@
+"""Talk to the API's EventSub category."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+from typing import TYPE_CHECKING
+from typing import Any
+
+from ._client import get_default_client
+from ._ratelimit import Priority
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+
+    from ._client import APIClient
+    from ._client import Credentials
+    from ._paginate import Paginator
+
+_SUBSCRIPTIONS_PATH = "/eventsub/subscriptions"
+_DEFAULT_MAX_WORKERS = 4
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SubscriptionRequest:
+    """
+    An EventSub subscription to create.
+
+    Source:
+        https://dev.twitch.tv/docs/eventsub/eventsub-subscription-types/
+    """
+
+    subscription_type: str
+    version: str
+    condition: dict[str, str]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BulkResult[T]:
+    """
+    Outcome of a bulk operation.
+
+    Each item is listed once, in 'succeeded' with its decoded response body, or in
+    'failed' with the exception that stopped it.
+    """
+
+    succeeded: list[tuple[T, dict[str, Any]]]
+    failed: list[tuple[T, Exception]]
+
+    @property
+    def ok(self) -> bool:
+        """True if no item failed."""
+        return not self.failed
+
+
+def create_subscription(
+    auth: Credentials,
+    subscription: SubscriptionRequest,
+    *,
+    session_id: str,
+    client: APIClient | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> dict[str, Any]:
+    """
+    Create an EventSub subscription delivered to a websocket session.
+
+    Source:
+        https://dev.twitch.tv/docs/api/reference/#create-eventsub-subscription
+
+    Authorization:
+        Requires a user access token with the scopes of the subscription type.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+        subscription: The type, version, and condition of the subscription.
+        session_id: Id of the websocket session receiving the events.
+        client: The APIClient to send the request through. Defaults to the shared client.
+        priority: Order in which the request is released when rate limited.
+    """
+    client = client if client is not None else get_default_client()
+
+    body = {
+        "type": subscription.subscription_type,
+        "version": subscription.version,
+        "condition": subscription.condition,
+        "transport": {"method": "websocket", "session_id": session_id},
+    }
+
+    return client.post(_SUBSCRIPTIONS_PATH, auth, json=body, priority=priority)
+
+
+def get_subscriptions_raw(
+    auth: Credentials,
+    *,
+    status: str | None = None,
+    subscription_type: str | None = None,
+    user_id: str | None = None,
+    after: str | None = None,
+    client: APIClient | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> dict[str, Any]:
+    """
+    Get one page of the EventSub subscriptions created by the client id of the token.
+
+    Only one of status, subscription_type, or user_id may be given.
+
+    Source:
+        https://dev.twitch.tv/docs/api/reference/#get-eventsub-subscriptions
+
+    Authorization:
+        Requires a user access token for websocket subscriptions.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+        status: Only list subscriptions with this status, e.g. 'enabled'.
+        subscription_type: Only list subscriptions of this type.
+        user_id: Only list subscriptions with this user id in their condition.
+        after: Cursor of the page to get, from the 'pagination' of the previous page.
+        client: The APIClient to send the request through. Defaults to the shared client.
+        priority: Order in which the request is released when rate limited.
+    """
+    client = client if client is not None else get_default_client()
+
+    params = _filter_params(status, subscription_type, user_id)
+    if after is not None:
+        params["after"] = after
+
+    return client.get(_SUBSCRIPTIONS_PATH, auth, params=params, priority=priority)
+
+
+def get_subscriptions(
+    auth: Credentials,
+    *,
+    status: str | None = None,
+    subscription_type: str | None = None,
+    user_id: str | None = None,
+    after: str | None = None,
+    max_pages: int | None = None,
+    client: APIClient | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Paginator:
+    """
+    Lazily yield every EventSub subscription, prefetching the next page.
+
+    Takes the same filters as get_subscriptions_raw. Save 'cursor' of the returned
+    Paginator to resume the walk later with 'after'.
+
+    Args:
+        max_pages: Stop after this many pages. Walks every page if None.
+    """
+    client = client if client is not None else get_default_client()
+
+    return client.paginate(
+        _SUBSCRIPTIONS_PATH,
+        auth,
+        params=_filter_params(status, subscription_type, user_id),
+        after=after,
+        max_pages=max_pages,
+        priority=priority,
+    )
+
+
+def delete_subscription(
+    auth: Credentials,
+    subscription_id: str,
+    *,
+    client: APIClient | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> None:
+    """
+    Delete an EventSub subscription.
+
+    Source:
+        https://dev.twitch.tv/docs/api/reference/#delete-eventsub-subscription
+
+    Authorization:
+        Requires a user access token for websocket subscriptions.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+        subscription_id: Id of the subscription to delete.
+        client: The APIClient to send the request through. Defaults to the shared client.
+        priority: Order in which the request is released when rate limited.
+    """
+    client = client if client is not None else get_default_client()
+
+    client.delete(_SUBSCRIPTIONS_PATH, auth, params={"id": subscription_id}, priority=priority)
+
+
+def create_subscriptions_bulk(
+    auth: Credentials,
+    subscriptions: Sequence[SubscriptionRequest],
+    *,
+    session_id: str,
+    client: APIClient | None = None,
+    max_workers: int = _DEFAULT_MAX_WORKERS,
+    priority: Priority = Priority.BACKGROUND,
+) -> BulkResult[SubscriptionRequest]:
+    """
+    Create many EventSub subscriptions on a websocket session concurrently.
+
+    Requests are paced by the rate limiter of the client. A failed subscription does
+    not stop the others; it is reported in the 'failed' list of the result.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+        subscriptions: The subscriptions to create.
+        session_id: Id of the websocket session receiving the events.
+        client: The APIClient to send the requests through. Defaults to the shared client.
+        max_workers: Maximum number of requests sent at the same time.
+        priority: Order in which the requests are released when rate limited.
+    """
+
+    def create(subscription: SubscriptionRequest) -> dict[str, Any]:
+        return create_subscription(
+            auth,
+            subscription,
+            session_id=session_id,
+            client=client,
+            priority=priority,
+        )
+
+    return _run_bulk(create, subscriptions, max_workers)
+
+
+def delete_subscriptions_bulk(
+    auth: Credentials,
+    subscription_ids: Sequence[str],
+    *,
+    client: APIClient | None = None,
+    max_workers: int = _DEFAULT_MAX_WORKERS,
+    priority: Priority = Priority.BACKGROUND,
+) -> BulkResult[str]:
+    """
+    Delete many EventSub subscriptions concurrently.
+
+    Requests are paced by the rate limiter of the client. A failed deletion does not
+    stop the others; it is reported in the 'failed' list of the result.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+        subscription_ids: Ids of the subscriptions to delete.
+        client: The APIClient to send the requests through. Defaults to the shared client.
+        max_workers: Maximum number of requests sent at the same time.
+        priority: Order in which the requests are released when rate limited.
+    """
+
+    def delete(subscription_id: str) -> dict[str, Any]:
+        delete_subscription(auth, subscription_id, client=client, priority=priority)
+        return {}
+
+    return _run_bulk(delete, subscription_ids, max_workers)
+
+
+def _filter_params(
+    status: str | None,
+    subscription_type: str | None,
+    user_id: str | None,
+) -> dict[str, Any]:
+    """Internal: Query parameters of the list filters, of which only one is allowed."""
+    params = {
+        key: value
+        for key, value in (("status", status), ("type", subscription_type), ("user_id", user_id))
+        if value is not None
+    }
+
+    if len(params) > 1:
+        raise ValueError("Only one of status, subscription_type, or user_id may be given.")
+
+    return params
+
+
+def _run_bulk[T](
+    operation: Callable[[T], dict[str, Any]],
+    items: Sequence[T],
+    max_workers: int,
+) -> BulkResult[T]:
+    """
+    Internal: Run operation for every item on a thread pool, collecting each outcome.
+
+    Any exception raised for an item is recorded as its failure, so one item can
+    never cost the results of the others.
+    """
+    result: BulkResult[T] = BulkResult(succeeded=[], failed=[])
+
+    if not items:
+        return result
+
+    workers = min(max_workers, len(items))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [(item, executor.submit(operation, item)) for item in items]
+
+    for item, future in futures:
+        try:
+            result.succeeded.append((item, future.result()))
+
+        except Exception as exc:
+            result.failed.append((item, exc))
+
+    return result
@@ -26,3 +26,8 @@ class BadRequestError(TwitchAPIError):
 @dataclasses.dataclass(frozen=True, slots=True)
 class UnauthorizedError(TwitchAPIError):
     """Represents 401 Unauthorized request responses."""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class NoTokensError(UnauthorizedError):
+    """Represents an AuthPool with no usable token left in rotation."""
@@ -0,0 +1,93 @@
+"""Lazily walk the pages of a Helix list endpoint."""
+
+from __future__ import annotations
+
+import concurrent.futures
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+    PageFetcher = Callable[[str | None], dict[str, Any]]
+
+
+class Paginator:
+    """
+    Iterate the items of a Helix list endpoint, one page at a time.
+
+    Helix list endpoints return a page of 'data' and a 'pagination.cursor' pointing to
+    the next page. Pages are only requested as iteration reaches them, so only the
+    current page, and the prefetched one, are held in memory.
+
+    With prefetch enabled the next page is requested on a background thread while the
+    caller handles the items of the current one.
+
+    The 'cursor' attribute allows a walk to be resumed later. It is the cursor of the
+    page following the last page the caller finished, and is None once every page has
+    been read. A page counts as finished when the item after its last one is
+    requested, so resuming from it never skips an item.
+
+    Args:
+        fetch: Called with the cursor of a page (None for the first page) and returns
+            the decoded response body.
+        after: Cursor to resume from, as saved from 'cursor' of an earlier walk.
+        max_pages: Stop after this many pages. Walks every page if None.
+        prefetch: Request the next page while the current one is being handled.
+    """
+
+    def __init__(
+        self,
+        fetch: PageFetcher,
+        *,
+        after: str | None = None,
+        max_pages: int | None = None,
+        prefetch: bool = True,
+    ) -> None:
+        if max_pages is not None and max_pages < 1:
+            raise ValueError("max_pages must be at least 1.")
+
+        self.cursor = after
+        self.pages_read = 0
+        self._fetch = fetch
+        self._max_pages = max_pages
+        self._prefetch = prefetch
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Yield every item of every page, in order."""
+        for page in self.pages():
+            yield from page
+
+    def pages(self) -> Iterator[list[dict[str, Any]]]:
+        """Yield the 'data' of each page, in order."""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            pending: concurrent.futures.Future[dict[str, Any]] | None
+            pending = executor.submit(self._fetch, self.cursor)
+
+            try:
+                while pending is not None:
+                    body = pending.result()
+                    self.pages_read += 1
+
+                    after = body.get("pagination", {}).get("cursor") or None
+                    pending = None
+
+                    if after is not None and not self._reached_max_pages():
+                        if self._prefetch:
+                            pending = executor.submit(self._fetch, after)
+
+                    yield body.get("data", [])
+
+                    self.cursor = after
+
+                    if after is not None and pending is None and not self._reached_max_pages():
+                        pending = executor.submit(self._fetch, after)
+
+            finally:
+                if pending is not None:
+                    pending.cancel()
+
+    def _reached_max_pages(self) -> bool:
+        """Internal: True if no more pages may be read."""
+        return self._max_pages is not None and self.pages_read >= self._max_pages
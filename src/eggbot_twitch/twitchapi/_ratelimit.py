@@ -0,0 +1,167 @@
+"""Token bucket scheduler paced by the API's Ratelimit-* response headers."""
+
+from __future__ import annotations
+
+import enum
+import heapq
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING
+
+_DEFAULT_LIMIT = 800
+_DEFAULT_WINDOW_SECONDS = 60.0
+_DEFAULT_THROTTLE_SECONDS = 1.0
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class Priority(enum.IntEnum):
+    """Order in which queued requests are released. Lower values go first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every request sent with one token.
+
+    The bucket starts full and refills continuously at 'limit' points per window. The
+    estimate is corrected by the Ratelimit-Limit, Ratelimit-Remaining, and
+    Ratelimit-Reset headers of each response. Requests waiting for a point are
+    released in Priority order, then in the order they arrived.
+
+    Args:
+        limit: Size of the bucket until a response reports otherwise.
+        window_seconds: Number of seconds for an empty bucket to refill.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = _DEFAULT_LIMIT,
+        window_seconds: float = _DEFAULT_WINDOW_SECONDS,
+    ) -> None:
+        self.window_seconds = window_seconds
+
+        self._limit = limit
+        self._tokens = float(limit)
+        self._updated_at = time.time()
+        self._reset_at = 0.0
+        self._blocked_until = 0.0
+
+        self._condition = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []
+        self._counter = itertools.count()
+
+    @property
+    def limit(self) -> int:
+        """Size of the bucket as last reported by the API."""
+        return self._limit
+
+    @property
+    def remaining(self) -> int:
+        """Estimated number of requests that can be sent without waiting."""
+        with self._condition:
+            self._refill()
+            return int(self._tokens) if time.time() >= self._blocked_until else 0
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Block until a request of the given priority may be sent."""
+        ticket = (priority, next(self._counter))
+
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            self._condition.notify_all()
+
+            try:
+                while True:
+                    wait_seconds = None
+
+                    if self._waiting[0] == ticket:
+                        self._refill()
+                        wait_seconds = self._seconds_until_available()
+
+                        if wait_seconds <= 0:
+                            self._tokens -= 1
+                            return
+
+                    self._condition.wait(wait_seconds)
+
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Correct the bucket from the Ratelimit-* headers of a response."""
+        limit = _parse_header(headers, "Ratelimit-Limit")
+        remaining = _parse_header(headers, "Ratelimit-Remaining")
+        reset_at = _parse_header(headers, "Ratelimit-Reset")
+
+        with self._condition:
+            self._refill()
+
+            if limit is not None:
+                self._limit = int(limit)
+
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+
+            if reset_at is not None:
+                self._reset_at = reset_at
+
+            self._condition.notify_all()
+
+    def throttle(self, headers: Mapping[str, str]) -> None:
+        """Hold all requests until the reset time of a 429 Too Many Requests response."""
+        reset_at = _parse_header(headers, "Ratelimit-Reset")
+
+        with self._condition:
+            self._tokens = 0.0
+            self._reset_at = reset_at or time.time() + _DEFAULT_THROTTLE_SECONDS
+            self._blocked_until = self._reset_at
+
+        self.update(headers)
+
+    def _refill(self) -> None:
+        """Internal: Add points earned since the last refill. Lock must be held."""
+        now = time.time()
+
+        if self._reset_at and now >= self._reset_at:
+            self._tokens = float(self._limit)
+            self._reset_at = 0.0
+
+        else:
+            earned = (now - self._updated_at) * self._limit / self.window_seconds
+            self._tokens = min(float(self._limit), self._tokens + earned)
+
+        self._updated_at = now
+
+    def _seconds_until_available(self) -> float:
+        """Internal: Seconds until a point can be spent. Lock must be held."""
+        now = time.time()
+
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        if self._tokens >= 1:
+            return 0.0
+
+        refill_seconds = (1 - self._tokens) * self.window_seconds / self._limit
+
+        if self._reset_at:
+            return min(refill_seconds, self._reset_at - now)
+
+        return refill_seconds
+
+
+def _parse_header(headers: Mapping[str, str], name: str) -> float | None:
+    """Internal: Return the numeric value of a header, None if missing or invalid."""
+    try:
+        return float(headers[name])
+
+    except (KeyError, ValueError):
+        return None
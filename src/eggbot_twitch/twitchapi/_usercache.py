@@ -0,0 +1,125 @@
+"""Bounded, expiring cache of user data returned by the API's User category."""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import threading
+import time
+from typing import Any
+
+_DEFAULT_MAX_SIZE = 10_000
+_DEFAULT_TTL_SECONDS = 300.0
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Snapshot of the counters of a UserCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class UserCache:
+    """
+    Thread-safe LRU cache of user objects, indexed by both user id and user login.
+
+    Entries expire ttl_seconds after being added. Once max_size entries are held, the
+    least recently used entry is evicted to make room. Cached user objects are shared
+    between callers and must be treated as read-only.
+
+    Args:
+        max_size: Maximum number of users held.
+        ttl_seconds: Number of seconds a user is served from the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = _DEFAULT_MAX_SIZE,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._users: collections.OrderedDict[str, tuple[float, dict[str, Any]]]
+        self._users = collections.OrderedDict()
+        self._logins: dict[str, str] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Current hit, miss, eviction, and expiration counts."""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations)
+
+    def get_by_id(self, user_id: str) -> dict[str, Any] | None:
+        """Return the cached user with the given id, or None."""
+        with self._lock:
+            return self._get(user_id)
+
+    def get_by_login(self, user_login: str) -> dict[str, Any] | None:
+        """Return the cached user with the given login (case insensitive), or None."""
+        with self._lock:
+            return self._get(self._logins.get(user_login.lower(), ""))
+
+    def add(self, user: dict[str, Any]) -> None:
+        """Add, or replace, a user object as returned by the API. Requires 'id' and 'login'."""
+        user_id = user["id"]
+        user_login = user["login"].lower()
+
+        with self._lock:
+            self._remove(user_id)
+            self._users[user_id] = (time.monotonic() + self.ttl_seconds, user)
+            self._logins[user_login] = user_id
+
+            while len(self._users) > self.max_size:
+                self._remove(next(iter(self._users)))
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove all users from the cache. Counters are not reset."""
+        with self._lock:
+            self._users.clear()
+            self._logins.clear()
+
+    def _get(self, user_id: str) -> dict[str, Any] | None:
+        """Internal: Lookup by id, counting the result. Lock must be held."""
+        entry = self._users.get(user_id)
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        expires_at, user = entry
+
+        if expires_at <= time.monotonic():
+            self._remove(user_id)
+            self._expirations += 1
+            self._misses += 1
+            return None
+
+        self._users.move_to_end(user_id)
+        self._hits += 1
+        return user
+
+    def _remove(self, user_id: str) -> None:
+        """Internal: Drop a user from both indexes if present. Lock must be held."""
+        entry = self._users.pop(user_id, None)
+
+        if entry is None:
+            return
+
+        user_login = entry[1]["login"].lower()
+        if self._logins.get(user_login) == user_id:
+            del self._logins[user_login]
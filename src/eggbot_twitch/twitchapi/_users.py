@@ -2,38 +2,32 @@
 
 from __future__ import annotations
 
+import concurrent.futures
+import itertools
 from typing import TYPE_CHECKING
 
-import requests
+from ._client import get_default_client
+from ._ratelimit import Priority
 
-from ._exceptions import BadRequestError
-from ._exceptions import UnauthorizedError
-
-_BASE_URL = "https://api.twitch.tv/helix"
+_MAX_USERS_PER_REQUEST = 100
+_DEFAULT_MAX_WORKERS = 4
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
     from typing import Any
-    from typing import Protocol
-
-    class AuthType(Protocol):
-        """Any Auth object that provides an 'access_token' attribute."""
-
-        @property
-        def access_token(self) -> str: ...
 
-        @property
-        def client_id(self) -> str: ...
-
-        @property
-        def headers(self) -> dict[str, str]: ...
+    from ._client import APIClient
+    from ._client import Credentials
+    from ._usercache import UserCache
 
 
 def get_users_raw(
-    auth: AuthType,
+    auth: Credentials,
     *,
     user_ids: Sequence[str] | None = None,
     user_logins: Sequence[str] | None = None,
+    client: APIClient | None = None,
+    priority: Priority = Priority.INTERACTIVE,
 ) -> dict[str, Any]:
     """
     Get raw response of user data given a maximum of 100 user ids or user logins.
@@ -45,36 +39,128 @@ def get_users_raw(
         Requires an app access token or user access token.
 
     Args:
-        auth: Any Auth object that provides an 'access_token' attribute.
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
         user_ids: A sequence of string user ids.
         user_logins: A sequence of string user logins (user names).
+        client: The APIClient to send the request through. Defaults to the shared client.
+        priority: Order in which the request is released when rate limited.
     """
-    if len(user_ids or []) + len(user_logins or []) > 100:
+    if len(user_ids or []) + len(user_logins or []) > _MAX_USERS_PER_REQUEST:
         raise ValueError("Total number of user_ids and user_logins exceeded 100.")
 
-    url = _BASE_URL + "/users"
+    client = client if client is not None else get_default_client()
 
     params = {
         "id": user_ids if user_ids else [],
         "login": user_logins if user_logins else [],
     }
 
-    response = requests.get(url, params=params, headers=auth.headers)
-
-    if not response.ok:
-        if response.status_code == 401:
-            raise UnauthorizedError(
-                status_code=response.status_code,
-                url=response.request.url or "Undefined",
-                error=response.json().get("error", "Undefined"),
-                message=response.json().get("message", "Undefined"),
-            )
-
-        raise BadRequestError(
-            status_code=response.status_code,
-            url=response.request.url or "Undefined",
-            error=response.json().get("error", "Undefined"),
-            message=response.json().get("message", "Undefined"),
+    return client.get("/users", auth, params=params, priority=priority)
+
+
+def get_users_bulk(
+    auth: Credentials,
+    *,
+    user_ids: Sequence[str] | None = None,
+    user_logins: Sequence[str] | None = None,
+    client: APIClient | None = None,
+    max_workers: int = _DEFAULT_MAX_WORKERS,
+    cache: UserCache | None = None,
+    priority: Priority = Priority.BACKGROUND,
+) -> dict[str, Any]:
+    """
+    Get user data for any number of user ids or user logins.
+
+    Lookups are de-duplicated and split into batches of 100, which are requested
+    concurrently. The 'data' of all batches is merged into a single response. If no
+    user ids or user logins are given, no request is made.
+
+    When a cache is given, only the users missing from it are requested and the
+    fetched users are added to it. Cached users are listed before fetched users.
+
+    Source:
+        https://dev.twitch.tv/docs/api/reference/#get-users
+
+    Authorization:
+        Requires an app access token or user access token.
+
+    Args:
+        auth: Any Auth object that provides an 'access_token' attribute, or an AuthPool.
+        user_ids: A sequence of string user ids.
+        user_logins: A sequence of string user logins (user names).
+        client: The APIClient to send the requests through. Defaults to the shared client.
+        max_workers: Maximum number of batches requested at the same time.
+        cache: A UserCache to serve lookups from, and to store fetched users in.
+        priority: Order in which the requests are released when rate limited.
+    """
+    cached, batches = split_lookups(user_ids, user_logins, cache)
+
+    if not batches:
+        return {"data": cached}
+
+    def fetch(batch: tuple[list[str], list[str]]) -> dict[str, Any]:
+        return get_users_raw(
+            auth,
+            user_ids=batch[0],
+            user_logins=batch[1],
+            client=client,
+            priority=priority,
+        )
+
+    workers = min(max_workers, len(batches))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch, batches))
+
+    return merge_lookups(cached, results, cache)
+
+
+def split_lookups(
+    user_ids: Sequence[str] | None,
+    user_logins: Sequence[str] | None,
+    cache: UserCache | None,
+) -> tuple[list[dict[str, Any]], list[tuple[list[str], list[str]]]]:
+    """
+    Split lookups into users found in the cache, and batches of (ids, logins) to request.
+
+    Duplicate lookups are removed. Each batch holds at most 100 lookups.
+    """
+    lookups = [("id", user_id) for user_id in dict.fromkeys(user_ids or [])]
+    lookups += [("login", user_login) for user_login in dict.fromkeys(user_logins or [])]
+
+    cached: list[dict[str, Any]] = []
+
+    if cache is not None:
+        misses = []
+        for key, value in lookups:
+            user = cache.get_by_id(value) if key == "id" else cache.get_by_login(value)
+            if user is None:
+                misses.append((key, value))
+            else:
+                cached.append(user)
+
+        lookups = misses
+
+    batches = [
+        (
+            [value for key, value in batch if key == "id"],
+            [value for key, value in batch if key == "login"],
         )
+        for batch in itertools.batched(lookups, _MAX_USERS_PER_REQUEST)
+    ]
+
+    return cached, batches
+
+
+def merge_lookups(
+    cached: list[dict[str, Any]],
+    results: Sequence[dict[str, Any]],
+    cache: UserCache | None,
+) -> dict[str, Any]:
+    """Merge cached users and the 'data' of each response, adding fetched users to the cache."""
+    fetched = [user for result in results for user in result["data"]]
+
+    if cache is not None:
+        for user in fetched:
+            cache.add(user)
 
-    return response.json()
+    return {"data": cached + fetched}
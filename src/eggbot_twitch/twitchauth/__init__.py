@@ -1,6 +1,13 @@
 from __future__ import annotations
 
 from ._auth import Auth
+from ._tokenmanager import TokenManager
+from ._tokenstore import CachedTokenStore
+from ._tokenstore import FileTokenStore
+from ._tokenstore import MemoryTokenStore
+from ._tokenstore import SingleTokenFileStore
+from ._tokenstore import SQLiteTokenStore
+from ._tokenstore import TokenStore
 from ._twitch_autho import get_authorization
 from ._twitch_autho import load_user_authorization
 from ._twitch_autho import save_user_authorization
@@ -11,7 +18,14 @@ from .userauthgrant import UserAuthGrant
 
 __all__ = [
     "Auth",
+    "CachedTokenStore",
     "ClientAuth",
+    "FileTokenStore",
+    "MemoryTokenStore",
+    "SQLiteTokenStore",
+    "SingleTokenFileStore",
+    "TokenManager",
+    "TokenStore",
     "UserAuth",
     "UserAuthGrant",
     "get_authorization",
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import abc
 import dataclasses
-import json
 from typing import TYPE_CHECKING
 
+from .. import _codec
+
 if TYPE_CHECKING:
     from typing import Any
     from typing import Self
@@ -13,7 +14,7 @@ if TYPE_CHECKING:
     from _typeshed import SupportsWrite
 
 
-@dataclasses.dataclass(frozen=True, slots=True)
+@dataclasses.dataclass(frozen=True, slots=True, weakref_slot=True)
 class Auth(abc.ABC):
     """Authorization token for TwitchTV."""
 
@@ -37,10 +38,10 @@ class Auth(abc.ABC):
     @classmethod
     def load(cls, fp: SupportsRead[bytes]) -> Self:
         """Load UserAuth from a file. Must be in JSON format."""
-        contents = json.load(fp)
+        contents = _codec.loads(fp.read())
         client_id = contents.pop("client_id")
         return cls.parse_response(contents, client_id)
 
     def dump(self, fp: SupportsWrite[bytes]) -> None:
         """Save UserAuth to a file in JSON format."""
-        fp.write(json.dumps(dataclasses.asdict(self)).encode())
+        fp.write(_codec.dumps(dataclasses.asdict(self)))
@@ -0,0 +1,186 @@
+"""Keep an Auth token fresh for every caller sharing it."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from ._twitch_autho import get_authorization
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+    from typing import Self
+
+    from ._auth import Auth
+
+_DEFAULT_REFRESH_FRACTION = 0.75
+_DEFAULT_RETRY_SECONDS = 30.0
+
+logger = logging.getLogger("twitchauth")
+
+
+class TokenManager:
+    """
+    Hold the current Auth and refresh it before it expires.
+
+    A TokenManager can be passed anywhere an Auth is accepted by the API clients; the
+    'access_token', 'client_id', and 'headers' attributes always read from the
+    current token. A refreshed token is swapped in as a single reference assignment,
+    so every caller sees either the old token or the new one, never a mix.
+
+    Once started, a background thread refreshes the token when refresh_fraction of
+    its lifetime ('expires_in') has passed, retrying every retry_seconds on failure.
+    refresh() may also be called directly, such as after an UnauthorizedError.
+    Simultaneous refreshes are collapsed into a single token request whose result
+    is shared by every caller.
+
+    Args:
+        client_id: The registered Twitch app id
+        client_secret: The registered Twitch app secret
+        auth: The initial UserAuth or ClientAuth.
+        refresh_fraction: Fraction of the token lifetime after which it is refreshed.
+        retry_seconds: Seconds between attempts after a failed background refresh.
+        on_refresh: Called with each new token, such as to save it to file.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        auth: Auth,
+        *,
+        refresh_fraction: float = _DEFAULT_REFRESH_FRACTION,
+        retry_seconds: float = _DEFAULT_RETRY_SECONDS,
+        on_refresh: Callable[[Auth], object] | None = None,
+    ) -> None:
+        if not 0.0 < refresh_fraction <= 1.0:
+            raise ValueError("refresh_fraction must be greater than 0 and at most 1.")
+
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._auth = auth
+        self.refresh_fraction = refresh_fraction
+        self.retry_seconds = retry_seconds
+        self._on_refresh = on_refresh
+        self._lock = threading.Lock()
+        self._in_flight: concurrent.futures.Future[bool] | None = None
+        self._stop_flag = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    @property
+    def auth(self) -> Auth:
+        """The current token."""
+        return self._auth
+
+    @property
+    def access_token(self) -> str:
+        return self._auth.access_token
+
+    @property
+    def client_id(self) -> str:
+        return self._auth.client_id
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """HTTP Headers with access_token and client_id fields defined."""
+        return self._auth.headers
+
+    @property
+    def refresh_at(self) -> float:
+        """Epoch time at which the current token is due for refresh."""
+        auth = self._auth
+        return auth.expires_at - auth.expires_in * (1.0 - self.refresh_fraction)
+
+    def start(self) -> None:
+        """Start refreshing the token in the background. Does nothing if already started."""
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._stop_flag.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh, waiting for the thread to exit."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        self._stop_flag.set()
+
+        if thread is not None:
+            thread.join()
+
+    def refresh(self) -> bool:
+        """
+        Request a new token and swap it in.
+
+        If a refresh is already in flight, wait for it and share its result rather
+        than sending another request.
+
+        Returns:
+            True if a new token was swapped in. The current token is kept on failure.
+        """
+        with self._lock:
+            in_flight = self._in_flight
+            owner = in_flight is None
+
+            if in_flight is None:
+                in_flight = self._in_flight = concurrent.futures.Future()
+
+        if not owner:
+            return in_flight.result()
+
+        try:
+            new_auth = get_authorization(self._client_id, self._client_secret, self._auth)
+
+            if new_auth is not None:
+                self._auth = new_auth
+                logger.info("Refreshed token, expires at %d", new_auth.expires_at)
+
+                if self._on_refresh is not None:
+                    self._on_refresh(new_auth)
+
+            in_flight.set_result(new_auth is not None)
+
+        except BaseException as exc:
+            in_flight.set_exception(exc)
+            raise
+
+        finally:
+            with self._lock:
+                self._in_flight = None
+
+        return new_auth is not None
+
+    def _refresh_loop(self) -> None:
+        """Internal: Refresh the token each time it comes due, until stopped."""
+        while not self._stop_flag.wait(max(0.0, self.refresh_at - time.time())):
+            try:
+                refreshed = self.refresh()
+
+            except Exception:
+                logger.exception("Background token refresh failed")
+                refreshed = False
+
+            if not refreshed:
+                logger.warning("Token refresh failed, retrying in %s seconds", self.retry_seconds)
+
+                if self._stop_flag.wait(self.retry_seconds):
+                    return
@@ -0,0 +1,459 @@
+"""Persist UserAuth tokens of many accounts."""
+
+from __future__ import annotations
+
+import abc
+import contextlib
+import dataclasses
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from .. import _codec
+from .userauth import UserAuth
+
+try:
+    import fcntl
+
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+    from typing import Any
+    from typing import Self
+
+    TokenKey = tuple[str, str]
+
+logger = logging.getLogger("twitchauth")
+
+
+class TokenStore(abc.ABC):
+    """
+    Storage of UserAuth tokens, keyed by client id and user id.
+
+    One store holds the tokens of every account of every app. The user id may be
+    left empty when an app only has one account.
+    """
+
+    @abc.abstractmethod
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        """Return the stored token of an account, or None if there is none."""
+
+    @abc.abstractmethod
+    def save(self, user_auth: UserAuth, user_id: str = "") -> None:
+        """Store the token of an account, replacing any previous one."""
+
+    @abc.abstractmethod
+    def delete(self, client_id: str, user_id: str = "") -> None:
+        """Remove the token of an account. Does nothing if there is none."""
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store held in a dict, lost when the process exits."""
+
+    def __init__(self) -> None:
+        self._tokens: dict[TokenKey, UserAuth] = {}
+        self._lock = threading.Lock()
+
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        with self._lock:
+            return self._tokens.get((client_id, user_id))
+
+    def save(self, user_auth: UserAuth, user_id: str = "") -> None:
+        with self._lock:
+            self._tokens[(user_auth.client_id, user_id)] = user_auth
+
+    def delete(self, client_id: str, user_id: str = "") -> None:
+        with self._lock:
+            self._tokens.pop((client_id, user_id), None)
+
+
+class FileTokenStore(TokenStore):
+    """
+    Token store keeping every account in one JSON file.
+
+    Saves are atomic and serialized between processes with an advisory lock, see
+    save_user_authorization. The file is only parsed again once it has changed on
+    disk, so loads cost a stat() per call.
+
+    The file holds a list of token records. A single-token file, as written by
+    save_user_authorization, is read with SingleTokenFileStore instead.
+
+    Args:
+        path: Location of the JSON file. Created on the first save.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(path)
+        self._version: tuple[int, int, int] | None = None
+        self._tokens: dict[TokenKey, UserAuth] = {}
+        self._lock = threading.Lock()
+
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        """
+        Return the stored token of an account, or None if there is none.
+
+        A file that cannot be read or parsed is logged and treated as empty.
+        """
+        try:
+            return self._read().get((client_id, user_id))
+
+        except (OSError, ValueError) as err:
+            logger.error("Unable to load tokens from '%s': %s", self.path, err)
+            return None
+
+    def save(self, user_auth: UserAuth, user_id: str = "") -> None:
+        """
+        Store the token of an account, replacing any previous one.
+
+        Raises:
+            ValueError: If the existing file cannot be parsed. It is not overwritten,
+                as that would lose the tokens of every other account.
+        """
+        with _file_lock(self.path):
+            tokens = dict(self._read())
+            tokens[(user_auth.client_id, user_id)] = user_auth
+            self._write(tokens)
+
+    def delete(self, client_id: str, user_id: str = "") -> None:
+        with _file_lock(self.path):
+            tokens = dict(self._read())
+
+            if tokens.pop((client_id, user_id), None) is not None:
+                self._write(tokens)
+
+    def _read(self) -> dict[TokenKey, UserAuth]:
+        """
+        Internal: Every stored token, parsing the file only if it changed.
+
+        Raises:
+            ValueError: If the file is not valid JSON, or not a list of token records.
+        """
+        try:
+            with open(self.path, "rb") as infile:
+                version = _file_version(infile.fileno())
+
+                with self._lock:
+                    if version == self._version:
+                        return self._tokens
+
+                records: list[dict[str, Any]] = _codec.loads(infile.read())
+
+        except FileNotFoundError:
+            return {}
+
+        if not isinstance(records, list):
+            raise ValueError("Expected a list of token records.")
+
+        try:
+            tokens = {
+                (record["client_id"], record.pop("user_id")): UserAuth.parse_response(
+                    record, record["client_id"]
+                )
+                for record in records
+            }
+
+        except (KeyError, TypeError, AttributeError) as err:
+            raise ValueError(f"Malformed token record: {err!r}") from err
+
+        with self._lock:
+            self._version, self._tokens = version, tokens
+
+        return tokens
+
+    def _write(self, tokens: dict[TokenKey, UserAuth]) -> None:
+        """Internal: Replace the file with the given tokens. Caller holds the file lock."""
+        records = [
+            {"user_id": user_id, **dataclasses.asdict(user_auth)}
+            for (_, user_id), user_auth in tokens.items()
+        ]
+        _write_atomic(self.path, _codec.dumps(records))
+
+
+class SingleTokenFileStore(TokenStore):
+    """
+    Token store keeping one account in a JSON file, as save_user_authorization does.
+
+    The file holds a single token object, so user_id is neither stored nor checked.
+    Loading with an empty client_id returns the stored token whatever its client id.
+    Saves are atomic and serialized between processes like those of FileTokenStore,
+    and the file is only parsed again once it has changed on disk.
+
+    Args:
+        path: Location of the JSON file. Created on the first save.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(path)
+        self._version: tuple[int, int, int] | None = None
+        self._token: UserAuth | None = None
+        self._lock = threading.Lock()
+
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        """
+        Return the stored token if it belongs to client_id, or None if there is none.
+
+        A file that cannot be read or parsed is logged and treated as empty.
+        """
+        try:
+            user_auth = self._read()
+
+        except (OSError, ValueError) as err:
+            logger.error("Unable to load authorization from '%s': %s", self.path, err)
+            return None
+
+        return user_auth if _matches(user_auth, client_id) else None
+
+    def save(self, user_auth: UserAuth, user_id: str = "") -> None:
+        """Store the token, replacing the one in the file."""
+        logger.debug("Saving authorization to '%s'", self.path)
+
+        with _file_lock(self.path):
+            _write_atomic(self.path, _codec.dumps(dataclasses.asdict(user_auth)))
+
+    def delete(self, client_id: str, user_id: str = "") -> None:
+        """
+        Remove the file if it holds the token of client_id.
+
+        Raises:
+            ValueError: If the existing file cannot be parsed. It is not removed.
+        """
+        with _file_lock(self.path):
+            if _matches(self._read(), client_id):
+                os.unlink(self.path)
+
+    def _read(self) -> UserAuth | None:
+        """
+        Internal: The stored token, parsing the file only if it changed.
+
+        Raises:
+            ValueError: If the file is not valid JSON, or not a token object.
+        """
+        try:
+            with open(self.path, "rb") as infile:
+                version = _file_version(infile.fileno())
+
+                with self._lock:
+                    if version == self._version:
+                        return self._token
+
+                logger.debug("Attempting to load authorization from '%s'", self.path)
+
+                try:
+                    user_auth = UserAuth.load(infile)
+
+                except (KeyError, TypeError, AttributeError) as err:
+                    raise ValueError(f"Malformed token: {err!r}") from err
+
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            self._version, self._token = version, user_auth
+
+        return user_auth
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Token store keeping every account in a SQLite database.
+
+    Each load and save touches a single row, so the cost does not grow with the
+    number of accounts. The database runs in WAL mode, letting processes sharing it
+    read while another writes.
+
+    Args:
+        path: Location of the database file, or ':memory:'.
+        timeout: Seconds to wait for a lock held by another connection.
+    """
+
+    def __init__(self, path: str, *, timeout: float = 5.0) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            timeout=timeout,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            "client_id TEXT NOT NULL, "
+            "user_id TEXT NOT NULL, "
+            "auth BLOB NOT NULL, "
+            "PRIMARY KEY (client_id, user_id))"
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT auth FROM tokens WHERE client_id = ? AND user_id = ?",
+                (client_id, user_id),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return UserAuth.parse_response(_codec.loads(row[0]), client_id)
+
+    def save(self, user_auth: UserAuth, user_id: str = "") -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tokens (client_id, user_id, auth) VALUES (?, ?, ?)",
+                (user_auth.client_id, user_id, _codec.dumps(dataclasses.asdict(user_auth))),
+            )
+
+    def delete(self, client_id: str, user_id: str = "") -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM tokens WHERE client_id = ? AND user_id = ?",
+                (client_id, user_id),
+            )
+
+
+class CachedTokenStore(TokenStore):
+    """
+    Read-through memory cache in front of another token store.
+
+    Loads are served from memory once an account has been read; saves and deletes
+    are written through to the store. Without a ttl, saves made by other processes
+    are never seen. Give a ttl when the store is shared.
+
+    Args:
+        store: The token store to cache.
+        ttl: Seconds a loaded token is served from memory. Forever if None.
+    """
+
+    def __init__(self, store: TokenStore, *, ttl: float | None = None) -> None:
+        self.store = store
+        self.ttl = ttl
+        self._cache: dict[TokenKey, tuple[float, UserAuth]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        key = (client_id, user_id)
+
+        with self._lock:
+            cached = self._cache.get(key)
+
+        if cached is not None and (self.ttl is None or time.monotonic() - cached[0] < self.ttl):
+            return cached[1]
+
+        user_auth = self.store.load(client_id, user_id)
+
+        if user_auth is not None:
+            with self._lock:
+                self._cache[key] = (time.monotonic(), user_auth)
+
+        return user_auth
+
+    def save(self, user_auth: UserAuth, user_id: str = "") -> None:
+        self.store.save(user_auth, user_id)
+
+        with self._lock:
+            self._cache[(user_auth.client_id, user_id)] = (time.monotonic(), user_auth)
+
+    def delete(self, client_id: str, user_id: str = "") -> None:
+        self.store.delete(client_id, user_id)
+
+        with self._lock:
+            self._cache.pop((client_id, user_id), None)
+
+    def clear(self) -> None:
+        """Forget every cached token, so the next loads read the store."""
+        with self._lock:
+            self._cache.clear()
+
+
+def _matches(user_auth: UserAuth | None, client_id: str) -> bool:
+    """Internal: True if there is a token, and it belongs to client_id or client_id is empty."""
+    return user_auth is not None and (not client_id or user_auth.client_id == client_id)
+
+
+def _file_version(fd: int) -> tuple[int, int, int]:
+    """Internal: The (inode, mtime, size) of an open file, changed whenever it is replaced."""
+    stat = os.fstat(fd)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Internal: Replace the file at path with data, so a crash never leaves a partial file.
+
+    The data is written and flushed to disk in a temporary file, with owner-only
+    permissions, which is then renamed over the target.
+    """
+    directory = os.path.dirname(path)
+    fd, temp_file = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as outfile:
+            outfile.write(data)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+
+        os.replace(temp_file, path)
+
+    except BaseException:
+        os.unlink(temp_file)
+        raise
+
+    _fsync_directory(directory)
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """
+    Internal: Hold an exclusive advisory lock on the '.lock' file beside path.
+
+    The lock is taken on a separate file because the target itself is replaced, and
+    a lock on the replaced file would not be seen by the next writer. Locking is only
+    available where fcntl is; elsewhere saves are still atomic but not serialized.
+    """
+    # Closing the lock file releases the lock
+    with open(f"{path}.lock", "a+b") as lock_file:
+        if fcntl is not None:  # pragma: no branch
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+        yield None
+
+
+def _fsync_directory(directory: str) -> None:
+    """Internal: Flush a rename in directory to disk, where the platform allows it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+
+    except OSError:  # pragma: no cover
+        return
+
+    try:
+        os.fsync(fd)
+
+    except OSError:  # pragma: no cover
+        pass
+
+    finally:
+        os.close(fd)
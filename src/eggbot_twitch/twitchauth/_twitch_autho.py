@@ -1,22 +1,134 @@
 from __future__ import annotations
 
-import json
+import collections
+import concurrent.futures
 import logging
 import os
+import threading
+import time
+from typing import TYPE_CHECKING
 
 import requests
 
+from .. import _codec
 from ._auth import Auth
+from ._tokenstore import CachedTokenStore
+from ._tokenstore import SingleTokenFileStore
 from .clientauth import ClientAuth
 from .userauth import UserAuth
 from .userauthgrant import UserAuthGrant
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 _AUTHO_TOKEN_URL = "https://id.twitch.tv/oauth2/token"
 _DEFAULT_USER_AUTH_FILE = "user_auth.json"
+# How long the result of a refresh is served to late callers holding the old token
+_RECENT_REFRESH_SECONDS = 60.0
+_RECENT_REFRESH_LIMIT = 128
+
+# Seconds a file's token is served from memory before the file is checked again
+_USER_AUTH_CACHE_SECONDS = 1.0
+
+# Store of each file used by load/save_user_authorization, by absolute path
+_stores: dict[str, CachedTokenStore] = {}
+_stores_lock = threading.Lock()
 
 logger = logging.getLogger("twitchauth")
 
 
+class _RefreshCoordinator:
+    """
+    Internal: Collapse refreshes of the same refresh token into a single request.
+
+    Twitch may invalidate a refresh token once it has been used, so concurrent
+    refreshes of one token must not each send a request. The first caller sends the
+    request while the others wait for its result. A successful result is then kept
+    for a short while and returned to callers still holding the old token.
+
+    Twitch may return the same refresh token with a new access token, so a kept
+    result is only served to callers whose access token differs from it. A caller
+    refreshing the result itself, such as after a 401, always sends a request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, concurrent.futures.Future[UserAuth | ClientAuth | None]] = {}
+        self._recent: collections.OrderedDict[str, tuple[float, UserAuth | ClientAuth]]
+        self._recent = collections.OrderedDict()
+
+    def refresh(
+        self,
+        refresh_token: str,
+        access_token: str,
+        request: Callable[[], UserAuth | ClientAuth | None],
+    ) -> UserAuth | ClientAuth | None:
+        """
+        Return the refreshed token, sending the request only if none is in flight.
+
+        Args:
+            refresh_token: Refresh token of the caller's token.
+            access_token: Access token of the caller's token.
+            request: Sends the refresh request.
+        """
+        with self._lock:
+            self._expire_recent()
+            recent = self._recent.get(refresh_token)
+
+            if recent is not None and recent[1].access_token != access_token:
+                logger.debug("Serving recently refreshed token")
+                return recent[1]
+
+            in_flight = self._in_flight.get(refresh_token)
+            owner = in_flight is None
+
+            if in_flight is None:
+                in_flight = self._in_flight[refresh_token] = concurrent.futures.Future()
+
+        if not owner:
+            logger.debug("Waiting on in-flight refresh")
+            return in_flight.result()
+
+        try:
+            result = request()
+
+        except BaseException as exc:
+            with self._lock:
+                del self._in_flight[refresh_token]
+
+            in_flight.set_exception(exc)
+            raise
+
+        # Publish the result in the same step that ends the flight, so no caller
+        # arriving in between sends the spent refresh token again
+        with self._lock:
+            del self._in_flight[refresh_token]
+
+            if result is not None:
+                self._recent[refresh_token] = (time.monotonic(), result)
+
+                while len(self._recent) > _RECENT_REFRESH_LIMIT:
+                    self._recent.popitem(last=False)
+
+        in_flight.set_result(result)
+        return result
+
+    def clear(self) -> None:
+        """Forget recently refreshed tokens."""
+        with self._lock:
+            self._recent.clear()
+
+    def _expire_recent(self) -> None:
+        """Internal: Drop results older than _RECENT_REFRESH_SECONDS. Caller holds the lock."""
+        expire_before = time.monotonic() - _RECENT_REFRESH_SECONDS
+
+        while self._recent and next(iter(self._recent.values()))[0] < expire_before:
+            self._recent.popitem(last=False)
+
+
+_refreshes = _RefreshCoordinator()
+
+
 def get_authorization(
     twitch_app_client_id: str,
     twitch_app_client_secret: str,
@@ -29,6 +141,10 @@ def get_authorization(
     then a new authorization token will be requested, creating a new session. If a
     UserAuth is given, the existing session will be refreshed if possible.
 
+    Concurrent refreshes of the same UserAuth send a single request and share its
+    result. Callers refreshing a token that was refreshed within the last minute
+    receive that result without sending a request, unless they already hold it.
+
     Args:
         twitch_app_client_id: The registered Twitch app id
         twitch_app_client_secret: The registered Twitch app secret
@@ -61,6 +177,12 @@ def get_authorization(
             }
         )
 
+        return _refreshes.refresh(
+            user_auth.refresh_token,
+            user_auth.access_token,
+            lambda: _request_token(data, twitch_app_client_id),
+        )
+
     return _request_token(data, twitch_app_client_id)
 
 
@@ -78,10 +200,10 @@ def _request_token(data: dict[str, str], client_id: str) -> UserAuth | ClientAut
 
     try:
         if data["grant_type"] == "client_credentials":
-            return ClientAuth.parse_response(response.json(), client_id)
+            return ClientAuth.parse_response(_codec.loads(response.content), client_id)
 
         else:
-            return UserAuth.parse_response(response.json(), client_id)
+            return UserAuth.parse_response(_codec.loads(response.content), client_id)
 
     except KeyError:
         logger.error("Unable to parse unexpected response format.")
@@ -103,24 +225,17 @@ def load_user_authorization(
     """
     Attempt to load a UserAuth from file.
 
+    A file that cannot be read or parsed is logged and treated as missing. Loads go
+    through a SingleTokenFileStore with a CachedTokenStore in front. A loaded token
+    is served from memory for _USER_AUTH_CACHE_SECONDS, after which a save by
+    another process is seen at the cost of a stat() per call.
+
     Args:
         user_auth_file: The default file is _DEFAULT_USER_AUTH_FILE. Override this
             location by providing a keyword argument or setting the
             'EGGBOT_TWITCH_USER_AUTH_FILE' environment variable.
     """
-    user_auth_file = _resolve_user_auth_file(user_auth_file)
-
-    logger.debug("Attempting to load authorization from '%s'", user_auth_file)
-
-    try:
-        with open(user_auth_file, "rb") as infile:
-            return UserAuth.load(infile)
-
-    except FileNotFoundError:
-        return None
-
-    except (OSError, json.JSONDecodeError):
-        return None
+    return _user_auth_store(user_auth_file).load("")
 
 
 def save_user_authorization(
@@ -130,15 +245,34 @@ def save_user_authorization(
     """
     Save a UserAuth to file.
 
+    The file is replaced atomically: the UserAuth is written and flushed to disk in a
+    temporary file which is then renamed over the target. A crash leaves either the
+    old file or the new one, never a partial write. Saves from several processes are
+    serialized by an advisory lock on a '.lock' file beside the target.
+
     Args:
         user_authorization: The UserAuth object to save
         user_auth_file: The default file is _DEFAULT_USER_AUTH_FILE. Override this
             location by providing a keyword argument or setting the
             'EGGBOT_TWITCH_USER_AUTH_FILE' environment variable.
     """
-    user_auth_file = _resolve_user_auth_file(user_auth_file)
+    store = _user_auth_store(user_auth_file)
+    store.save(user_authorization)
+    # Loads are keyed by an empty client id, which the save does not replace
+    store.clear()
+
+
+def _user_auth_store(user_auth_file: str | None) -> CachedTokenStore:
+    """Internal: The shared store of a user auth file, created on first use."""
+    path = os.path.abspath(_resolve_user_auth_file(user_auth_file))
+
+    with _stores_lock:
+        store = _stores.get(path)
 
-    logger.debug("Saving authorization to '%s'", user_auth_file)
+        if store is None:
+            store = _stores[path] = CachedTokenStore(
+                SingleTokenFileStore(path),
+                ttl=_USER_AUTH_CACHE_SECONDS,
+            )
 
-    with open(_resolve_user_auth_file(user_auth_file), "wb") as outfile:
-        user_authorization.dump(outfile)
+    return store
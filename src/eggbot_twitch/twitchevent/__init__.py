@@ -1,7 +1,29 @@
 from __future__ import annotations
 
+from ._asyncsession import AsyncSession
+from ._asyncsession import get_async_session
+from ._dispatcher import Dispatcher
 from ._eventclient import get_session
+from ._eventclient import get_sessions
+from ._message import Message
+from ._messagequeue import OverflowPolicy
+from ._messagequeue import QueueStats
+from ._orderedexecutor import OrderedExecutor
+from ._reconnectpolicy import ReconnectPolicy
+from ._shardmanager import ShardManager
+from ._shardmanager import ShardPoolFullError
 
 __all__ = [
+    "AsyncSession",
+    "Dispatcher",
+    "Message",
+    "OrderedExecutor",
+    "OverflowPolicy",
+    "QueueStats",
+    "ReconnectPolicy",
+    "ShardManager",
+    "ShardPoolFullError",
+    "get_async_session",
     "get_session",
+    "get_sessions",
 ]
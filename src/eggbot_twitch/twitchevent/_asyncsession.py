@@ -0,0 +1,150 @@
+"""Asyncio EventSub session, an alternative to the threaded Session."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+import websockets.asyncio.client
+
+from ._eventclient import _INITIAL_MESSAGE_TIMEOUT_SECONDS
+from ._message import Message
+from ._reconnectpolicy import _RETRYABLE_ERRORS
+from ._reconnectpolicy import ReconnectPolicy
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from types import TracebackType
+    from typing import Self
+
+logger = logging.getLogger("eventclient")
+
+
+class AsyncSession:
+    """
+    Represents a websocket session driven by the running event loop.
+
+    Messages are awaited directly from the websocket rather than polled from a thread.
+    Iterate the session with 'async for' to receive each message after the welcome
+    message. Iteration ends when the session is closed.
+
+    Args:
+        uri: URI of the websocket server
+        reconnect_policy: Backoff between connection attempts.
+    """
+
+    def __init__(self, uri: str, reconnect_policy: ReconnectPolicy | None = None) -> None:
+        self.uri = uri
+        self.reconnect_policy = reconnect_policy or ReconnectPolicy()
+        self.session_id = ""
+        self.closed = False
+        self.websocket: websockets.asyncio.client.ClientConnection | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    def __aiter__(self) -> AsyncIterator[Message]:
+        return self.messages()
+
+    async def connect(self) -> None:
+        """
+        Connect to the websocket server, returning as soon as the welcome message arrives.
+
+        Raises:
+            TimeoutError: If the welcome message takes longer than _INITIAL_MESSAGE_TIMEOUT_SECONDS
+            ConnectionError: If the session could not be created
+        """
+        retry_count = 0
+
+        while True:
+            try:
+                self.websocket = await websockets.asyncio.client.connect(self.uri)
+                break
+
+            except _RETRYABLE_ERRORS as exc:
+                if retry_count >= self.reconnect_policy.max_retries:
+                    logger.error("Connection failed %s", exc)
+                    msg = f"Failed to establish connection to websocket server after {self.reconnect_policy.max_retries} retries. {exc}"
+                    raise ConnectionError(msg) from exc
+
+                backoff = self.reconnect_policy.delay(retry_count)
+                logger.warning("Connection failed: Attempting reconnect in %.2f seconds", backoff)
+                await asyncio.sleep(backoff)
+                retry_count += 1
+
+        try:
+            async with asyncio.timeout(_INITIAL_MESSAGE_TIMEOUT_SECONDS):
+                welcome = await _receive_welcome(self.websocket)
+
+        except TimeoutError:
+            await self.close()
+            raise TimeoutError("Connection to session hit max timeout.") from None
+
+        self.session_id = welcome.payload["session"]["id"]
+
+    async def messages(self) -> AsyncIterator[Message]:
+        """Yield each message as it arrives until the session is closed."""
+        if self.websocket is None:
+            return
+
+        while not self.closed:
+            try:
+                yield Message.parse(await self.websocket.recv(decode=True))
+
+            except websockets.exceptions.ConnectionClosedOK:
+                return
+
+            except websockets.exceptions.ConnectionClosedError as exc:
+                logger.error("Connection closed: %s", exc)
+                return
+
+    async def close(self) -> None:
+        """Close the session's websocket."""
+        self.closed = True
+
+        if self.websocket is not None:
+            await self.websocket.close()
+
+
+async def _receive_welcome(websocket: websockets.asyncio.client.ClientConnection) -> Message:
+    """Internal: Discard messages until the session welcome message of a connection arrives."""
+    while True:
+        message = Message.parse(await websocket.recv(decode=True))
+
+        if message.message_type == "session_welcome":
+            return message
+
+        logger.warning("Discarding %s message received before welcome.", message.message_type)
+
+
+async def get_async_session(
+    uri: str,
+    reconnect_policy: ReconnectPolicy | None = None,
+) -> AsyncSession:
+    """
+    Start an asyncio EventSub Session, and return that session.
+
+    Returns as soon as the session's welcome message is received.
+
+    Args:
+        uri (str): URI of the websocket server
+        reconnect_policy (ReconnectPolicy): Backoff between connection attempts.
+
+    Raises:
+        TimeoutError: If waiting for a session id exceeds _INITIAL_MESSAGE_TIMEOUT_SECONDS
+        ConnectionError: If the session could not be created
+    """
+    session = AsyncSession(uri, reconnect_policy)
+
+    await session.connect()
+
+    return session
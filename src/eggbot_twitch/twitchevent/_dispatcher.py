@@ -0,0 +1,142 @@
+"""Route EventSub messages to the handlers registered for their type."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+
+    from ._message import Message
+    from ._orderedexecutor import OrderedExecutor
+
+    Handler = Callable[[Message], object]
+
+# Session housekeeping frames, consumed by the dispatcher and never handed to handlers
+_INTERNAL_MESSAGE_TYPES = frozenset({"session_welcome", "session_keepalive", "session_reconnect"})
+
+logger = logging.getLogger("eventclient")
+
+
+class Dispatcher:
+    """
+    Route messages to handlers registered by message type and subscription type.
+
+    Handlers are looked up with a single dict index per message. Welcome, keepalive,
+    and reconnect messages are dropped before lookup so they never reach handlers.
+
+    By default handlers run on the thread calling dispatch(). Given an executor,
+    handlers run on its thread pool instead; messages sharing a key are handled one
+    at a time in arrival order, while other keys are handled in parallel.
+
+    Args:
+        executor: An OrderedExecutor to run handlers on.
+        key: Returns the ordering key of a message. Defaults to the broadcaster user
+            id of the subscription condition.
+
+    Example:
+        dispatcher = Dispatcher()
+
+        @dispatcher.on("channel.follow")
+        def on_follow(message: Message) -> None: ...
+
+        dispatcher.run(session)
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: OrderedExecutor | None = None,
+        key: Callable[[Message], Hashable] | None = None,
+    ) -> None:
+        self._handlers: dict[tuple[str, str], list[Handler]] = {}
+        self._executor = executor
+        self._key = key or broadcaster_key
+
+    def register(
+        self,
+        handler: Handler,
+        subscription_type: str,
+        *,
+        message_type: str = "notification",
+    ) -> None:
+        """
+        Register a handler, called in registration order with each matching message.
+
+        Args:
+            handler: Callable that accepts a Message. The return value is ignored.
+            subscription_type: The subscription type to handle, e.g. 'channel.follow'.
+            message_type: The message type to handle, 'notification' or 'revocation'.
+
+        Raises:
+            ValueError: If message_type is handled internally by the dispatcher.
+        """
+        if message_type in _INTERNAL_MESSAGE_TYPES:
+            raise ValueError(f"Message type '{message_type}' is handled internally.")
+
+        self._handlers.setdefault((message_type, subscription_type), []).append(handler)
+
+    def on(
+        self,
+        subscription_type: str,
+        *,
+        message_type: str = "notification",
+    ) -> Callable[[Handler], Handler]:
+        """Decorator form of register()."""
+
+        def decorator(handler: Handler) -> Handler:
+            self.register(handler, subscription_type, message_type=message_type)
+            return handler
+
+        return decorator
+
+    def dispatch(self, message: Message) -> bool:
+        """
+        Call each handler registered for the message.
+
+        Exceptions raised by a handler are logged and do not stop the remaining handlers.
+        With an executor, the handlers are scheduled and this blocks only while the
+        executor's queue for the message key is full.
+
+        Returns:
+            True if at least one handler was registered for the message.
+        """
+        if message.message_type in _INTERNAL_MESSAGE_TYPES:
+            return False
+
+        handlers = self._handlers.get((message.message_type, message.subscription_type))
+
+        if not handlers:
+            return False
+
+        if self._executor is None:
+            _call_handlers(handlers, message)
+
+        else:
+            self._executor.submit(self._key(message), _call_handlers, handlers, message)
+
+        return True
+
+    def run(self, messages: Iterable[Message]) -> None:
+        """Dispatch every message from a Session, or any iterable, until it is exhausted."""
+        for message in messages:
+            self.dispatch(message)
+
+
+def broadcaster_key(message: Message) -> str:
+    """Ordering key of a message: the broadcaster user id of its subscription condition."""
+    condition = message.payload.get("subscription", {}).get("condition", {})
+    return condition.get("broadcaster_user_id", "")
+
+
+def _call_handlers(handlers: list[Handler], message: Message) -> None:
+    """Internal: Call each handler with the message, logging any that fail."""
+    for handler in handlers:
+        try:
+            handler(message)
+
+        except Exception:
+            logger.exception("Handler failed for message %s", message.message_id)
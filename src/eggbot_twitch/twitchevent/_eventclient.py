@@ -1,25 +1,47 @@
 from __future__ import annotations
 
-import json
+import collections
+import contextlib
 import logging
+import queue
 import threading
 import time
+from typing import TYPE_CHECKING
 
 import websockets.sync.client
 
+from ._message import Message
+from ._messagequeue import OverflowPolicy
+from ._reconnectpolicy import _RETRYABLE_ERRORS
+from ._reconnectpolicy import ReconnectPolicy
 from ._session import Session
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+
+    from websockets.sync.client import ClientConnection
+
 # TODO
 # - capture exit signal sigkill, clean up all sessions
 
 _INITIAL_MESSAGE_TIMEOUT_SECONDS = 10.0
 _CONNECTION_TIMEOUT_SECONDS = _INITIAL_MESSAGE_TIMEOUT_SECONDS + 1
-_MAX_CONNECTION_RETRIES = 3
+_HANDOFF_POLL_SECONDS = 0.05
+_KEEPALIVE_GRACE_SECONDS = 1.0
+_RECENT_MESSAGE_IDS = 1024
 
 logger = logging.getLogger("eventclient")
 
 
-def get_session(uri: str) -> Session:
+def get_session(
+    uri: str,
+    *,
+    maxsize: int = 0,
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    reconnect_policy: ReconnectPolicy | None = None,
+    on_reconnect: Callable[[Session, str], object] | None = None,
+) -> Session:
     """
     Start a EventSub Session, and return that session.
 
@@ -27,66 +49,383 @@ def get_session(uri: str) -> Session:
 
     Args:
         uri (str): URI of the websocket server
+        maxsize (int): Maximum number of messages held by the session. Unbounded if zero.
+        overflow (OverflowPolicy): How a full session handles new messages.
+        reconnect_policy (ReconnectPolicy): Backoff between connection attempts.
+        on_reconnect (Callable): Called with the session and its previous session_id
+            each time a lost connection is replaced by a new session.
 
     Raises:
         TimeoutError: If waiting for a session id exceeds _CONNECTION_TIMEOUT_SECONDS
         ConnectoinError: If the session could not be created
     """
+    return get_sessions(
+        [uri],
+        maxsize=maxsize,
+        overflow=overflow,
+        reconnect_policy=reconnect_policy,
+        on_reconnect=on_reconnect,
+    )[0]
 
-    session = Session(uri, False)
 
-    session.thread = threading.Thread(target=_session_thread, args=(session,))
+def get_sessions(
+    uris: Sequence[str],
+    *,
+    maxsize: int = 0,
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    reconnect_policy: ReconnectPolicy | None = None,
+    on_reconnect: Callable[[Session, str], object] | None = None,
+) -> list[Session]:
+    """
+    Start an EventSub Session for each uri at the same time, and return those sessions.
 
-    session.thread.start()
+    Blocks until all sessions are started. If any session fails to start, all of the
+    sessions are closed.
+
+    Args:
+        uris (Sequence[str]): URI of the websocket server for each session
+        maxsize (int): Maximum number of messages held by each session. Unbounded if zero.
+        overflow (OverflowPolicy): How a full session handles new messages.
+        reconnect_policy (ReconnectPolicy): Backoff between connection attempts.
+        on_reconnect (Callable): Called with a session and its previous session_id
+            each time a lost connection is replaced by a new session.
+
+    Raises:
+        TimeoutError: If waiting for a session id exceeds _CONNECTION_TIMEOUT_SECONDS
+        ConnectoinError: If a session could not be created
+    """
+    reconnect_policy = reconnect_policy or ReconnectPolicy()
+    sessions = [
+        Session(
+            uri,
+            False,
+            maxsize=maxsize,
+            overflow=overflow,
+            reconnect_policy=reconnect_policy,
+            on_reconnect=on_reconnect,
+        )
+        for uri in uris
+    ]
+
+    for session in sessions:
+        session.thread = threading.Thread(target=_session_thread, args=(session,))
+        session.thread.start()
+
+    timeout_at = time.monotonic() + _CONNECTION_TIMEOUT_SECONDS
+
+    for session in sessions:
+        session.ready.wait(max(0.0, timeout_at - time.monotonic()))
 
-    timeout_at = time.time() + _CONNECTION_TIMEOUT_SECONDS
-    while time.time() < timeout_at:
         if session.session_id:
-            return session
+            continue
+
+        for _session in sessions:
+            _session.close()
 
         if session.exception is not None:
-            session.close()
-            msg = f"Failed to establish connection to websocket server after {_MAX_CONNECTION_RETRIES} retries. {session.exception}"
+            msg = f"Failed to establish connection to websocket server after {reconnect_policy.max_retries} retries. {session.exception}"
             raise ConnectionError(msg) from session.exception
 
-        time.sleep(0.1)
+        raise TimeoutError("Connection to session hit max timeout.")
 
-    session.close()
-    raise TimeoutError("Connection to session hit max timeout.")
+    return sessions
 
 
-def _session_thread(session: Session, retry_count: int = 0) -> None:
-    """Internal: Session Thread."""
+class _RecentMessageIds:
+    """Internal: Remembers the most recent message ids to drop redelivered messages."""
+
+    def __init__(self, max_size: int = _RECENT_MESSAGE_IDS) -> None:
+        self._ids: collections.OrderedDict[str, None] = collections.OrderedDict()
+        self._max_size = max_size
+
+    def add(self, message_id: str) -> bool:
+        """Remember a message id, returning False if it was already seen."""
+        if message_id in self._ids:
+            return False
+
+        self._ids[message_id] = None
+        if len(self._ids) > self._max_size:
+            self._ids.popitem(last=False)
+
+        return True
+
+
+def _session_thread(session: Session) -> None:
+    """
+    Internal: Session Thread.
+
+    Connects, and reconnects after a failure, until the session is stopped. Waits
+    between attempts as directed by the session's reconnect policy, giving up after
+    its max_retries consecutive failures. Timeouts of the handshake or the welcome
+    message are retried like any other connection failure. The error that made the
+    thread give up is kept in session.exception.
+
+    Every connection after the first starts a new session, see Session.on_reconnect.
+    """
     session.active = True
+    retry_count = 0
 
     try:
-        with websockets.sync.client.connect(session.uri) as websocket:
+        while not session.stop_flag.is_set():
+            try:
+                # Holds the connection being read, swapped for a new one by a handoff
+                with contextlib.ExitStack() as connections:
+                    websocket = connections.enter_context(
+                        websockets.sync.client.connect(session.uri)
+                    )
 
-            # I'm assuming the first message will be the session_id
-            # That's safe.... right?
-            init_message = websocket.recv(timeout=_INITIAL_MESSAGE_TIMEOUT_SECONDS)
-            _init_message = json.loads(init_message)
+                    previous_session_id = session.session_id
+                    _start(session, _receive_welcome(websocket))
+                    session.ready.set()
+                    retry_count = 0
 
-            session.session_id = _init_message["payload"]["session"]["id"]
+                    if previous_session_id:
+                        _notify_reconnect(session, previous_session_id)
 
-            while not session.stop_flag.is_set():
-                try:
-                    message = websocket.recv(timeout=0.1, decode=True)
+                    _read_messages(session, websocket, connections)
 
-                except TimeoutError:
-                    continue
+            # Includes TimeoutError, raised by a handshake or welcome that takes too long
+            except _RETRYABLE_ERRORS as exc:
+                if retry_count >= session.reconnect_policy.max_retries:
+                    logger.error("Connection failed, giving up: %r", exc)
+                    session.exception = exc
+                    return
 
-                session.messages.put(message)
+                backoff = session.reconnect_policy.delay(retry_count)
+                logger.warning(
+                    "Connection failed: %r. Attempting reconnect in %.2f seconds", exc, backoff
+                )
+                session.stop_flag.wait(backoff)
+                retry_count += 1
 
-    except (ConnectionResetError, ConnectionRefusedError) as exc:
-        if retry_count < _MAX_CONNECTION_RETRIES:
-            backoff = 0.3 * retry_count
-            logger.warning("Connection failed: Attempting reconnect in %s seconds", backoff)
-            time.sleep(backoff)
-            _session_thread(session, retry_count + 1)
-        else:
-            logger.error("Connection failed %s", exc)
-            session.exception = exc
+            except Exception as exc:
+                logger.exception("Session thread failed")
+                session.exception = exc
+                return
 
     finally:
         session.active = False
+        session.ready.set()
+        session.messages.shutdown()
+
+
+def _receive_welcome(websocket: ClientConnection) -> Message:
+    """
+    Internal: Wait for the session welcome message of a new connection.
+
+    Raises:
+        TimeoutError: If no welcome arrives within _INITIAL_MESSAGE_TIMEOUT_SECONDS
+    """
+    timeout_at = time.monotonic() + _INITIAL_MESSAGE_TIMEOUT_SECONDS
+
+    while True:
+        timeout = max(0.0, timeout_at - time.monotonic())
+        message = Message.parse(websocket.recv(timeout=timeout, decode=True))
+
+        if message.message_type == "session_welcome":
+            return message
+
+        logger.warning("Discarding %s message received before welcome.", message.message_type)
+
+
+def _start(session: Session, welcome: Message) -> None:
+    """Internal: Take the session id and keepalive timeout from a welcome message."""
+    session.session_id = welcome.payload["session"]["id"]
+    session.keepalive_timeout_seconds = (
+        welcome.payload["session"]["keepalive_timeout_seconds"] or 0.0
+    )
+    session.last_frame_at = time.monotonic()
+
+
+def _notify_reconnect(session: Session, previous_session_id: str) -> None:
+    """Internal: Count a new session replacing a lost one, and call on_reconnect."""
+    session.generation += 1
+    logger.info("Session %s replaced by %s", previous_session_id, session.session_id)
+
+    if session.on_reconnect is None:
+        return
+
+    try:
+        session.on_reconnect(session, previous_session_id)
+
+    except Exception:
+        logger.exception("on_reconnect callback failed")
+
+
+def _keepalive_expired(session: Session) -> bool:
+    """Internal: True if the server has been silent for longer than its keepalive timeout."""
+    if not session.keepalive_timeout_seconds:
+        return False
+
+    return session.last_frame_age > session.keepalive_timeout_seconds + _KEEPALIVE_GRACE_SECONDS
+
+
+def _read_messages(
+    session: Session,
+    websocket: ClientConnection,
+    connections: contextlib.ExitStack,
+) -> None:
+    """
+    Internal: Queue messages from the websocket until the session is stopped.
+
+    Redelivered messages are dropped by message id. A session_reconnect message hands
+    the session over to the connection at its reconnect_url, which then replaces the
+    current connection on connections. A failed handoff keeps reading the current
+    connection.
+
+    Raises:
+        ConnectionResetError: If no frame arrives within the keepalive timeout of the
+            session, plus _KEEPALIVE_GRACE_SECONDS.
+    """
+    recent_ids = _RecentMessageIds()
+
+    while not session.stop_flag.is_set():
+        try:
+            message = Message.parse(websocket.recv(timeout=0.1, decode=True))
+
+        except TimeoutError:
+            if _keepalive_expired(session):
+                logger.warning(
+                    "No message for %.1f seconds, connection presumed dead.", session.last_frame_age
+                )
+                raise ConnectionResetError("Keepalive timeout exceeded.") from None
+
+            continue
+
+        session.last_frame_at = time.monotonic()
+
+        if message.message_type == "session_reconnect":
+            websocket = _reconnect(session, websocket, message, connections, recent_ids)
+            continue
+
+        if not recent_ids.add(message.message_id):
+            continue
+
+        try:
+            session.messages.put(message)
+
+        except queue.ShutDown:
+            break
+
+
+def _reconnect(
+    session: Session,
+    websocket: ClientConnection,
+    message: Message,
+    connections: contextlib.ExitStack,
+    recent_ids: _RecentMessageIds,
+) -> ClientConnection:
+    """
+    Internal: Follow a session_reconnect message, returning the connection to read next.
+
+    Once handed off, the new connection replaces the current one on connections, which
+    is released. A new connection that is not handed off is closed here. If the reconnect_url cannot be connected to, or does not welcome the session in
+    time, the error is kept in session.last_error and the current connection, which
+    is still delivering until the server closes it, is returned.
+    """
+    reconnect_url = message.payload["session"]["reconnect_url"]
+
+    with contextlib.ExitStack() as opened:
+        try:
+            new_websocket = opened.enter_context(websockets.sync.client.connect(reconnect_url))
+
+        except _RETRYABLE_ERRORS as exc:
+            logger.warning("Reconnect failed: %r. Staying on the current connection.", exc)
+            session.last_error = exc
+            return websocket
+
+        try:
+            websocket = _handoff(session, websocket, new_websocket, recent_ids)
+
+        except _RETRYABLE_ERRORS as exc:
+            logger.warning("Handoff failed: %r. Staying on the current connection.", exc)
+            session.last_error = exc
+            return websocket
+
+        if websocket is new_websocket:
+            # Release the old connection, leaving only the new one on the stack
+            connections.close()
+            connections.enter_context(opened.pop_all())
+
+    return websocket
+
+
+def _handoff(
+    session: Session,
+    websocket: ClientConnection,
+    new_websocket: ClientConnection,
+    recent_ids: _RecentMessageIds,
+) -> ClientConnection:
+    """
+    Internal: Move the session to new_websocket without losing messages.
+
+    The current connection keeps being read until the new connection's welcome
+    arrives. Anything still buffered on the current connection is then queued before
+    it is closed, and the new connection is returned. If the session is stopped
+    first, the current connection is returned.
+
+    Raises:
+        TimeoutError: If no welcome arrives within _INITIAL_MESSAGE_TIMEOUT_SECONDS
+        ConnectionClosed: If the new connection closes before its welcome
+    """
+    logger.info("Handing off session %s to a new connection", session.session_id)
+    timeout_at = time.monotonic() + _INITIAL_MESSAGE_TIMEOUT_SECONDS
+    current_open = True
+
+    while not session.stop_flag.is_set():
+        if time.monotonic() > timeout_at:
+            raise TimeoutError("Timed out waiting for the reconnect welcome message.")
+
+        try:
+            welcome = Message.parse(new_websocket.recv(timeout=_HANDOFF_POLL_SECONDS, decode=True))
+
+        except TimeoutError:
+            pass
+
+        else:
+            if welcome.message_type == "session_welcome":
+                break
+
+        if current_open:
+            current_open = _forward(session, websocket, recent_ids)
+
+    else:
+        return websocket
+
+    while current_open:
+        current_open = _forward(session, websocket, recent_ids, timeout=0)
+
+    websocket.close()
+    _start(session, welcome)
+
+    return new_websocket
+
+
+def _forward(
+    session: Session,
+    websocket: ClientConnection,
+    recent_ids: _RecentMessageIds,
+    timeout: float = _HANDOFF_POLL_SECONDS,
+) -> bool:
+    """
+    Internal: Queue one message from a connection being handed off.
+
+    Returns:
+        False once the connection has nothing more to give, True otherwise.
+    """
+    try:
+        message = Message.parse(websocket.recv(timeout=timeout, decode=True))
+
+    except TimeoutError:
+        return timeout > 0
+
+    except websockets.exceptions.ConnectionClosed:
+        return False
+
+    session.last_frame_at = time.monotonic()
+
+    if recent_ids.add(message.message_id):
+        with contextlib.suppress(queue.ShutDown):
+            session.messages.put(message)
+
+    return True
@@ -0,0 +1,49 @@
+"""EventSub websocket message, parsed once from its raw frame."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any
+
+from .. import _codec
+
+
+@dataclasses.dataclass(slots=True)
+class Message:
+    """
+    Represents one EventSub websocket message.
+
+    The frame is decoded once, when the message is parsed. A single decode of the
+    whole frame is cheaper than splitting out the metadata and decoding the payload
+    on demand, even for keepalives that never read their payload.
+    """
+
+    raw: str
+    message_id: str
+    message_type: str
+    message_timestamp: str
+    subscription_type: str = ""
+    subscription_version: str = ""
+    payload: dict[str, Any] = dataclasses.field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def parse(cls, raw: str) -> Message:
+        """
+        Parse a raw websocket frame.
+
+        Raises:
+            ValueError: If the frame is not valid JSON.
+            KeyError: If the frame is missing required metadata.
+        """
+        contents = _codec.loads(raw)
+        metadata = contents["metadata"]
+
+        return cls(
+            raw=raw,
+            message_id=metadata["message_id"],
+            message_type=metadata["message_type"],
+            message_timestamp=metadata["message_timestamp"],
+            subscription_type=metadata.get("subscription_type", ""),
+            subscription_version=metadata.get("subscription_version", ""),
+            payload=contents["payload"],
+        )
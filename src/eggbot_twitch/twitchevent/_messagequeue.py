@@ -0,0 +1,210 @@
+"""Queue of session messages supporting batch retrieval and bounded overflow."""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import os
+import pickle
+import queue
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class OverflowPolicy(enum.Enum):
+    """What a bounded MessageQueue does with a put() when it is full."""
+
+    BLOCK = "block"
+    """Block the producer until there is room."""
+
+    DROP_OLDEST = "drop_oldest"
+    """Discard the oldest queued item to make room."""
+
+    DROP_KEEPALIVE = "drop_keepalive"
+    """Discard the oldest droppable item, such as a keepalive, else the oldest item."""
+
+    SPILL = "spill"
+    """Write items past maxsize to a temporary file, read back in order as room frees."""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class QueueStats:
+    """Snapshot of the overflow counters of a MessageQueue."""
+
+    dropped: int
+    spilled: int
+
+
+class MessageQueue[T](queue.Queue[T]):
+    """
+    A queue.Queue that can hand over everything queued in a single operation.
+
+    A maxsize above zero bounds the number of items held in memory, with the policy
+    deciding what happens to a put() once the queue is full. Only BLOCK makes the
+    producer wait; every other policy accepts the put immediately.
+
+    Args:
+        maxsize: Maximum number of items held in memory. Unbounded if zero.
+        policy: How to handle a put() when the queue is full.
+        droppable: Identifies items DROP_KEEPALIVE discards first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        droppable: Callable[[T], bool] | None = None,
+    ) -> None:
+        super().__init__(maxsize)
+        self.policy = policy
+        self._droppable = droppable or (lambda item: False)
+        self._dropped = 0
+        self._spilled = 0
+        self._spill: _SpillFile[T] | None = None
+
+    @property
+    def stats(self) -> QueueStats:
+        """Counters of items dropped or spilled to disk since creation."""
+        with self.mutex:
+            return QueueStats(self._dropped, self._spilled)
+
+    def put(self, item: T, block: bool = True, timeout: float | None = None) -> None:
+        """
+        Put an item into the queue, applying the overflow policy if the queue is full.
+
+        Raises:
+            queue.Full: Only under the BLOCK policy, as queue.Queue.put().
+            queue.ShutDown: If the queue is shut down.
+        """
+        if self.policy is OverflowPolicy.BLOCK:
+            return super().put(item, block, timeout)
+
+        with self.not_full:
+            if self.is_shutdown:
+                raise queue.ShutDown
+
+            if 0 < self.maxsize <= len(self.queue) and self.policy is not OverflowPolicy.SPILL:
+                if not self._drop(item):
+                    return
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def get_batch(self, max_items: int | None = None, timeout: float | None = None) -> list[T]:
+        """
+        Remove and return all queued items, waiting until at least one is available.
+
+        Args:
+            max_items: Return at most this many items. All queued items if None.
+            timeout: Seconds to wait for an item. Waits forever if None.
+
+        Returns:
+            The queued items, oldest first. Empty if the timeout expired.
+
+        Raises:
+            queue.ShutDown: If the queue is shut down and empty.
+        """
+        with self.not_empty:
+            if timeout is None:
+                while not self._qsize():
+                    if self.is_shutdown:
+                        raise queue.ShutDown
+                    self.not_empty.wait()
+
+            else:
+                end_at = time.monotonic() + timeout
+                while not self._qsize():
+                    if self.is_shutdown:
+                        raise queue.ShutDown
+                    remaining = end_at - time.monotonic()
+                    if remaining <= 0.0:
+                        return []
+                    self.not_empty.wait(remaining)
+
+            count = self._qsize() if max_items is None else min(max_items, self._qsize())
+            items = [self._get() for _ in range(count)]
+            self.not_full.notify(count)
+
+            return items
+
+    def _drop(self, item: T) -> bool:
+        """
+        Internal: Make room for item under a drop policy. Caller holds the mutex.
+
+        Returns:
+            False if item itself is the one dropped and must not be queued.
+        """
+        self._dropped += 1
+
+        if self.policy is OverflowPolicy.DROP_KEEPALIVE:
+            if self._droppable(item):
+                return False
+
+            for index, queued in enumerate(self.queue):
+                if self._droppable(queued):
+                    del self.queue[index]
+                    self.unfinished_tasks -= 1
+                    return True
+
+        self.queue.popleft()
+        self.unfinished_tasks -= 1
+        return True
+
+    # The methods below override queue.Queue storage so SPILL can extend it to disk.
+    # They are called with the mutex held.
+
+    def _qsize(self) -> int:
+        return len(self.queue) + (self._spill.count if self._spill is not None else 0)
+
+    def _put(self, item: T) -> None:
+        if self.policy is OverflowPolicy.SPILL and 0 < self.maxsize <= self._qsize():
+            if self._spill is None:
+                self._spill = _SpillFile()
+
+            self._spill.push(item)
+            self._spilled += 1
+
+        else:
+            self.queue.append(item)
+
+    def _get(self) -> T:
+        item = self.queue.popleft()
+
+        if self._spill is not None and self._spill.count:
+            self.queue.append(self._spill.pop())
+
+        return item
+
+
+class _SpillFile[T]:
+    """Internal: First in, first out store of pickled items in a temporary file."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._file = tempfile.TemporaryFile()
+        self._read_at = 0
+
+    def push(self, item: T) -> None:
+        """Append an item to the end of the file."""
+        self._file.seek(0, os.SEEK_END)
+        pickle.dump(item, self._file)
+        self.count += 1
+
+    def pop(self) -> T:
+        """Read the oldest item, emptying the file once every item has been read."""
+        self._file.seek(self._read_at)
+        item: T = pickle.load(self._file)
+        self._read_at = self._file.tell()
+        self.count -= 1
+
+        if not self.count:
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_at = 0
+
+        return item
@@ -0,0 +1,121 @@
+"""Thread pool that runs work for the same key in submission order."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from types import TracebackType
+    from typing import Any
+    from typing import Self
+
+    _WorkItem = tuple[concurrent.futures.Future[Any], Callable[..., Any], tuple[Any, ...]]
+
+_DEFAULT_MAX_WORKERS = 4
+_DEFAULT_QUEUE_SIZE = 100
+
+
+class OrderedExecutor:
+    """
+    Run submitted callables on a fixed pool of threads, in order for each key.
+
+    Every key is pinned to one worker by its hash, so work sharing a key runs one at
+    a time in the order it was submitted while other keys run in parallel. Each
+    worker has a bounded queue; submit() blocks when the chosen worker's queue is
+    full, pushing back on the producer instead of buffering without limit.
+
+    Args:
+        max_workers: Number of worker threads.
+        queue_size: Maximum pending work items per worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        queue_size: int = _DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        self._queues: list[queue.Queue[_WorkItem]] = [
+            queue.Queue(maxsize=queue_size) for _ in range(max_workers)
+        ]
+        self._threads = [
+            threading.Thread(target=self._worker, args=(work,), daemon=True)
+            for work in self._queues
+        ]
+
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args: Any,
+    ) -> concurrent.futures.Future[Any]:
+        """
+        Schedule fn(*args) after all previously submitted work for the same key.
+
+        Blocks while the queue of the worker owning the key is full.
+
+        Raises:
+            RuntimeError: If the executor has been shut down.
+        """
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+
+        try:
+            self._queues[hash(key) % len(self._queues)].put((future, fn, args))
+
+        except queue.ShutDown:
+            raise RuntimeError("Cannot submit work after shutdown.") from None
+
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work. Queued work still runs before the workers exit.
+
+        Args:
+            wait: Block until all queued work has finished.
+        """
+        for work in self._queues:
+            work.shutdown()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    @staticmethod
+    def _worker(work: queue.Queue[_WorkItem]) -> None:
+        """Internal: Run work items from one queue until it is shut down and drained."""
+        while True:
+            try:
+                future, fn, args = work.get()
+
+            except queue.ShutDown:
+                return
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+
+                except BaseException as exc:
+                    future.set_exception(exc)
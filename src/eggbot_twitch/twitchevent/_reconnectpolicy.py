@@ -0,0 +1,54 @@
+"""Backoff between attempts to (re)connect an EventSub session."""
+
+from __future__ import annotations
+
+import dataclasses
+import random
+
+import websockets.exceptions
+
+_DEFAULT_MAX_RETRIES = 3
+_DEFAULT_BASE_DELAY_SECONDS = 0.5
+_DEFAULT_MAX_DELAY_SECONDS = 30.0
+
+# Failures worth another attempt. OSError covers refused and reset connections as well
+# as DNS failures (socket.gaierror).
+_RETRYABLE_ERRORS = (
+    OSError,
+    websockets.exceptions.ConnectionClosed,
+    websockets.exceptions.InvalidHandshake,
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ReconnectPolicy:
+    """
+    Exponential backoff with full jitter between connection attempts.
+
+    The delay before retry n (counting from zero) is a random number of seconds
+    between zero and min(max_delay, base_delay * 2 ** n). Spreading retries across
+    the whole window keeps many sessions failing at once from reconnecting in
+    lockstep. The retry count resets once a connection is welcomed.
+
+    Args:
+        max_retries: Consecutive failed attempts allowed before giving up.
+        base_delay: Upper bound, in seconds, of the first delay.
+        max_delay: Cap, in seconds, of the delay window.
+    """
+
+    max_retries: int = _DEFAULT_MAX_RETRIES
+    base_delay: float = _DEFAULT_BASE_DELAY_SECONDS
+    max_delay: float = _DEFAULT_MAX_DELAY_SECONDS
+
+    def __post_init__(self) -> None:
+        if self.max_retries < 0:
+            raise ValueError("max_retries cannot be negative.")
+
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError("Delays cannot be negative.")
+
+    def delay(self, retry: int) -> float:
+        """Seconds to wait before the given retry, counting from zero."""
+        # The exponent is capped to keep large retry counts from overflowing a float
+        window = min(self.max_delay, self.base_delay * 2.0 ** min(retry, 64))
+        return random.uniform(0.0, window)
@@ -3,27 +3,113 @@ from __future__ import annotations
 import dataclasses
 import queue
 import threading
+import time
+from collections.abc import Callable
 from collections.abc import Iterator
 
+from ._message import Message
+from ._messagequeue import MessageQueue
+from ._messagequeue import OverflowPolicy
+from ._messagequeue import QueueStats
+from ._reconnectpolicy import ReconnectPolicy
+
 
 @dataclasses.dataclass
 class Session:
-    """Represents a webscocket session."""
+    """
+    Represents a webscocket session.
+
+    The maxsize and overflow fields bound the message queue. By default the queue is
+    unbounded; see OverflowPolicy for the behavior once a bounded queue is full.
+
+    'exception' holds the error that ended the session. 'last_error' holds the most
+    recent error the session recovered from, such as a failed reconnect handoff.
+    """
 
     uri: str
     active: bool
     session_id: str = ""
-    messages: queue.Queue[str] = dataclasses.field(default_factory=queue.Queue)
+    messages: MessageQueue[Message] = dataclasses.field(init=False)
     thread: threading.Thread = dataclasses.field(default_factory=threading.Thread)
     stop_flag: threading.Event = dataclasses.field(default_factory=threading.Event)
+    ready: threading.Event = dataclasses.field(default_factory=threading.Event)
     exception: Exception | None = None
+    last_error: Exception | None = None
+    maxsize: int = 0
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    reconnect_policy: ReconnectPolicy = dataclasses.field(default_factory=ReconnectPolicy)
+    keepalive_timeout_seconds: float = 0.0
+    last_frame_at: float = 0.0
+    on_reconnect: Callable[[Session, str], object] | None = None
+    generation: int = 0
+
+    def __post_init__(self) -> None:
+        self.messages = MessageQueue(self.maxsize, self.overflow, _is_keepalive)
+
+    def __iter__(self) -> Iterator[Message]:
+        """Yield each message as it arrives, until the session is closed and drained."""
+        while True:
+            try:
+                yield self.messages.get()
+
+            except queue.ShutDown:
+                return
+
+    @property
+    def last_frame_age(self) -> float:
+        """Seconds since the last frame, of any type, was received. Zero before the first."""
+        if not self.last_frame_at:
+            return 0.0
+
+        return time.monotonic() - self.last_frame_at
+
+    @property
+    def queue_stats(self) -> QueueStats:
+        """Counters of messages dropped or spilled to disk by the overflow policy."""
+        return self.messages.stats
 
     def close(self) -> None:
         """Close the session, exiting the internal thread."""
         self.stop_flag.set()
+        # Releases the internal thread if it is blocked on a full queue
+        self.messages.shutdown()
         self.thread.join()
 
-    def message_iter(self, max_poll_count: int = 10, poll_timeout: float = 0.1) -> Iterator[str]:
+    def get_message(self, timeout: float | None = None) -> Message | None:
+        """
+        Block until a message arrives, returning None once the session is closed and drained.
+
+        Args:
+            timeout: Seconds to wait for a message. Waits forever if None.
+        """
+        try:
+            return self.messages.get(timeout=timeout)
+
+        except (queue.Empty, queue.ShutDown):
+            return None
+
+    def get_batch(
+        self, max_items: int | None = None, timeout: float | None = None
+    ) -> list[Message]:
+        """
+        Block until a message arrives, then return every queued message in one operation.
+
+        Returns an empty list once the session is closed and drained, or when the
+        timeout expires.
+
+        Args:
+            max_items: Return at most this many messages. All queued messages if None.
+            timeout: Seconds to wait for a message. Waits forever if None.
+        """
+        try:
+            return self.messages.get_batch(max_items, timeout)
+
+        except queue.ShutDown:
+            return []
+
+    def message_iter(
+        self, max_poll_count: int = 10, poll_timeout: float = 0.1
+    ) -> Iterator[Message]:
         """Iterator that returns up to max_poll_count messages from queue."""
         for _ in range(max_poll_count):
             try:
@@ -31,3 +117,11 @@ class Session:
 
             except queue.Empty:
                 continue
+
+            except queue.ShutDown:
+                return
+
+
+def _is_keepalive(message: Message) -> bool:
+    """Internal: Keepalive messages are the first dropped by OverflowPolicy.DROP_KEEPALIVE."""
+    return message.message_type == "session_keepalive"
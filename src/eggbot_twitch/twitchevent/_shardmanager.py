@@ -0,0 +1,321 @@
+"""Spread EventSub subscriptions across a pool of websocket sessions."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import queue
+import threading
+from typing import TYPE_CHECKING
+
+from ._eventclient import get_session
+from ._messagequeue import MessageQueue
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from collections.abc import Iterator
+    from types import TracebackType
+    from typing import Self
+
+    from ._message import Message
+    from ._reconnectpolicy import ReconnectPolicy
+    from ._session import Session
+
+_EVENTSUB_URI = "wss://eventsub.wss.twitch.tv/ws"
+# Twitch allows 300 enabled subscriptions per websocket connection
+_DEFAULT_CAPACITY = 300
+# Twitch allows 3 websocket connections with enabled subscriptions per user token
+_DEFAULT_MAX_SESSIONS = 3
+
+logger = logging.getLogger("eventclient")
+
+
+class ShardPoolFullError(RuntimeError):
+    """Raised when a key needs a new session but the pool already has max_sessions."""
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class _Shard:
+    """Internal: A session and the subscription keys assigned to it."""
+
+    session: Session
+    keys: set[Hashable] = dataclasses.field(default_factory=set)
+    forwarder: threading.Thread = dataclasses.field(default_factory=threading.Thread)
+
+
+class ShardManager:
+    """
+    Pool of EventSub sessions, each carrying up to capacity subscriptions.
+
+    Subscriptions are identified by any hashable key chosen by the caller, such as
+    (subscription type, broadcaster id). assign() picks the least-loaded session for
+    a key, opening a new session when every session is full, up to max_sessions
+    sessions. When a session dies its
+    keys are assigned again and on_reassign is called for each, so the caller can
+    create the subscription against the new session. on_reassign is also called for
+    each key of a session that reconnected with a new session id, as its
+    subscriptions were lost.
+
+    Messages from every session are merged into one stream; iterate the manager to
+    consume it. Iteration ends once the manager is closed and the stream is drained.
+
+    Args:
+        uri: URI of the websocket server.
+        capacity: Maximum number of keys assigned to one session.
+        max_sessions: Maximum number of sessions in the pool. Twitch allows three
+            connections with enabled subscriptions per user token.
+        on_reassign: Called with each key, and the session it must be created on
+            again, after its session died or started over.
+        reconnect_policy: Backoff between connection attempts of each session.
+    """
+
+    def __init__(
+        self,
+        uri: str = _EVENTSUB_URI,
+        *,
+        capacity: int = _DEFAULT_CAPACITY,
+        max_sessions: int = _DEFAULT_MAX_SESSIONS,
+        on_reassign: Callable[[Hashable, Session], object] | None = None,
+        reconnect_policy: ReconnectPolicy | None = None,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1.")
+
+        self.uri = uri
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self.messages: MessageQueue[Message] = MessageQueue()
+        self._on_reassign = on_reassign
+        self._reconnect_policy = reconnect_policy
+        self._shards: list[_Shard] = []
+        self._assignments: dict[Hashable, _Shard] = {}
+        self._closed = False
+        self._opening = 0
+        self._lock = threading.Lock()
+        # Notified whenever a session being opened joins the pool or fails to
+        self._opened = threading.Condition(self._lock)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Message]:
+        """Yield each message from every session, until the manager is closed and drained."""
+        while True:
+            try:
+                yield self.messages.get()
+
+            except queue.ShutDown:
+                return
+
+    @property
+    def sessions(self) -> list[Session]:
+        """The live sessions of the pool."""
+        with self._lock:
+            return [shard.session for shard in self._shards]
+
+    @property
+    def loads(self) -> dict[str, int]:
+        """Number of keys assigned to each live session, by session id."""
+        with self._lock:
+            return {shard.session.session_id: len(shard.keys) for shard in self._shards}
+
+    def assign(self, key: Hashable) -> Session:
+        """
+        Return the session a subscription should be created on, assigning it if new.
+
+        New sessions are opened without holding the lock, so other calls are not
+        blocked while a welcome is awaited. Keys assigned at the same time may each
+        open a session, as long as the pool stays within max_sessions. Once it is
+        reached, calls wait for any session still being opened before giving up.
+
+        Raises:
+            RuntimeError: If the manager is closed.
+            ShardPoolFullError: If every session is full and the pool has max_sessions.
+            TimeoutError: If a new session is needed and its welcome times out.
+            ConnectionError: If a new session is needed and cannot be created.
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Cannot assign to a closed ShardManager.")
+
+                shard = self._assign(key)
+
+                if shard is not None:
+                    return shard.session
+
+                if len(self._shards) + self._opening >= self.max_sessions:
+                    if not self._opening:
+                        msg = f"All {self.max_sessions} sessions of the pool are full."
+                        raise ShardPoolFullError(msg)
+
+                    self._opened.wait()
+                    continue
+
+                self._opening += 1
+
+            self._open()
+
+    def release(self, key: Hashable) -> None:
+        """Free the capacity held by a key, after its subscription is deleted."""
+        with self._lock:
+            shard = self._assignments.pop(key, None)
+
+            if shard is not None:
+                shard.keys.discard(key)
+
+    def close(self) -> None:
+        """Close every session, then end the merged stream once it has been forwarded."""
+        with self._lock:
+            self._closed = True
+            shards = list(self._shards)
+
+        for shard in shards:
+            shard.session.close()
+            shard.forwarder.join()
+
+        self.messages.shutdown()
+
+    def _assign(self, key: Hashable) -> _Shard | None:
+        """
+        Internal: Assign a key to the least-loaded shard. Caller holds the lock.
+
+        Returns:
+            The shard of the key, or None if every shard is full.
+        """
+        shard = self._assignments.get(key)
+
+        if shard is None:
+            candidates = [each for each in self._shards if len(each.keys) < self.capacity]
+
+            if not candidates:
+                return None
+
+            shard = min(candidates, key=lambda each: len(each.keys))
+            shard.keys.add(key)
+            self._assignments[key] = shard
+
+        return shard
+
+    def _open(self) -> None:
+        """
+        Internal: Start a new session and add it to the pool.
+
+        Caller does not hold the lock, and has counted the session in _opening.
+
+        Raises:
+            RuntimeError: If the manager was closed while the session was starting.
+        """
+        try:
+            session = get_session(
+                self.uri,
+                reconnect_policy=self._reconnect_policy,
+                on_reconnect=self._on_reconnect,
+            )
+
+        except BaseException:
+            with self._lock:
+                self._opening -= 1
+                self._opened.notify_all()
+            raise
+
+        shard = _Shard(session)
+
+        with self._lock:
+            self._opening -= 1
+            self._opened.notify_all()
+            closed = self._closed
+
+            if not closed:
+                shard.forwarder = threading.Thread(target=self._forward, args=(shard,), daemon=True)
+                shard.forwarder.start()
+                self._shards.append(shard)
+                logger.info(
+                    "Opened session %s, %d sessions in pool", session.session_id, len(self._shards)
+                )
+
+        if closed:
+            session.close()
+            raise RuntimeError("Cannot assign to a closed ShardManager.")
+
+    def _forward(self, shard: _Shard) -> None:
+        """Internal: Forward a session's messages to the merged stream until it ends."""
+        for message in shard.session:
+            self.messages.put(message)
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._shards.remove(shard)
+            keys = list(shard.keys)
+
+            for key in keys:
+                del self._assignments[key]
+
+        logger.warning("Session %s died, reassigning its keys", shard.session.session_id)
+        self._reassign(keys)
+
+    def _reassign(self, keys: list[Hashable]) -> None:
+        """Internal: Assign keys moved off a dead session, and call on_reassign for each."""
+        for key in keys:
+            try:
+                session = self.assign(key)
+
+            except (TimeoutError, ConnectionError, ShardPoolFullError):
+                logger.exception("Failed to reassign %s", key)
+                continue
+
+            except RuntimeError:
+                return
+
+            self._notify_reassign(key, session)
+
+    def _on_reconnect(self, session: Session, previous_session_id: str) -> None:
+        """
+        Internal: Call on_reassign for the keys of a session that started over.
+
+        The keys stay on the same session, but their subscriptions were lost with the
+        previous session id. Called from the session thread, so on_reassign is run on
+        a thread of its own to keep the session reading.
+        """
+        with self._lock:
+            keys = [key for shard in self._shards if shard.session is session for key in shard.keys]
+
+        logger.warning(
+            "Session %s replaced by %s, reassigning its keys",
+            previous_session_id,
+            session.session_id,
+        )
+
+        if self._on_reassign is None or not keys:
+            return
+
+        def notify() -> None:
+            for key in keys:
+                self._notify_reassign(key, session)
+
+        threading.Thread(target=notify, daemon=True).start()
+
+    def _notify_reassign(self, key: Hashable, session: Session) -> None:
+        """Internal: Call on_reassign for one key, logging any error it raises."""
+        if self._on_reassign is None:
+            return
+
+        try:
+            self._on_reassign(key, session)
+
+        except Exception:
+            logger.exception("on_reassign callback failed for %s", key)
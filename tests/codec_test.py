@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from eggbot_twitch import _codec
+
+CODECS = [
+    (_codec.loads, _codec.dumps),
+    (_codec._stdlib_loads, _codec._stdlib_dumps),
+]
+
+
+@pytest.mark.parametrize(("loads", "dumps"), CODECS)
+def test_round_trip(loads, dumps) -> None:
+    contents = {"data": [{"id": "1", "login": "éggbot", "count": 2, "live": False}]}
+
+    encoded = dumps(contents)
+
+    assert isinstance(encoded, bytes)
+    assert loads(encoded) == contents
+    assert loads(encoded.decode()) == contents
+
+
+@pytest.mark.parametrize(("loads", "dumps"), CODECS)
+def test_invalid_document_raises_json_error(loads, dumps) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        loads(b"not json")
+
+
+def test_dumps_is_compact() -> None:
+    assert _codec.dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
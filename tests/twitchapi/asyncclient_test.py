@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from eggbot_twitch.twitchapi import AsyncAPIClient
+from eggbot_twitch.twitchapi import BadRequestError
+from eggbot_twitch.twitchapi import UnauthorizedError
+from eggbot_twitch.twitchapi import _asyncclient as asyncclient_module
+
+from .conftest import MockAuth
+from .conftest import MockRefreshableAuth
+
+
+def run_get(transport: httpx.MockTransport, max_retries: int = 3) -> dict[str, Any]:
+    """Run a single GET /users through a client using the given transport."""
+
+    async def get() -> dict[str, Any]:
+        async with AsyncAPIClient(transport=transport, max_retries=max_retries) as client:
+            return await client.get("/users", MockAuth(), params={"id": ["1", "2"]})
+
+    return asyncio.run(get())
+
+
+def test_get_success() -> None:
+    """Auth headers and query parameters are sent, the decoded body returned."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": []})
+
+    result = run_get(httpx.MockTransport(handler))
+
+    assert result == {"data": []}
+    assert str(requests[0].url) == "https://api.twitch.tv/helix/users?id=1&id=2"
+    assert requests[0].headers["Authorization"] == "Bearer mock_access_token"
+    assert requests[0].headers["Client-Id"] == "mock_client_id"
+
+
+def test_get_unauthorized_response() -> None:
+    """Unauthorized responses (401) should raise custom exception."""
+    mock_error = {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}
+    transport = httpx.MockTransport(lambda request: httpx.Response(401, json=mock_error))
+
+    with pytest.raises(UnauthorizedError) as err:
+        run_get(transport)
+
+    assert str(err.value) == "(401) Unauthorized: Invalid OAuth token"
+    assert err.value.url == "https://api.twitch.tv/helix/users?id=1&id=2"
+
+
+def test_get_bad_request() -> None:
+    """Bad requests (400) should raise a custom exception"""
+    mock_error = {"error": "Bad Request", "status": 400, "message": "Invalid request"}
+    transport = httpx.MockTransport(lambda request: httpx.Response(400, json=mock_error))
+
+    with pytest.raises(BadRequestError) as err:
+        run_get(transport)
+
+    assert str(err.value) == "(400) Bad Request: Invalid request"
+
+
+def test_get_error_with_empty_body() -> None:
+    transport = httpx.MockTransport(lambda request: httpx.Response(503))
+
+    with pytest.raises(BadRequestError) as err:
+        run_get(transport)
+
+    assert str(err.value) == "(503) Undefined: Undefined"
+
+
+def test_rate_limited_request_is_retried_after_reset() -> None:
+    """A 429 response is retried once the reset time passes."""
+    responses = [
+        httpx.Response(429, json={}, headers={"Ratelimit-Reset": str(time.time() + 0.1)}),
+        httpx.Response(200, json={"data": []}),
+    ]
+    transport = httpx.MockTransport(lambda request: responses.pop(0))
+
+    start = time.monotonic()
+    result = run_get(transport)
+
+    assert result == {"data": []}
+    assert time.monotonic() - start >= 0.05
+
+
+def test_rate_limited_request_exceeds_max_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Once retries are used up the 429 is raised, a missing reset uses the default wait."""
+    monkeypatch.setattr(asyncclient_module, "_DEFAULT_THROTTLE_SECONDS", 0.0)
+    mock_error = {"error": "Too Many Requests", "status": 429, "message": "Slow down"}
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429, content=json.dumps(mock_error))
+
+    with pytest.raises(BadRequestError) as err:
+        run_get(httpx.MockTransport(handler), max_retries=1)
+
+    assert err.value.status_code == 429
+    assert len(calls) == 2
+
+
+def test_unauthorized_request_replayed_after_refresh() -> None:
+    """A 401 should refresh a refreshable auth and replay the request with the new token."""
+    mock_error = {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}
+    tokens: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        tokens.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer mock_access_token":
+            return httpx.Response(401, json=mock_error)
+        return httpx.Response(200, json={"data": []})
+
+    async def get() -> dict[str, Any]:
+        async with AsyncAPIClient(transport=httpx.MockTransport(handler)) as client:
+            return await client.get("/users", MockRefreshableAuth())
+
+    result = asyncio.run(get())
+
+    assert result == {"data": []}
+    assert tokens == ["Bearer mock_access_token", "Bearer new_access_token"]
+
+
+def test_unauthorized_after_refresh_is_raised() -> None:
+    """The request should only be replayed once."""
+    mock_error = {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}
+    transport = httpx.MockTransport(lambda request: httpx.Response(401, json=mock_error))
+
+    async def get() -> dict[str, Any]:
+        async with AsyncAPIClient(transport=transport) as client:
+            return await client.get("/users", MockRefreshableAuth())
+
+    with pytest.raises(UnauthorizedError):
+        asyncio.run(get())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from eggbot_twitch.twitchapi import AsyncAPIClient
+from eggbot_twitch.twitchapi import UserCache
+from eggbot_twitch.twitchapi import async_get_users_bulk
+from eggbot_twitch.twitchapi import async_get_users_raw
+
+from .conftest import MockAuth
+
+
+def mock_users_handler(request: httpx.Request) -> httpx.Response:
+    """Respond with a minimal user object for every id and login requested."""
+    users = [
+        {"id": user_id, "login": f"login{user_id}"} for user_id in request.url.params.get_list("id")
+    ]
+    users += [
+        {"id": f"id{login}", "login": login} for login in request.url.params.get_list("login")
+    ]
+
+    assert len(users) <= 100
+
+    return httpx.Response(200, json={"data": users})
+
+
+def test_async_get_users_raw() -> None:
+    async def main() -> dict[str, Any]:
+        async with AsyncAPIClient(transport=httpx.MockTransport(mock_users_handler)) as client:
+            return await async_get_users_raw(
+                MockAuth(),
+                client=client,
+                user_ids=["1"],
+                user_logins=["foo"],
+            )
+
+    result = asyncio.run(main())
+
+    assert result == {"data": [{"id": "1", "login": "login1"}, {"id": "idfoo", "login": "foo"}]}
+
+
+def test_async_get_users_raw_request_exceeds_maximum_lookups() -> None:
+    """Assert a raised exception if the 100 user id and login limit is exceeded."""
+
+    async def main() -> None:
+        async with AsyncAPIClient() as client:
+            await async_get_users_raw(MockAuth(), client=client, user_ids=["1"] * 101)
+
+    with pytest.raises(ValueError, match="exceeded 100"):
+        asyncio.run(main())
+
+
+def test_async_get_users_bulk() -> None:
+    """Lookups are batched, cache misses requested, and the results merged."""
+    requests: list[httpx.Request] = []
+    cache = UserCache()
+    cache.add({"id": "cached", "login": "cached"})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return mock_users_handler(request)
+
+    user_ids = ["cached"] + [str(idx) for idx in range(150)]
+
+    async def main() -> dict[str, Any]:
+        async with AsyncAPIClient(transport=httpx.MockTransport(handler)) as client:
+            return await async_get_users_bulk(
+                MockAuth(),
+                client=client,
+                user_ids=user_ids,
+                user_logins=["foo"],
+                cache=cache,
+            )
+
+    result = asyncio.run(main())
+
+    assert len(requests) == 2
+    assert [user["id"] for user in result["data"]] == user_ids + ["idfoo"]
+    assert cache.get_by_login("foo") is not None
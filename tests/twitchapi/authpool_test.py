@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import time
+
+import pytest
+import responses
+from responses import matchers
+
+from eggbot_twitch.twitchapi import APIClient
+from eggbot_twitch.twitchapi import AuthPool
+from eggbot_twitch.twitchapi import NoTokensError
+from eggbot_twitch.twitchapi import RateLimiter
+from eggbot_twitch.twitchapi import UnauthorizedError
+from eggbot_twitch.twitchapi import delete_subscriptions_bulk
+from eggbot_twitch.twitchapi import get_users_raw
+
+from .conftest import MockAuth
+from .conftest import MockRefreshableAuth
+
+URL = "https://api.twitch.tv/helix/users"
+MOCK_UNAUTHORIZED = {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}
+
+
+@dataclasses.dataclass
+class MockExpiringAuth(MockAuth):
+    expires_at: int = 0
+
+
+def _add_users_response(token: str, *, status: int = 200, remaining: int | None = None) -> None:
+    headers = {"Ratelimit-Remaining": str(remaining)} if remaining is not None else {}
+    responses.add(
+        method="GET",
+        url=URL,
+        status=status,
+        body=json.dumps(MOCK_UNAUTHORIZED if status == 401 else {"data": []}),
+        headers=headers,
+        match=[matchers.header_matcher({"Authorization": f"Bearer {token}"})],
+    )
+
+
+def test_acquire_picks_token_with_most_remaining_budget() -> None:
+    first, second = MockAuth("first"), MockAuth("second")
+    pool = AuthPool([first, second])
+    pool.rate_limiter(first).update({"Ratelimit-Remaining": "10"})
+
+    auth, rate_limiter = pool.acquire()
+
+    assert auth is second
+    assert rate_limiter is pool.rate_limiter(second)
+
+
+def test_acquire_ties_go_to_first_added() -> None:
+    first, second = MockAuth("first"), MockAuth("second")
+    pool = AuthPool([first, second])
+
+    assert pool.acquire()[0] is first
+
+
+def test_acquire_retires_expired_tokens() -> None:
+    expired = MockExpiringAuth("expired", expires_at=int(time.time()) - 1)
+    valid = MockExpiringAuth("valid", expires_at=int(time.time()) + 3600)
+    pool = AuthPool([expired, valid])
+
+    assert pool.acquire()[0] is valid
+    assert pool.auths == [valid]
+
+
+def test_acquire_with_no_tokens() -> None:
+    with pytest.raises(NoTokensError) as err:
+        AuthPool().acquire()
+
+    assert isinstance(err.value, UnauthorizedError)
+    assert str(err.value) == "(401) Unauthorized: No tokens in rotation."
+
+
+def test_add_existing_token_is_ignored() -> None:
+    auth = MockAuth()
+    shared_limiter = RateLimiter()
+    pool = AuthPool()
+
+    pool.add(auth, shared_limiter)
+    pool.add(auth)
+
+    assert len(pool) == 1
+    assert pool.rate_limiter(auth) is shared_limiter
+
+
+def test_retire() -> None:
+    auth = MockAuth()
+    pool = AuthPool([auth])
+
+    pool.retire(auth)
+    pool.retire(auth)
+
+    assert len(pool) == 0
+    with pytest.raises(KeyError):
+        pool.rate_limiter(auth)
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_requests_spread_by_reported_budget() -> None:
+    """Each request should go to the token with the most budget left, as last reported."""
+    first, second = MockAuth("first"), MockAuth("second")
+    pool = AuthPool([first, second])
+    _add_users_response("first", remaining=5)
+    _add_users_response("second", remaining=700)
+    _add_users_response("second", remaining=699)
+    client_limiter = RateLimiter()
+    client = APIClient(rate_limiter=client_limiter)
+
+    for _ in range(3):
+        get_users_raw(pool, user_ids=["123"], client=client)
+
+    assert pool.rate_limiter(first).remaining == 5
+    assert client_limiter.remaining == client_limiter.limit
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_revoked_token_retired_and_request_replayed() -> None:
+    """A 401 on a pooled token should retire it and replay the request on another."""
+    revoked, valid = MockAuth("revoked"), MockAuth("valid")
+    pool = AuthPool([revoked, valid])
+    _add_users_response("revoked", status=401)
+    _add_users_response("valid")
+
+    result = APIClient().get("/users", pool)
+
+    assert result == {"data": []}
+    assert pool.auths == [valid]
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_unauthorized_raised_once_pool_is_empty() -> None:
+    pool = AuthPool([MockAuth("revoked")])
+    _add_users_response("revoked", status=401)
+
+    with pytest.raises(UnauthorizedError):
+        APIClient().get("/users", pool)
+
+    assert len(pool) == 0
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_each_pooled_token_refreshed_once() -> None:
+    """A refresh of one token should not stop the next token from being refreshed."""
+    first = MockRefreshableAuth("first", refreshed_token="first_new")
+    second = MockRefreshableAuth("second", refreshed_token="second_new")
+    pool = AuthPool([first, second])
+    _add_users_response("first", status=401)
+    _add_users_response("first_new", status=401)
+    _add_users_response("second", status=401)
+    _add_users_response("second_new")
+
+    result = APIClient().get("/users", pool)
+
+    assert result == {"data": []}
+    assert pool.auths == [second]
+
+
+def test_bulk_reports_empty_pool_per_item() -> None:
+    result = delete_subscriptions_bulk(AuthPool(), ["abc", "def"])
+
+    assert [item for item, _ in result.failed] == ["abc", "def"]
+    assert all(isinstance(exc, NoTokensError) for _, exc in result.failed)
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import gc
+import json
+import time
+from typing import Any
+
+import pytest
+import responses
+from responses import matchers
+
+from eggbot_twitch.twitchapi import APIClient
+from eggbot_twitch.twitchapi import BadRequestError
+from eggbot_twitch.twitchapi import RateLimiter
+from eggbot_twitch.twitchapi import UnauthorizedError
+from eggbot_twitch.twitchapi import get_default_client
+from eggbot_twitch.twitchapi import get_users_raw
+from eggbot_twitch.twitchauth import UserAuth
+
+from .conftest import MockAuth
+from .conftest import MockRefreshableAuth
+
+MOCK_UNAUTHORIZED = {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}
+
+
+def _add_users_response(token: str, status: int = 200) -> None:
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        status=status,
+        body=json.dumps(MOCK_UNAUTHORIZED if status == 401 else {"data": []}),
+        match=[matchers.header_matcher({"Authorization": f"Bearer {token}"})],
+    )
+
+
+def test_pool_size_applied_to_adapter() -> None:
+    """The connection pool of the session should be sized to the given pool_size."""
+    client = APIClient(pool_size=4)
+
+    adapter = client.session.get_adapter("https://api.twitch.tv/helix")
+
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 4  # type: ignore[attr-defined]
+
+
+def test_default_client_is_shared() -> None:
+    """The same client should be returned on every call so connections are reused."""
+    assert get_default_client() is get_default_client()
+
+
+def test_rate_limiter_kept_per_auth() -> None:
+    client = APIClient()
+    auth = MockAuth("first")
+    first = client.rate_limiter_for(auth)
+
+    assert client.rate_limiter_for(auth) is first
+    assert client.rate_limiter_for(MockAuth("first")) is not first
+    assert client.rate_limiter_for(MockAuth("second")) is not first
+
+
+def test_rate_limiter_kept_across_refresh() -> None:
+    """A refreshed auth should keep its bucket, along with any hold on it."""
+    client = APIClient()
+    auth = MockRefreshableAuth("first")
+    first = client.rate_limiter_for(auth)
+
+    auth.refresh()
+
+    assert client.rate_limiter_for(auth) is first
+
+
+def test_rate_limiter_dropped_with_auth() -> None:
+    client = APIClient()
+    auth = UserAuth(
+        access_token="first",
+        expires_in=0,
+        expires_at=0,
+        client_id="mock_client_id",
+        refresh_token="refresh",
+        scope=("scope",),
+        token_type="bearer",
+    )
+    client.rate_limiter_for(auth)
+
+    del auth
+    gc.collect()
+
+    assert not client._rate_limiters
+
+
+def test_rate_limiter_of_reused_id_not_dropped() -> None:
+    """A collected auth should not drop the limiter of a newer auth given its id."""
+    client = APIClient()
+    auth = MockAuth("first")
+    client.rate_limiter_for(auth)
+    older = client._rate_limiters[id(auth)]
+    newer = client._rate_limiters[id(auth)] = (lambda: None, RateLimiter())
+
+    del auth
+    gc.collect()
+
+    assert older[0]() is None
+    assert list(client._rate_limiters.values()) == [newer]
+
+
+def test_rate_limiter_kept_for_auth_without_weak_references() -> None:
+    class SlottedAuth:
+        __slots__ = ("access_token", "client_id", "headers")
+
+        def __init__(self) -> None:
+            self.access_token = "first"
+            self.client_id = "mock_client_id"
+            self.headers: dict[str, str] = {}
+
+    client = APIClient()
+    auth = SlottedAuth()
+    first = client.rate_limiter_for(auth)
+
+    assert client.rate_limiter_for(auth) is first
+    assert client.rate_limiter_for(SlottedAuth()) is not first
+
+
+def test_given_rate_limiter_paces_every_token() -> None:
+    shared_limiter = RateLimiter()
+    client = APIClient(rate_limiter=shared_limiter)
+
+    assert client.rate_limiter_for(MockAuth("first")) is shared_limiter
+    assert client.rate_limiter_for(MockAuth("second")) is shared_limiter
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_rate_limited_token_does_not_hold_others() -> None:
+    """A token out of budget should not delay the requests of another token."""
+    reset_headers = {"Ratelimit-Remaining": "0", "Ratelimit-Reset": str(time.time() + 60)}
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        body=json.dumps({"data": []}),
+        headers=reset_headers,
+        match=[matchers.header_matcher({"Authorization": "Bearer first"})],
+    )
+    _add_users_response("second")
+    client = APIClient()
+    first = MockAuth("first")
+    client.get("/users", first)
+
+    start = time.monotonic()
+    client.get("/users", MockAuth("second"))
+
+    assert time.monotonic() - start < 1.0
+    assert client.rate_limiter_for(first).remaining == 0
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_requests_sent_through_provided_client() -> None:
+    """A provided client should be used, including its base url."""
+    responses.add(
+        method="GET",
+        url="https://mock.api/helix/users?id=123",
+        body=json.dumps({"data": []}),
+    )
+
+    client = APIClient(base_url="https://mock.api/helix")
+
+    result = get_users_raw(MockAuth(), user_ids=["123"], client=client)
+
+    assert result == {"data": []}
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_keep_alive_disabled_closes_connection() -> None:
+    """Disabling keep-alive should ask the server to close the connection."""
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        body=json.dumps({"data": []}),
+        match=[matchers.header_matcher({"Connection": "close"})],
+    )
+
+    client = APIClient(keep_alive=False)
+
+    client.get("/users", MockAuth())
+
+
+def test_context_manager_closes_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Exiting the context manager should close the pooled connections."""
+    closed = []
+
+    with APIClient() as client:
+        monkeypatch.setattr(client.session, "close", lambda: closed.append(True))
+
+    assert closed == [True]
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_rate_limited_request_is_retried_after_reset() -> None:
+    """A 429 response is retried once the reset time passes."""
+    reset_headers = {"Ratelimit-Remaining": "0", "Ratelimit-Reset": str(time.time() + 0.1)}
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        status=429,
+        headers=reset_headers,
+    )
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        body=json.dumps({"data": []}),
+    )
+
+    result = APIClient().get("/users", MockAuth())
+
+    assert result == {"data": []}
+    assert len(responses.calls) == 2
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_rate_limited_request_exceeds_max_retries() -> None:
+    """Once retries are used up the 429 is raised."""
+    mock_error = {"error": "Too Many Requests", "status": 429, "message": "Slow down"}
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        status=429,
+        body=json.dumps(mock_error),
+        headers={"Ratelimit-Reset": str(time.time())},
+    )
+
+    with pytest.raises(BadRequestError) as err:
+        APIClient(max_retries=1).get("/users", MockAuth())
+
+    assert err.value.status_code == 429
+    assert len(responses.calls) == 2
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_post_sends_json_body() -> None:
+    """A POST should send its body encoded as JSON with a matching content type."""
+    responses.add(
+        method="POST",
+        url="https://api.twitch.tv/helix/eventsub/subscriptions",
+        status=202,
+        body=json.dumps({"data": [{"id": "abc"}]}),
+        match=[
+            matchers.json_params_matcher({"type": "channel.follow"}),
+            matchers.header_matcher({"Content-Type": "application/json"}),
+        ],
+    )
+
+    result = APIClient().post(
+        "/eventsub/subscriptions", MockAuth(), json={"type": "channel.follow"}
+    )
+
+    assert result == {"data": [{"id": "abc"}]}
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_delete_with_empty_body_returns_empty_dict() -> None:
+    """A response without a body, such as a 204, should decode to an empty dict."""
+    responses.add(
+        method="DELETE",
+        url="https://api.twitch.tv/helix/eventsub/subscriptions?id=abc",
+        status=204,
+    )
+
+    result = APIClient().delete("/eventsub/subscriptions", MockAuth(), params={"id": "abc"})
+
+    assert result == {}
+
+
+@responses.activate
+def test_error_with_html_body() -> None:
+    """A gateway error page should become the message of the exception."""
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        status=502,
+        body="<html>Bad Gateway</html>",
+    )
+
+    with pytest.raises(BadRequestError) as err:
+        APIClient().get("/users", MockAuth())
+
+    assert str(err.value) == "(502) Undefined: <html>Bad Gateway</html>"
+
+
+@responses.activate
+def test_error_with_non_object_json_body() -> None:
+    responses.add(method="GET", url="https://api.twitch.tv/helix/users", status=500, body="[]")
+
+    with pytest.raises(BadRequestError) as err:
+        APIClient().get("/users", MockAuth())
+
+    assert str(err.value) == "(500) Undefined: []"
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_unauthorized_request_replayed_after_refresh() -> None:
+    """A 401 should refresh a refreshable auth and replay the request with the new token."""
+    _add_users_response("mock_access_token", status=401)
+    _add_users_response("new_access_token")
+    auth = MockRefreshableAuth()
+
+    result = APIClient().get("/users", auth)
+
+    assert result == {"data": []}
+    assert auth.refresh_count == 1
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_unauthorized_request_replayed_without_refresh_if_token_changed() -> None:
+    """If another request already swapped the token in, it should be reused, not refreshed."""
+    auth = MockRefreshableAuth()
+
+    def swap_token(request: Any) -> tuple[int, dict[str, str], str]:
+        auth.access_token = "new_access_token"
+        return 401, {}, json.dumps(MOCK_UNAUTHORIZED)
+
+    responses.add_callback(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        callback=swap_token,
+        match=[matchers.header_matcher({"Authorization": "Bearer mock_access_token"})],
+    )
+    _add_users_response("new_access_token")
+
+    result = APIClient().get("/users", auth)
+
+    assert result == {"data": []}
+    assert auth.refresh_count == 0
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_unauthorized_after_refresh_is_raised() -> None:
+    """The request should only be replayed once."""
+    _add_users_response("mock_access_token", status=401)
+    _add_users_response("new_access_token", status=401)
+
+    with pytest.raises(UnauthorizedError):
+        APIClient().get("/users", MockRefreshableAuth())
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_unauthorized_raised_when_refresh_fails() -> None:
+    _add_users_response("mock_access_token", status=401)
+    auth = MockRefreshableAuth(refreshed_token=None)
+
+    with pytest.raises(UnauthorizedError):
+        APIClient().get("/users", auth)
+
+    assert auth.refresh_count == 1
+    assert len(responses.calls) == 1
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import dataclasses
+
+
+@dataclasses.dataclass
+class MockAuth:
+    access_token: str = "mock_access_token"
+    client_id: str = "mock_client_id"
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.access_token}",
+            "Client-Id": self.client_id,
+        }
+
+
+@dataclasses.dataclass
+class MockRefreshableAuth(MockAuth):
+    refreshed_token: str | None = "new_access_token"
+    refresh_count: int = 0
+
+    def refresh(self) -> bool:
+        self.refresh_count += 1
+
+        if self.refreshed_token is None:
+            return False
+
+        self.access_token = self.refreshed_token
+        return True
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+import requests
+import responses
+from responses import matchers
+
+from eggbot_twitch.twitchapi import BadRequestError
+from eggbot_twitch.twitchapi import SubscriptionRequest
+from eggbot_twitch.twitchapi import _eventsub as eventsub_module
+from eggbot_twitch.twitchapi import create_subscription
+from eggbot_twitch.twitchapi import create_subscriptions_bulk
+from eggbot_twitch.twitchapi import delete_subscription
+from eggbot_twitch.twitchapi import delete_subscriptions_bulk
+from eggbot_twitch.twitchapi import get_subscriptions
+from eggbot_twitch.twitchapi import get_subscriptions_raw
+
+from .conftest import MockAuth
+
+URL = "https://api.twitch.tv/helix/eventsub/subscriptions"
+
+FOLLOW = SubscriptionRequest(
+    subscription_type="channel.follow",
+    version="2",
+    condition={"broadcaster_user_id": "123", "moderator_user_id": "123"},
+)
+RAID = SubscriptionRequest(
+    subscription_type="channel.raid",
+    version="1",
+    condition={"to_broadcaster_user_id": "123"},
+)
+
+
+def _created(subscription: SubscriptionRequest, subscription_id: str) -> dict[str, object]:
+    return {
+        "data": [
+            {
+                "id": subscription_id,
+                "status": "enabled",
+                "type": subscription.subscription_type,
+                "version": subscription.version,
+                "condition": subscription.condition,
+                "transport": {"method": "websocket", "session_id": "mock_session"},
+                "cost": 0,
+            }
+        ],
+        "total": 1,
+        "total_cost": 0,
+        "max_total_cost": 10,
+    }
+
+
+def _body_matcher(subscription: SubscriptionRequest) -> object:
+    return matchers.json_params_matcher(
+        {
+            "type": subscription.subscription_type,
+            "version": subscription.version,
+            "condition": subscription.condition,
+            "transport": {"method": "websocket", "session_id": "mock_session"},
+        }
+    )
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_create_subscription_sends_websocket_transport() -> None:
+    """The subscription should be created on the given websocket session."""
+    responses.add(
+        method="POST",
+        url=URL,
+        status=202,
+        body=json.dumps(_created(FOLLOW, "abc")),
+        match=[_body_matcher(FOLLOW)],
+    )
+
+    result = create_subscription(MockAuth(), FOLLOW, session_id="mock_session")
+
+    assert result["data"][0]["id"] == "abc"
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_subscriptions_raw_sends_filters() -> None:
+    """Given filters and the page cursor should be sent as query parameters."""
+    responses.add(
+        method="GET",
+        url=f"{URL}?status=enabled&after=cursor",
+        body=json.dumps({"data": [], "pagination": {}}),
+    )
+
+    result = get_subscriptions_raw(MockAuth(), status="enabled", after="cursor")
+
+    assert result == {"data": [], "pagination": {}}
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_subscriptions_raw_first_page() -> None:
+    """Without a cursor the first page should be requested."""
+    responses.add(method="GET", url=f"{URL}?user_id=123", body=json.dumps({"data": []}))
+
+    result = get_subscriptions_raw(MockAuth(), user_id="123")
+
+    assert result == {"data": []}
+
+
+def test_get_subscriptions_raw_rejects_multiple_filters() -> None:
+    """Twitch accepts only one filter per request."""
+    with pytest.raises(ValueError):
+        get_subscriptions_raw(MockAuth(), status="enabled", user_id="123")
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_subscriptions_follows_pagination() -> None:
+    """Every page should be requested in turn until no cursor is returned."""
+    responses.add(
+        method="GET",
+        url=f"{URL}?type=channel.follow",
+        body=json.dumps({"data": [{"id": "a"}, {"id": "b"}], "pagination": {"cursor": "next"}}),
+    )
+    responses.add(
+        method="GET",
+        url=f"{URL}?type=channel.follow&after=next",
+        body=json.dumps({"data": [{"id": "c"}], "pagination": {}}),
+    )
+
+    subscriptions = get_subscriptions(MockAuth(), subscription_type="channel.follow")
+
+    assert [subscription["id"] for subscription in subscriptions] == ["a", "b", "c"]
+    assert subscriptions.cursor is None
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_delete_subscription() -> None:
+    """The subscription id should be sent as a query parameter."""
+    responses.add(method="DELETE", url=f"{URL}?id=abc", status=204)
+
+    delete_subscription(MockAuth(), "abc")
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_create_subscriptions_bulk_collects_each_outcome() -> None:
+    """A failed subscription should be reported without stopping the others."""
+    mock_error = {"error": "Conflict", "status": 409, "message": "subscription already exists"}
+    responses.add(
+        method="POST",
+        url=URL,
+        status=202,
+        body=json.dumps(_created(FOLLOW, "abc")),
+        match=[_body_matcher(FOLLOW)],
+    )
+    responses.add(
+        method="POST",
+        url=URL,
+        status=409,
+        body=json.dumps(mock_error),
+        match=[_body_matcher(RAID)],
+    )
+
+    result = create_subscriptions_bulk(MockAuth(), [FOLLOW, RAID], session_id="mock_session")
+
+    assert not result.ok
+    assert [(item, body["data"][0]["id"]) for item, body in result.succeeded] == [(FOLLOW, "abc")]
+    assert len(result.failed) == 1
+    assert result.failed[0][0] == RAID
+    assert isinstance(result.failed[0][1], BadRequestError)
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_delete_subscriptions_bulk_collects_connection_errors() -> None:
+    """Connection failures should be reported in the result rather than raised."""
+    responses.add(method="DELETE", url=f"{URL}?id=abc", status=204)
+    responses.add(method="DELETE", url=f"{URL}?id=def", body=requests.ConnectionError("refused"))
+
+    result = delete_subscriptions_bulk(MockAuth(), ["abc", "def"])
+
+    assert result.succeeded == [("abc", {})]
+    assert result.failed[0][0] == "def"
+    assert isinstance(result.failed[0][1], requests.ConnectionError)
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_bulk_collects_errors_without_json_body() -> None:
+    """A failure with an empty body should be reported like any other."""
+    responses.add(method="DELETE", url=f"{URL}?id=abc", status=503)
+
+    result = delete_subscriptions_bulk(MockAuth(), ["abc"])
+
+    assert result.failed[0][0] == "abc"
+    assert str(result.failed[0][1]) == "(503) Undefined: Undefined"
+
+
+def test_bulk_collects_any_exception(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An unexpected exception should be reported in the result rather than raised."""
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("No tokens in rotation.")
+
+    monkeypatch.setattr(eventsub_module, "delete_subscription", fail)
+
+    result = delete_subscriptions_bulk(MockAuth(), ["abc"])
+
+    assert isinstance(result.failed[0][1], RuntimeError)
+
+
+def test_bulk_with_no_items_sends_nothing() -> None:
+    """An empty batch should succeed without starting a thread pool."""
+    result = delete_subscriptions_bulk(MockAuth(), [])
+
+    assert result.ok
+    assert result.succeeded == []
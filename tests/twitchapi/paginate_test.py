@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any
+
+import pytest
+import responses
+
+from eggbot_twitch.twitchapi import APIClient
+from eggbot_twitch.twitchapi import BadRequestError
+from eggbot_twitch.twitchapi import Paginator
+
+from .conftest import MockAuth
+
+URL = "https://api.twitch.tv/helix/channels/followers"
+
+
+# Three pages of two items each, keyed by the cursor that requests them
+PAGES: dict[str | None, dict[str, Any]] = {
+    None: {"data": [{"id": "1"}, {"id": "2"}], "pagination": {"cursor": "b"}},
+    "b": {"data": [{"id": "3"}, {"id": "4"}], "pagination": {"cursor": "c"}},
+    "c": {"data": [{"id": "5"}, {"id": "6"}], "pagination": {}},
+}
+
+
+class MockFetch:
+    def __init__(self) -> None:
+        self.requested: list[str | None] = []
+
+    def __call__(self, cursor: str | None) -> dict[str, Any]:
+        self.requested.append(cursor)
+        return PAGES[cursor]
+
+
+def _ids(items: Any) -> list[str]:
+    return [item["id"] for item in items]
+
+
+def test_yields_every_item_of_every_page() -> None:
+    """Items of each page should be yielded in order until no cursor is returned."""
+    fetch = MockFetch()
+
+    paginator = Paginator(fetch)
+
+    assert _ids(paginator) == ["1", "2", "3", "4", "5", "6"]
+    assert fetch.requested == [None, "b", "c"]
+    assert paginator.cursor is None
+    assert paginator.pages_read == 3
+
+
+def test_max_pages_stops_early_with_resumable_cursor() -> None:
+    """Stopping at max_pages should leave the cursor of the next unread page."""
+    fetch = MockFetch()
+
+    paginator = Paginator(fetch, max_pages=2)
+
+    assert _ids(paginator) == ["1", "2", "3", "4"]
+    assert fetch.requested == [None, "b"]
+    assert paginator.cursor == "c"
+
+
+def test_resume_from_saved_cursor() -> None:
+    """A new Paginator given a saved cursor should continue where the last one stopped."""
+    first = Paginator(MockFetch(), max_pages=1)
+    list(first)
+
+    resumed = Paginator(MockFetch(), after=first.cursor)
+
+    assert _ids(resumed) == ["3", "4", "5", "6"]
+
+
+def test_cursor_only_advances_past_finished_pages() -> None:
+    """Stopping inside a page should resume from that page, never skipping an item."""
+    paginator = Paginator(MockFetch())
+    items = iter(paginator)
+
+    assert _ids([next(items), next(items)]) == ["1", "2"]
+    assert paginator.cursor is None
+
+    assert _ids([next(items)]) == ["3"]
+    assert paginator.cursor == "b"
+
+
+def test_next_page_prefetched_while_current_page_is_handled() -> None:
+    """The next page should be requested before the caller finishes the current one."""
+    requested = threading.Event()
+
+    def fetch(cursor: str | None) -> dict[str, Any]:
+        if cursor == "b":
+            requested.set()
+        return PAGES[cursor]
+
+    items = iter(Paginator(fetch, max_pages=2))
+    next(items)
+
+    assert requested.wait(timeout=1.0)
+
+
+def test_prefetch_disabled_waits_for_current_page() -> None:
+    """Without prefetch the next page should only be requested once it is reached."""
+    fetch = MockFetch()
+    items = iter(Paginator(fetch, prefetch=False))
+
+    next(items)
+    next(items)
+
+    assert fetch.requested == [None]
+    assert _ids(items) == ["3", "4", "5", "6"]
+
+
+def test_pages_yields_page_data() -> None:
+    """pages() should yield the data of each page as a list."""
+    pages = list(Paginator(MockFetch()).pages())
+
+    assert [_ids(page) for page in pages] == [["1", "2"], ["3", "4"], ["5", "6"]]
+
+
+def test_invalid_max_pages() -> None:
+    with pytest.raises(ValueError):
+        Paginator(MockFetch(), max_pages=0)
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_client_paginate_sends_cursor_and_params() -> None:
+    """Every page should carry the given params, and the cursor as 'after'."""
+    responses.add(
+        method="GET",
+        url=f"{URL}?broadcaster_id=123&first=100",
+        body=json.dumps(PAGES[None]),
+    )
+    responses.add(
+        method="GET",
+        url=f"{URL}?broadcaster_id=123&first=100&after=b",
+        body=json.dumps(PAGES["c"]),
+    )
+
+    paginator = APIClient().paginate(
+        "/channels/followers",
+        MockAuth(),
+        params={"broadcaster_id": "123", "first": 100},
+    )
+
+    assert _ids(paginator) == ["1", "2", "5", "6"]
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_client_paginate_error_keeps_cursor() -> None:
+    """A failed page should raise and leave the cursor at that page for a retry."""
+    mock_error = {"error": "Bad Request", "status": 400, "message": "Bad cursor"}
+    responses.add(method="GET", url=URL, body=json.dumps(PAGES[None]))
+    responses.add(method="GET", url=f"{URL}?after=b", status=400, body=json.dumps(mock_error))
+
+    paginator = APIClient().paginate("/channels/followers", MockAuth())
+
+    with pytest.raises(BadRequestError):
+        list(paginator)
+
+    assert paginator.cursor == "b"
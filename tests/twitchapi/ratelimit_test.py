@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from eggbot_twitch.twitchapi import Priority
+from eggbot_twitch.twitchapi import RateLimiter
+from eggbot_twitch.twitchapi import _ratelimit as ratelimit_module
+
+
+def test_acquire_spends_from_bucket() -> None:
+    limiter = RateLimiter(limit=5)
+
+    limiter.acquire()
+    limiter.acquire()
+
+    assert limiter.limit == 5
+    assert limiter.remaining == 3
+
+
+def test_update_from_headers() -> None:
+    """The bucket is corrected by the Ratelimit-* headers of a response."""
+    limiter = RateLimiter(limit=5)
+    headers = {
+        "Ratelimit-Limit": "800",
+        "Ratelimit-Remaining": "2",
+        "Ratelimit-Reset": str(int(time.time()) + 60),
+    }
+
+    limiter.update(headers)
+
+    assert limiter.limit == 800
+    assert limiter.remaining == 2
+
+
+def test_update_ignores_missing_and_invalid_headers() -> None:
+    limiter = RateLimiter(limit=5)
+
+    limiter.update({"Ratelimit-Limit": "invalid"})
+
+    assert limiter.limit == 5
+    assert limiter.remaining == 5
+
+
+def test_acquire_waits_for_refill() -> None:
+    """An empty bucket blocks until a point is earned back."""
+    limiter = RateLimiter(limit=10, window_seconds=1.0)
+    for _ in range(10):
+        limiter.acquire()
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.05
+
+
+def test_bucket_refilled_at_reset() -> None:
+    """Passing the reported reset time fills the bucket."""
+    limiter = RateLimiter(limit=10, window_seconds=60.0)
+    limiter.update({"Ratelimit-Remaining": "0", "Ratelimit-Reset": str(time.time() + 0.1)})
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start < 1.0
+    assert limiter.remaining == 9
+
+
+def test_throttle_holds_requests_until_reset() -> None:
+    """A 429 blocks all requests until the reset, even with points in the bucket."""
+    limiter = RateLimiter(limit=100, window_seconds=0.01)
+    limiter.throttle({"Ratelimit-Reset": str(time.time() + 0.1)})
+
+    assert limiter.remaining == 0
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.05
+
+
+def test_throttle_without_reset_header(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ratelimit_module, "_DEFAULT_THROTTLE_SECONDS", 0.1)
+    limiter = RateLimiter(limit=100)
+    limiter.throttle({})
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.05
+
+
+def test_interactive_released_before_background() -> None:
+    """Queued interactive requests go ahead of background requests queued earlier."""
+    limiter = RateLimiter(limit=1, window_seconds=0.2)
+    limiter.acquire()
+    order: list[str] = []
+
+    def acquire(priority: Priority) -> None:
+        limiter.acquire(priority)
+        order.append(priority.name)
+
+    background = threading.Thread(target=acquire, args=(Priority.BACKGROUND,))
+    interactive = threading.Thread(target=acquire, args=(Priority.INTERACTIVE,))
+
+    background.start()
+    time.sleep(0.05)
+    interactive.start()
+    background.join()
+    interactive.join()
+
+    assert order == ["INTERACTIVE", "BACKGROUND"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from eggbot_twitch.twitchapi import CacheStats
+from eggbot_twitch.twitchapi import UserCache
+
+
+@pytest.fixture
+def static_time(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Freeze time.monotonic to the first value in the returned list."""
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_by_id_and_login() -> None:
+    """Users are indexed by both id and login, logins are case insensitive."""
+    cache = UserCache()
+    user = {"id": "123", "login": "foo"}
+
+    cache.add(user)
+
+    assert cache.get_by_id("123") is user
+    assert cache.get_by_login("FOO") is user
+    assert cache.stats == CacheStats(hits=2, misses=0, evictions=0, expirations=0)
+
+
+def test_get_missing_user() -> None:
+    """Missing users return None and count as a miss."""
+    cache = UserCache()
+
+    assert cache.get_by_id("123") is None
+    assert cache.get_by_login("foo") is None
+    assert cache.stats == CacheStats(hits=0, misses=2, evictions=0, expirations=0)
+
+
+def test_expired_users_are_removed(static_time: list[float]) -> None:
+    """Users are no longer served after their ttl passes."""
+    cache = UserCache(ttl_seconds=10.0)
+    cache.add({"id": "123", "login": "foo"})
+
+    static_time[0] += 10.0
+
+    assert cache.get_by_login("foo") is None
+    assert cache.get_by_id("123") is None
+    assert len(cache) == 0
+    assert cache.stats == CacheStats(hits=0, misses=2, evictions=0, expirations=1)
+
+
+def test_least_recently_used_is_evicted() -> None:
+    """The least recently used user is evicted once max_size is exceeded."""
+    cache = UserCache(max_size=2)
+    cache.add({"id": "1", "login": "one"})
+    cache.add({"id": "2", "login": "two"})
+    cache.get_by_id("1")
+
+    cache.add({"id": "3", "login": "three"})
+
+    assert len(cache) == 2
+    assert cache.get_by_id("2") is None
+    assert cache.get_by_login("two") is None
+    assert cache.get_by_id("1") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_replacing_user_updates_login_index() -> None:
+    """A changed login should no longer resolve to the user."""
+    cache = UserCache()
+    cache.add({"id": "123", "login": "foo"})
+
+    cache.add({"id": "123", "login": "bar"})
+
+    assert len(cache) == 1
+    assert cache.get_by_login("foo") is None
+    assert cache.get_by_login("bar") == {"id": "123", "login": "bar"}
+
+
+def test_reused_login_is_kept_when_previous_owner_removed() -> None:
+    """Removing a user must not remove a login now owned by another user."""
+    cache = UserCache(max_size=2)
+    cache.add({"id": "1", "login": "foo"})
+    cache.add({"id": "2", "login": "foo"})
+
+    cache.add({"id": "3", "login": "bar"})
+
+    assert cache.get_by_id("1") is None
+    assert cache.get_by_login("foo") == {"id": "2", "login": "foo"}
+
+
+def test_clear() -> None:
+    cache = UserCache()
+    cache.add({"id": "123", "login": "foo"})
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get_by_login("foo") is None
@@ -1,28 +1,20 @@
 from __future__ import annotations
 
-import dataclasses
 import json
+import urllib.parse
 
 import pytest
 import responses
+from requests import PreparedRequest
 from responses import matchers
 
 from eggbot_twitch.twitchapi import BadRequestError
 from eggbot_twitch.twitchapi import UnauthorizedError
+from eggbot_twitch.twitchapi import UserCache
+from eggbot_twitch.twitchapi import get_users_bulk
 from eggbot_twitch.twitchapi import get_users_raw
 
-
-@dataclasses.dataclass
-class MockAuth:
-    access_token: str = "mock_access_token"
-    client_id: str = "mock_client_id"
-
-    @property
-    def headers(self) -> dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Client-Id": self.client_id,
-        }
+from .conftest import MockAuth
 
 
 @responses.activate(assert_all_requests_are_fired=True)
@@ -173,3 +165,122 @@ def test_get_users_raw_bad_request() -> None:
     assert err.value.url == "https://api.twitch.tv/helix/users"
     assert err.value.error == "Bad Request"
     assert err.value.message == "Invalid request"
+
+
+def mock_users_callback(request: PreparedRequest) -> tuple[int, dict[str, str], str]:
+    """Respond with a minimal user object for every id and login requested."""
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url or "").query)
+    users = [{"id": user_id, "login": f"login{user_id}"} for user_id in query.get("id", [])]
+    users += [{"id": f"id{login}", "login": login} for login in query.get("login", [])]
+
+    assert len(users) <= 100
+
+    return 200, {}, json.dumps({"data": users})
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_users_bulk_splits_into_batches() -> None:
+    """Lookups over the 100 limit are split into batches and the results merged."""
+    user_ids = [str(idx) for idx in range(150)]
+    user_logins = [f"user{idx}" for idx in range(60)]
+
+    responses.add_callback(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        callback=mock_users_callback,
+    )
+
+    result = get_users_bulk(MockAuth(), user_ids=user_ids, user_logins=user_logins)
+
+    assert len(responses.calls) == 3
+    assert [user["id"] for user in result["data"][:150]] == user_ids
+    assert [user["login"] for user in result["data"][150:]] == user_logins
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_users_bulk_removes_duplicates() -> None:
+    """Duplicate lookups are only requested once."""
+    responses.add_callback(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        callback=mock_users_callback,
+    )
+
+    result = get_users_bulk(MockAuth(), user_ids=["1", "1", "2"], user_logins=["foo", "foo"])
+
+    assert len(responses.calls) == 1
+    assert len(result["data"]) == 3
+
+
+@responses.activate()
+def test_get_users_bulk_nothing_to_lookup() -> None:
+    """No request is made when there is nothing to lookup."""
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        body=AssertionError("This should not be called."),
+    )
+
+    result = get_users_bulk(MockAuth())
+
+    assert result == {"data": []}
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_users_bulk_raises_failed_batch() -> None:
+    """A failed batch raises the same exception as a single lookup."""
+    mock_error = {"error": "Bad Request", "status": 400, "message": "Invalid request"}
+
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        body=json.dumps(mock_error),
+        status=400,
+    )
+
+    with pytest.raises(BadRequestError):
+        get_users_bulk(MockAuth(), user_ids=["123"])
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_users_bulk_only_requests_cache_misses() -> None:
+    """Cached users are returned without being requested, fetched users are cached."""
+    cache = UserCache()
+    cache.add({"id": "1", "login": "login1"})
+    cache.add({"id": "idfoo", "login": "foo"})
+
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users?id=2&login=bar",
+        body=json.dumps(
+            {"data": [{"id": "2", "login": "login2"}, {"id": "idbar", "login": "bar"}]}
+        ),
+    )
+
+    result = get_users_bulk(
+        MockAuth(),
+        user_ids=["1", "2"],
+        user_logins=["foo", "bar"],
+        cache=cache,
+    )
+
+    assert [user["id"] for user in result["data"]] == ["1", "idfoo", "2", "idbar"]
+    assert cache.get_by_id("2") is not None
+    assert cache.get_by_login("bar") is not None
+
+
+@responses.activate()
+def test_get_users_bulk_all_cached() -> None:
+    """No request is made when every lookup is cached."""
+    cache = UserCache()
+    cache.add({"id": "1", "login": "foo"})
+
+    responses.add(
+        method="GET",
+        url="https://api.twitch.tv/helix/users",
+        body=AssertionError("This should not be called."),
+    )
+
+    result = get_users_bulk(MockAuth(), user_ids=["1"], user_logins=["foo"], cache=cache)
+
+    assert result == {"data": [{"id": "1", "login": "foo"}, {"id": "1", "login": "foo"}]}
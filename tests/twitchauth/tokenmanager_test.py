@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from eggbot_twitch.twitchauth import Auth
+from eggbot_twitch.twitchauth import ClientAuth
+from eggbot_twitch.twitchauth import TokenManager
+from eggbot_twitch.twitchauth import UserAuth
+from eggbot_twitch.twitchauth import _tokenmanager
+
+
+def _user_auth(access_token: str, *, expires_in: int = 3600, age: float = 0.0) -> UserAuth:
+    return UserAuth(
+        access_token=access_token,
+        expires_in=expires_in,
+        expires_at=int(time.time() - age + expires_in),
+        refresh_token=f"{access_token}_refresh",
+        scope=("user:email:read",),
+        token_type="bearer",
+        client_id="mock_client_id",
+    )
+
+
+class MockGetAuthorization:
+    """Stand-in for get_authorization returning a numbered token per call."""
+
+    def __init__(self, *, fail: bool = False, delay: float = 0.0) -> None:
+        self.calls: list[Auth | None] = []
+        self.fail = fail
+        self.delay = delay
+        self.called = threading.Event()
+
+    def __call__(self, client_id: str, client_secret: str, user_auth: Any) -> Auth | None:
+        self.calls.append(user_auth)
+        self.called.set()
+        time.sleep(self.delay)
+        return None if self.fail else _user_auth(f"token_{len(self.calls)}")
+
+
+@pytest.fixture
+def mock_get_authorization(monkeypatch: pytest.MonkeyPatch) -> MockGetAuthorization:
+    mock = MockGetAuthorization()
+    monkeypatch.setattr(_tokenmanager, "get_authorization", mock)
+    return mock
+
+
+def test_reads_from_current_token() -> None:
+    """The manager should satisfy the API clients' AuthType through its current token."""
+    auth = _user_auth("token_0")
+
+    manager = TokenManager("mock_client_id", "mock_secret", auth)
+
+    assert manager.auth is auth
+    assert manager.access_token == "token_0"
+    assert manager.client_id == "mock_client_id"
+    assert manager.headers == auth.headers
+
+
+def test_refresh_swaps_in_new_token(mock_get_authorization: MockGetAuthorization) -> None:
+    """A successful refresh should replace the token and report it."""
+    auth = _user_auth("token_0")
+    refreshed: list[Auth] = []
+    manager = TokenManager("mock_client_id", "mock_secret", auth, on_refresh=refreshed.append)
+
+    assert manager.refresh()
+
+    assert mock_get_authorization.calls == [auth]
+    assert manager.access_token == "token_1"
+    assert refreshed == [manager.auth]
+
+
+def test_failed_refresh_keeps_current_token(
+    mock_get_authorization: MockGetAuthorization,
+) -> None:
+    mock_get_authorization.fail = True
+    manager = TokenManager("mock_client_id", "mock_secret", _user_auth("token_0"))
+
+    assert not manager.refresh()
+
+    assert manager.access_token == "token_0"
+
+
+def test_simultaneous_refreshes_collapse(mock_get_authorization: MockGetAuthorization) -> None:
+    """Callers refreshing at the same time should share a single token request."""
+    mock_get_authorization.delay = 0.2
+    manager = TokenManager("mock_client_id", "mock_secret", _user_auth("token_0"))
+    results: list[bool] = []
+
+    threads = [threading.Thread(target=lambda: results.append(manager.refresh())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 5
+    assert len(mock_get_authorization.calls) == 1
+    assert manager.access_token == "token_1"
+
+
+def test_refresh_error_raised_to_every_waiting_caller(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An exception from the shared request should reach each caller waiting on it."""
+    entered = threading.Event()
+    release = threading.Event()
+
+    def failing(*args: Any) -> Auth | None:
+        entered.set()
+        release.wait()
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(_tokenmanager, "get_authorization", failing)
+    manager = TokenManager("mock_client_id", "mock_secret", _user_auth("token_0"))
+    errors: list[BaseException] = []
+
+    def refresh() -> None:
+        try:
+            manager.refresh()
+        except ConnectionError as exc:
+            errors.append(exc)
+
+    owner = threading.Thread(target=refresh)
+    owner.start()
+    entered.wait()
+    waiter = threading.Thread(target=refresh)
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join()
+    waiter.join()
+
+    assert len(errors) == 2
+
+
+def test_refresh_at_uses_fraction_of_lifetime() -> None:
+    auth = _user_auth("token_0", expires_in=1000)
+
+    manager = TokenManager("mock_client_id", "mock_secret", auth, refresh_fraction=0.75)
+
+    assert manager.refresh_at == auth.expires_at - 250
+
+
+@pytest.mark.parametrize("fraction", [0.0, -0.5, 1.5])
+def test_invalid_refresh_fraction(fraction: float) -> None:
+    with pytest.raises(ValueError):
+        TokenManager(
+            "mock_client_id", "mock_secret", _user_auth("token_0"), refresh_fraction=fraction
+        )
+
+
+def test_background_refresh_when_due(mock_get_authorization: MockGetAuthorization) -> None:
+    """A token past its refresh point should be refreshed by the background thread."""
+    auth = _user_auth("token_0", expires_in=100, age=90)
+
+    with TokenManager("mock_client_id", "mock_secret", auth) as manager:
+        assert mock_get_authorization.called.wait(timeout=1.0)
+
+    assert manager.access_token == "token_1"
+    assert len(mock_get_authorization.calls) == 1
+
+
+def test_background_refresh_waits_until_due(
+    mock_get_authorization: MockGetAuthorization,
+) -> None:
+    """A fresh token should not be refreshed before its refresh point."""
+    with TokenManager("mock_client_id", "mock_secret", _user_auth("token_0")):
+        time.sleep(0.05)
+
+    assert mock_get_authorization.calls == []
+
+
+def test_background_refresh_retries_after_failure(
+    mock_get_authorization: MockGetAuthorization,
+) -> None:
+    mock_get_authorization.fail = True
+    auth = ClientAuth(
+        access_token="token_0",
+        expires_in=100,
+        expires_at=int(time.time()),
+        token_type="bearer",
+        client_id="mock_client_id",
+    )
+    manager = TokenManager("mock_client_id", "mock_secret", auth, retry_seconds=0.01)
+
+    manager.start()
+    while len(mock_get_authorization.calls) < 3:
+        time.sleep(0.01)
+    manager.stop()
+
+    assert manager.access_token == "token_0"
+
+
+def test_background_refresh_logs_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An exception in the background should be logged and the loop stopped cleanly."""
+    called = threading.Event()
+
+    def failing(*args: Any) -> Auth | None:
+        called.set()
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(_tokenmanager, "get_authorization", failing)
+    auth = _user_auth("token_0", expires_in=100, age=100)
+    manager = TokenManager("mock_client_id", "mock_secret", auth, retry_seconds=10.0)
+
+    manager.start()
+    assert called.wait(timeout=1.0)
+    manager.stop()
+
+    assert manager.access_token == "token_0"
+
+
+def test_start_twice_runs_one_thread() -> None:
+    manager = TokenManager("mock_client_id", "mock_secret", _user_auth("token_0"))
+
+    manager.start()
+    thread = manager._thread
+    manager.start()
+
+    assert manager._thread is thread
+    manager.stop()
+    manager.stop()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import pathlib
+from collections.abc import Generator
+
+import pytest
+
+from eggbot_twitch.twitchauth import CachedTokenStore
+from eggbot_twitch.twitchauth import FileTokenStore
+from eggbot_twitch.twitchauth import MemoryTokenStore
+from eggbot_twitch.twitchauth import SingleTokenFileStore
+from eggbot_twitch.twitchauth import SQLiteTokenStore
+from eggbot_twitch.twitchauth import TokenStore
+from eggbot_twitch.twitchauth import UserAuth
+from eggbot_twitch.twitchauth import save_user_authorization
+
+
+def _user_auth(access_token: str, client_id: str = "mock_client_id") -> UserAuth:
+    return UserAuth(
+        access_token=access_token,
+        expires_in=14124,
+        expires_at=1000,
+        refresh_token=f"{access_token}_refresh",
+        scope=("user:email:read", "chat:read"),
+        token_type="bearer",
+        client_id=client_id,
+    )
+
+
+@pytest.fixture(params=["memory", "file", "sqlite", "cached"])
+def store(request: pytest.FixtureRequest, tmp_path: pathlib.Path) -> Generator[TokenStore]:
+    if request.param == "memory":
+        yield MemoryTokenStore()
+
+    elif request.param == "file":
+        yield FileTokenStore(str(tmp_path / "tokens.json"))
+
+    elif request.param == "sqlite":
+        with SQLiteTokenStore(str(tmp_path / "tokens.db")) as sqlite_store:
+            yield sqlite_store
+
+    else:
+        yield CachedTokenStore(MemoryTokenStore())
+
+
+def test_load_missing_account(store: TokenStore) -> None:
+    assert store.load("mock_client_id", "123") is None
+
+
+def test_save_and_load_many_accounts(store: TokenStore) -> None:
+    """Tokens should be kept apart by both client id and user id."""
+    tokens = {
+        ("mock_client_id", "123"): _user_auth("token_a"),
+        ("mock_client_id", "456"): _user_auth("token_b"),
+        ("other_client_id", "123"): _user_auth("token_c", client_id="other_client_id"),
+    }
+
+    for (_, user_id), user_auth in tokens.items():
+        store.save(user_auth, user_id)
+
+    for (client_id, user_id), user_auth in tokens.items():
+        assert store.load(client_id, user_id) == user_auth
+
+
+def test_save_replaces_previous_token(store: TokenStore) -> None:
+    store.save(_user_auth("token_a"), "123")
+    store.save(_user_auth("token_b"), "123")
+
+    assert store.load("mock_client_id", "123") == _user_auth("token_b")
+
+
+def test_delete(store: TokenStore) -> None:
+    store.save(_user_auth("token_a"), "123")
+    store.save(_user_auth("token_b"), "456")
+
+    store.delete("mock_client_id", "123")
+    store.delete("mock_client_id", "789")
+
+    assert store.load("mock_client_id", "123") is None
+    assert store.load("mock_client_id", "456") == _user_auth("token_b")
+
+
+def test_file_store_shared_between_instances(tmp_path: pathlib.Path) -> None:
+    """A save by one store should be seen by another on the same file."""
+    path = str(tmp_path / "tokens.json")
+    reader = FileTokenStore(path)
+    writer = FileTokenStore(path)
+
+    writer.save(_user_auth("token_a"))
+    assert reader.load("mock_client_id") == _user_auth("token_a")
+
+    writer.save(_user_auth("token_b"))
+    assert reader.load("mock_client_id") == _user_auth("token_b")
+
+
+def test_file_store_parses_only_changed_file(tmp_path: pathlib.Path) -> None:
+    """Loads from an unchanged file should reuse the parsed tokens."""
+    store = FileTokenStore(str(tmp_path / "tokens.json"))
+    store.save(_user_auth("token_a"))
+
+    first = store.load("mock_client_id")
+    second = store.load("mock_client_id")
+
+    assert first is second
+
+
+def test_file_store_corrupt_file(tmp_path: pathlib.Path) -> None:
+    """A corrupt file should load as empty and never be overwritten by a save."""
+    path = tmp_path / "tokens.json"
+    path.write_text("{not json")
+    store = FileTokenStore(str(path))
+
+    assert store.load("mock_client_id") is None
+
+    with pytest.raises(ValueError):
+        store.save(_user_auth("token_a"))
+
+    assert path.read_text() == "{not json"
+
+
+@pytest.mark.parametrize("contents", ['{"access_token": "x"}', '"x"', '[{"user_id": "1"}]'])
+def test_file_store_wrong_shape(tmp_path: pathlib.Path, contents: str) -> None:
+    """A file that is not a list of token records should be rejected with ValueError."""
+    path = tmp_path / "tokens.json"
+    path.write_text(contents)
+    store = FileTokenStore(str(path))
+
+    assert store.load("mock_client_id") is None
+
+    with pytest.raises(ValueError):
+        store.save(_user_auth("token_a"))
+
+    assert path.read_text() == contents
+
+
+def test_single_token_store_reads_saved_user_authorization(tmp_path: pathlib.Path) -> None:
+    """A file written by save_user_authorization should load through the store."""
+    path = str(tmp_path / "user_auth.json")
+    save_user_authorization(_user_auth("token_a"), path)
+    store = SingleTokenFileStore(path)
+
+    first = store.load("mock_client_id")
+
+    assert first == _user_auth("token_a")
+    assert store.load("") is first
+    assert store.load("other_client_id") is None
+
+
+def test_single_token_store_save_and_delete(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "user_auth.json"
+    store = SingleTokenFileStore(str(path))
+
+    assert store.load("mock_client_id") is None
+
+    store.save(_user_auth("token_a"))
+    store.save(_user_auth("token_b"))
+    assert store.load("mock_client_id") == _user_auth("token_b")
+
+    store.delete("other_client_id")
+    assert path.exists()
+
+    store.delete("mock_client_id")
+    store.delete("mock_client_id")
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("contents", ["{not json", "[]", '{"client_id": "mock_client_id"}'])
+def test_single_token_store_corrupt_file(tmp_path: pathlib.Path, contents: str) -> None:
+    path = tmp_path / "user_auth.json"
+    path.write_text(contents)
+    store = SingleTokenFileStore(str(path))
+
+    assert store.load("mock_client_id") is None
+
+    with pytest.raises(ValueError):
+        store.delete("mock_client_id")
+
+    assert path.read_text() == contents
+
+
+def test_sqlite_store_persists_between_connections(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "tokens.db")
+
+    with SQLiteTokenStore(path) as store:
+        store.save(_user_auth("token_a"), "123")
+
+    with SQLiteTokenStore(path) as store:
+        assert store.load("mock_client_id", "123") == _user_auth("token_a")
+
+
+class CountingStore(MemoryTokenStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+
+    def load(self, client_id: str, user_id: str = "") -> UserAuth | None:
+        self.loads += 1
+        return super().load(client_id, user_id)
+
+
+def test_cached_store_reads_through_once() -> None:
+    """Once loaded, a token should be served from memory."""
+    backing = CountingStore()
+    backing.save(_user_auth("token_a"))
+    store = CachedTokenStore(backing)
+
+    store.load("mock_client_id")
+    store.load("mock_client_id")
+
+    assert backing.loads == 1
+
+
+def test_cached_store_does_not_cache_misses() -> None:
+    """A token saved to the backing store later should still be found."""
+    backing = CountingStore()
+    store = CachedTokenStore(backing)
+
+    assert store.load("mock_client_id") is None
+    backing.save(_user_auth("token_a"))
+
+    assert store.load("mock_client_id") == _user_auth("token_a")
+
+
+def test_cached_store_ttl_expires() -> None:
+    """After the ttl, a token should be read again to see saves by other processes."""
+    backing = CountingStore()
+    backing.save(_user_auth("token_a"))
+    store = CachedTokenStore(backing, ttl=0.0)
+
+    store.load("mock_client_id")
+    backing.save(_user_auth("token_b"))
+
+    assert store.load("mock_client_id") == _user_auth("token_b")
+    assert backing.loads == 2
+
+
+def test_cached_store_clear() -> None:
+    backing = CountingStore()
+    backing.save(_user_auth("token_a"))
+    store = CachedTokenStore(backing)
+
+    store.load("mock_client_id")
+    store.clear()
+    store.load("mock_client_id")
+
+    assert backing.loads == 2
+
+
+def test_cached_store_writes_through() -> None:
+    backing = CountingStore()
+    store = CachedTokenStore(backing)
+
+    store.save(_user_auth("token_a"))
+
+    assert store.load("mock_client_id") == _user_auth("token_a")
+    assert backing.load("mock_client_id") == _user_auth("token_a")
+    assert backing.loads == 1
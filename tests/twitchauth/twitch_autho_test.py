@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import copy
 import json
+import pathlib
 import tempfile
+import threading
 import time
 from collections.abc import Generator
 from typing import Any
@@ -14,6 +16,8 @@ import responses.matchers
 from eggbot_twitch.twitchauth import ClientAuth
 from eggbot_twitch.twitchauth import UserAuth
 from eggbot_twitch.twitchauth import UserAuthGrant
+from eggbot_twitch.twitchauth import _tokenstore
+from eggbot_twitch.twitchauth import _twitch_autho
 from eggbot_twitch.twitchauth import get_authorization
 from eggbot_twitch.twitchauth import load_user_authorization
 from eggbot_twitch.twitchauth import save_user_authorization
@@ -35,6 +39,13 @@ MOCK_CLIENT_AUTH_RESPONSE = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_module_state() -> Generator[None, None, None]:
+    yield None
+    _twitch_autho._refreshes.clear()
+    _twitch_autho._stores.clear()
+
+
 @pytest.fixture
 def valid_grant() -> UserAuthGrant:
     return UserAuthGrant(
@@ -298,3 +309,288 @@ def test_save_user_authorization_success(userauthfilename: str) -> None:
         result = json.load(infile)
 
     assert result["access_token"] == "newmocktoken"
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_get_authorization_concurrent_refreshes_send_one_request() -> None:
+    """Threads refreshing the same UserAuth at once should share a single request."""
+    user_auth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    mock_response = MOCK_USER_AUTH_RESPONSE | {"access_token": "new_mock_access_token"}
+
+    def slow_response(request: Any) -> tuple[int, dict[str, str], str]:
+        time.sleep(0.2)
+        return 200, {}, json.dumps(mock_response)
+
+    responses.add_callback(
+        method="POST", url="https://id.twitch.tv/oauth2/token", callback=slow_response
+    )
+    results: list[Any] = []
+
+    def refresh() -> None:
+        results.append(get_authorization("mock_id", "mock_secret", user_auth))
+
+    threads = [threading.Thread(target=refresh) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses.calls) == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+
+
+def test_recent_refresh_served_from_memory() -> None:
+    """A refresh token already exchanged should return the earlier result."""
+    coordinator = _twitch_autho._RefreshCoordinator()
+    new_auth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    calls: list[str] = []
+
+    def request() -> UserAuth:
+        calls.append("sent")
+        return new_auth
+
+    assert coordinator.refresh("old_token", "old_access_token", request) is new_auth
+    assert coordinator.refresh("old_token", "old_access_token", request) is new_auth
+    assert calls == ["sent"]
+
+
+def test_recent_refresh_not_served_to_its_holder() -> None:
+    """A caller already holding the recent result should get a new token."""
+    coordinator = _twitch_autho._RefreshCoordinator()
+    new_auth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    calls: list[str] = []
+
+    def request() -> UserAuth:
+        calls.append("sent")
+        return new_auth
+
+    coordinator.refresh("old_token", "old_access_token", request)
+    coordinator.refresh("old_token", new_auth.access_token, request)
+
+    assert calls == ["sent", "sent"]
+
+
+@responses.activate(assert_all_requests_are_fired=True)
+def test_refresh_keeping_refresh_token_can_refresh_again() -> None:
+    """A refresh returning the same refresh token should not block the next refresh."""
+    first = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    for access_token in ("second_access_token", "third_access_token"):
+        responses.add(
+            method="POST",
+            url="https://id.twitch.tv/oauth2/token",
+            body=json.dumps(MOCK_USER_AUTH_RESPONSE | {"access_token": access_token}),
+        )
+
+    second = get_authorization("mock_id", "mock_secret", first)
+    late = get_authorization("mock_id", "mock_secret", first)
+    assert isinstance(second, UserAuth)
+    third = get_authorization("mock_id", "mock_secret", second)
+
+    assert second.refresh_token == first.refresh_token
+    assert late is second
+    assert third is not None
+    assert third.access_token == "third_access_token"
+    assert len(responses.calls) == 2
+
+
+def test_recent_refresh_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    coordinator = _twitch_autho._RefreshCoordinator()
+    new_auth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    calls: list[str] = []
+
+    def request() -> UserAuth:
+        calls.append("sent")
+        return new_auth
+
+    coordinator.refresh("old_token", "old_access_token", request)
+    monkeypatch.setattr(_twitch_autho, "_RECENT_REFRESH_SECONDS", -1.0)
+    coordinator.refresh("old_token", "old_access_token", request)
+
+    assert calls == ["sent", "sent"]
+
+
+def test_recent_refreshes_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only the most recent results should be kept once the limit is reached."""
+    monkeypatch.setattr(_twitch_autho, "_RECENT_REFRESH_LIMIT", 1)
+    coordinator = _twitch_autho._RefreshCoordinator()
+    new_auth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    calls: list[str] = []
+
+    def request() -> UserAuth:
+        calls.append("sent")
+        return new_auth
+
+    coordinator.refresh("first_token", "old_access_token", request)
+    coordinator.refresh("second_token", "old_access_token", request)
+    coordinator.refresh("first_token", "old_access_token", request)
+
+    assert calls == ["sent", "sent", "sent"]
+
+
+def test_failed_refresh_not_remembered() -> None:
+    """A failed refresh should be retried by the next caller."""
+    coordinator = _twitch_autho._RefreshCoordinator()
+    calls: list[str] = []
+
+    def request() -> None:
+        calls.append("sent")
+        return None
+
+    assert coordinator.refresh("old_token", "old_access_token", request) is None
+    assert coordinator.refresh("old_token", "old_access_token", request) is None
+    assert calls == ["sent", "sent"]
+
+
+def test_refresh_error_shared_with_waiting_callers() -> None:
+    """An exception raised by the request should reach every caller waiting on it."""
+    coordinator = _twitch_autho._RefreshCoordinator()
+    entered = threading.Event()
+    release = threading.Event()
+    errors: list[Exception] = []
+
+    def request() -> None:
+        entered.set()
+        release.wait()
+        raise ConnectionError("refused")
+
+    def refresh() -> None:
+        try:
+            coordinator.refresh("old_token", "old_access_token", request)
+        except ConnectionError as exc:
+            errors.append(exc)
+
+    owner = threading.Thread(target=refresh)
+    owner.start()
+    entered.wait()
+    waiter = threading.Thread(target=refresh)
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join()
+    waiter.join()
+
+    assert len(errors) == 2
+
+
+def test_save_user_authorization_replaces_atomically(tmp_path: pathlib.Path) -> None:
+    """Saving should leave only the target and its lock file, with private permissions."""
+    userauth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    target = tmp_path / "user_auth.json"
+    target.write_text("old contents")
+
+    save_user_authorization(userauth, str(target))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "user_auth.json",
+        "user_auth.json.lock",
+    ]
+    assert load_user_authorization(str(target)) == userauth
+    assert target.stat().st_mode & 0o077 == 0
+
+
+def test_save_user_authorization_failure_keeps_old_file(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A failure before the rename should leave the old file intact and no temp file."""
+    userauth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    target = tmp_path / "user_auth.json"
+    target.write_text("old contents")
+
+    def crash(src: str, dst: str) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(_tokenstore.os, "replace", crash)
+
+    with pytest.raises(OSError):
+        save_user_authorization(userauth, str(target))
+
+    assert target.read_text() == "old contents"
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "user_auth.json",
+        "user_auth.json.lock",
+    ]
+
+
+def test_save_user_authorization_waits_for_lock(tmp_path: pathlib.Path) -> None:
+    """A save should wait while another writer holds the lock."""
+    userauth = UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id")
+    target = str(tmp_path / "user_auth.json")
+
+    with _tokenstore._file_lock(target):
+        saver = threading.Thread(target=save_user_authorization, args=(userauth, target))
+        saver.start()
+        saver.join(timeout=0.1)
+
+        assert saver.is_alive()
+
+    saver.join()
+    assert load_user_authorization(target) == userauth
+
+
+def test_load_user_authorization_reads_file_only_when_changed(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """An unchanged file should be served from memory, a replaced one read again."""
+    target = str(tmp_path / "user_auth.json")
+    save_user_authorization(UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id"), target)
+    reads: list[str] = []
+    real_load = UserAuth.load.__func__  # type: ignore[attr-defined]
+
+    def counting_load(cls: type[UserAuth], fp: Any) -> UserAuth:
+        reads.append("read")
+        return real_load(cls, fp)  # type: ignore[no-any-return]
+
+    monkeypatch.setattr(UserAuth, "load", classmethod(counting_load))
+
+    first = load_user_authorization(target)
+    second = load_user_authorization(target)
+
+    refreshed = MOCK_USER_AUTH_RESPONSE | {"access_token": "refreshed_token"}
+    save_user_authorization(UserAuth.parse_response(refreshed, "mock_id"), target)
+    third = load_user_authorization(target)
+
+    assert first is second
+    assert third is not None
+    assert third.access_token == "refreshed_token"
+    assert reads == ["read", "read"]
+
+
+def test_load_user_authorization_sees_saves_of_other_processes(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Once the cache expires, a file replaced by another process should be read again."""
+    monkeypatch.setattr(_twitch_autho, "_USER_AUTH_CACHE_SECONDS", 0.0)
+    target = str(tmp_path / "user_auth.json")
+    save_user_authorization(UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE, "mock_id"), target)
+
+    first = load_user_authorization(target)
+    _tokenstore.SingleTokenFileStore(target).save(
+        UserAuth.parse_response(MOCK_USER_AUTH_RESPONSE | {"access_token": "other"}, "mock_id")
+    )
+    second = load_user_authorization(target)
+
+    assert first is not None
+    assert first.access_token == "mock_access_token"
+    assert second is not None
+    assert second.access_token == "other"
+
+
+@pytest.mark.parametrize("contents", ["[]", '"x"', "null", "1"])
+def test_load_user_authorization_not_an_object(tmp_path: pathlib.Path, contents: str) -> None:
+    """A file holding valid JSON of the wrong shape should be treated as unreadable."""
+    target = tmp_path / "user_auth.json"
+    target.write_text(contents)
+
+    assert load_user_authorization(str(target)) is None
+
+
+def test_load_user_authorization_missing_fields(tmp_path: pathlib.Path) -> None:
+    """A file missing required fields should be treated as unreadable."""
+    target = tmp_path / "user_auth.json"
+    target.write_text(json.dumps({"access_token": "mock_access_token"}))
+
+    assert load_user_authorization(str(target)) is None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from websockets.exceptions import ConnectionClosed
+from websockets.exceptions import ConnectionClosedError
+from websockets.exceptions import ConnectionClosedOK
+
+from eggbot_twitch.twitchevent import AsyncSession
+from eggbot_twitch.twitchevent import Message
+from eggbot_twitch.twitchevent import ReconnectPolicy
+from eggbot_twitch.twitchevent import _asyncsession as asyncsession_module
+from eggbot_twitch.twitchevent import get_async_session
+
+from .conftest import URI
+
+
+def test_get_async_session() -> None:
+    """Connect, receive the session id, and iterate the messages that follow."""
+
+    async def main() -> tuple[str, list[Message]]:
+        async with await get_async_session(URI) as session:
+            iterator = aiter(session)
+            messages = [await anext(iterator) for _ in range(4)]
+
+            return session.session_id, messages
+
+    session_id, messages = asyncio.run(main())
+
+    assert session_id.startswith("mock_session_id")
+    assert len(messages) == 4
+
+
+def test_iteration_ends_when_closed() -> None:
+    async def main() -> list[Message]:
+        session = await get_async_session(URI)
+        await session.close()
+
+        return [message async for message in session]
+
+    assert asyncio.run(main()) == []
+
+
+def test_iteration_of_unconnected_session() -> None:
+    async def main() -> list[Message]:
+        return [message async for message in AsyncSession(URI)]
+
+    assert asyncio.run(main()) == []
+
+
+def test_close_unconnected_session() -> None:
+    asyncio.run(AsyncSession(URI).close())
+
+
+@pytest.mark.parametrize("error", [ConnectionClosedOK, ConnectionClosedError])
+def test_iteration_ends_when_server_closes(error: type[ConnectionClosed]) -> None:
+    """The websocket closing, cleanly or abnormally, ends the iteration."""
+
+    class ClosedWebsocket:
+        async def recv(self, decode: bool) -> str:
+            raise error(None, None)
+
+    session = AsyncSession(URI)
+    session.websocket = ClosedWebsocket()  # type: ignore[assignment]
+
+    async def main() -> list[Message]:
+        return [message async for message in session]
+
+    assert asyncio.run(main()) == []
+
+
+def test_welcome_message_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(asyncsession_module, "_INITIAL_MESSAGE_TIMEOUT_SECONDS", 0.1)
+    pattern = "Connection to session hit max timeout."
+
+    with pytest.raises(TimeoutError, match=pattern):
+        asyncio.run(get_async_session(URI + "/silent"))
+
+
+def test_messages_before_welcome_are_discarded() -> None:
+    """A keepalive sent ahead of the welcome should not be taken for it."""
+
+    async def main() -> str:
+        async with await get_async_session(URI + "/keepalive-first") as session:
+            return session.session_id
+
+    assert asyncio.run(main()).startswith("mock_session_id")
+
+
+def test_retries_and_fails_without_server() -> None:
+    pattern = "Failed to establish connection to websocket server after 3 retries"
+
+    with pytest.raises(ConnectionError, match=pattern):
+        asyncio.run(get_async_session("ws://localhost:9999", ReconnectPolicy(base_delay=0.0)))
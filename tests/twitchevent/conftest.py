@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import json
+import queue
+import threading
+import time
+import urllib.parse
+import uuid
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from websockets.sync.server import ServerConnection
+from websockets.sync.server import serve
+
+MOCK_HANDSHAKE_RESPONSE: dict[str, Any] = {
+    "metadata": {
+        "message_id": "c7f09613-7b34-4093-b44c-305c6a36bb04",
+        "message_type": "session_welcome",
+        "message_timestamp": "2025-09-09T03:19:44.99039766Z",
+    },
+    "payload": {
+        "session": {
+            "id": "mock_session_id",
+            "status": "connected",
+            "connected_at": "2025-09-09T03:19:44.986763032Z",
+            "keepalive_timeout_seconds": 10,
+            "reconnect_url": None,
+            "recovery_url": None,
+        }
+    },
+}
+
+MOCK_NOTIFICATION_RESPONSE: dict[str, Any] = {
+    "metadata": {
+        "message_id": "befa7b53-d79d-478f-86b9-120f112b044e",
+        "message_type": "notification",
+        "message_timestamp": "2022-11-16T10:11:12.464757833Z",
+        "subscription_type": "channel.follow",
+        "subscription_version": "1",
+    },
+    "payload": {
+        "subscription": {
+            "id": "f1c2a387-161a-49f9-a165-0f21d7a4e1c4",
+            "status": "enabled",
+            "type": "channel.follow",
+            "version": "1",
+            "cost": 1,
+            "condition": {"broadcaster_user_id": "12826"},
+            "transport": {"method": "websocket", "session_id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB"},
+            "created_at": "2022-11-16T10:11:12.464757833Z",
+        },
+        "event": {
+            "user_id": "1337",
+            "user_login": "awesome_user",
+            "user_name": "Awesome_User",
+            "broadcaster_user_id": "12826",
+            "broadcaster_user_login": "twitch",
+            "broadcaster_user_name": "Twitch",
+            "followed_at": "2023-07-15T18:16:11.17106713Z",
+        },
+    },
+}
+
+MOCK_RECONNECT_RESPONSE: dict[str, Any] = {
+    "metadata": {
+        "message_id": "84c1e79a-2a4b-4c13-ba0b-4312293e9308",
+        "message_type": "session_reconnect",
+        "message_timestamp": "2022-11-18T09:10:11.634234626Z",
+    },
+    "payload": {
+        "session": {
+            "id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB",
+            "status": "reconnecting",
+            "keepalive_timeout_seconds": None,
+            "reconnect_url": "wss://eventsub.wss.twitch.tv?...",
+            "connected_at": "2022-11-16T10:11:12.634234626Z",
+        }
+    },
+}
+
+MOCK_REVOCATION_RESPONSE: dict[str, Any] = {
+    "metadata": {
+        "message_id": "d0a1b3f9-5e0f-4c5b-9a4e-8f9d2c6b7a10",
+        "message_type": "revocation",
+        "message_timestamp": "2022-11-16T10:11:12.464757833Z",
+        "subscription_type": "channel.follow",
+        "subscription_version": "1",
+    },
+    "payload": {
+        "subscription": {
+            "id": "f1c2a387-161a-49f9-a165-0f21d7a4e1c4",
+            "status": "authorization_revoked",
+            "type": "channel.follow",
+            "version": "1",
+            "cost": 1,
+            "condition": {"broadcaster_user_id": "12826"},
+            "transport": {"method": "websocket", "session_id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB"},
+            "created_at": "2022-11-16T10:11:12.464757833Z",
+        }
+    },
+}
+
+MOCK_KEEPALIVE_RESPONSE: dict[str, Any] = {
+    "metadata": {
+        "message_id": "7e2b9c4d-1f3a-4e8b-b6d5-0c9a8f7e6d21",
+        "message_type": "session_keepalive",
+        "message_timestamp": "2023-07-19T10:11:12.634234626Z",
+    },
+    "payload": {},
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Client:
+    uid: str
+    connection: ServerConnection
+    send_queue: queue.Queue[str] = dataclasses.field(default_factory=queue.Queue)
+
+
+class MockEventServer(threading.Thread):
+
+    def __init__(self, host: str, port: int) -> None:
+        super().__init__()
+        self.host = host.replace("ws://", "").replace("wss://", "")
+        self.port = port
+        self.server = serve(self.handler, self.host, self.port)
+
+        self.is_serving = threading.Event()
+        self.clients: set[Client] = set()
+
+    def run(self) -> None:
+        """Run the websocket server forever."""
+        self.is_serving.set()
+        self.server.serve_forever()
+
+    def handler(self, websocket: ServerConnection) -> None:
+        # Runs in a thread on client connection, handled by server
+        client = Client(str(uuid.uuid4()), websocket)
+        self.clients.add(client)
+
+        path = urllib.parse.urlparse(websocket.request.path if websocket.request else "")
+        query = dict(urllib.parse.parse_qsl(path.query))
+
+        messages = [
+            copy.deepcopy(MOCK_HANDSHAKE_RESPONSE),
+            copy.deepcopy(MOCK_NOTIFICATION_RESPONSE),
+            copy.deepcopy(MOCK_RECONNECT_RESPONSE),
+            copy.deepcopy(MOCK_REVOCATION_RESPONSE),
+            copy.deepcopy(MOCK_KEEPALIVE_RESPONSE),
+        ]
+
+        # The reconnect message points back at this server. The 'reconnect_path' query
+        # selects which of the paths below the client is sent to.
+        reconnect_path = query.get("reconnect_path", "/reconnect")
+        messages[2]["payload"]["session"][
+            "reconnect_url"
+        ] = f"ws://{self.host}:{self.port}{reconnect_path}?old={client.uid}"
+
+        # The 'keepalive_timeout' query overrides the welcome's keepalive timeout
+        if "keepalive_timeout" in query:
+            timeout = float(query["keepalive_timeout"])
+            messages[0]["payload"]["session"]["keepalive_timeout_seconds"] = timeout
+
+        # The 'redeliver' query sends the revocation message a second time
+        if "redeliver" in query:
+            messages.append(copy.deepcopy(MOCK_REVOCATION_RESPONSE))
+
+        # Connecting to the '/silent' path never sends a welcome message
+        if path.path == "/silent":
+            messages = []
+
+        # Connecting to the '/no-reconnect' path never asks the client to reconnect
+        elif path.path == "/no-reconnect":
+            del messages[2]
+
+        # Connecting to the '/keepalive-first' path sends a keepalive before the welcome
+        elif path.path == "/keepalive-first":
+            messages = [copy.deepcopy(MOCK_KEEPALIVE_RESPONSE), messages[0]]
+
+        # The '/reconnect' path welcomes the client, then redelivers a message the
+        # old connection already sent
+        elif path.path == "/reconnect":
+            messages = [messages[0], copy.deepcopy(MOCK_REVOCATION_RESPONSE)]
+
+        # The '/slow-reconnect' path closes the old connection before welcoming
+        elif path.path == "/slow-reconnect":
+            time.sleep(0.1)
+            for old_client in list(self.clients):
+                if old_client.uid == query["old"]:
+                    old_client.connection.close()
+            time.sleep(0.2)
+            messages = [messages[0]]
+
+        for message in messages:
+            if "session" in message["payload"]:
+                message["payload"]["session"]["id"] = f"mock_session_id:{client.uid}"
+            client.send_queue.put(json.dumps(message))
+
+        while self.is_serving.is_set():
+            try:
+                send_message = client.send_queue.get(timeout=0.1)
+                client.connection.send(send_message)
+
+            except queue.Empty:
+                continue
+
+
+HOST = "ws://localhost"
+PORT = 5006
+URI = "ws://localhost:5006"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def session_for_tests() -> Generator[None, None, None]:
+    server = MockEventServer(HOST, PORT)
+
+    try:
+        server.start()
+        yield None
+
+    finally:
+        server.is_serving.clear()
+        # Odd timing behavior from GHA. Without a delay here to allow the handler
+        # to exit, coverage will not see the branch exit.
+        time.sleep(0.2)
+        server.server.shutdown()
+        server.join()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+
+import pytest
+
+from eggbot_twitch.twitchevent import Dispatcher
+from eggbot_twitch.twitchevent import Message
+from eggbot_twitch.twitchevent import OrderedExecutor
+from eggbot_twitch.twitchevent import get_session
+from eggbot_twitch.twitchevent._dispatcher import broadcaster_key
+
+from .conftest import MOCK_KEEPALIVE_RESPONSE
+from .conftest import MOCK_NOTIFICATION_RESPONSE
+from .conftest import MOCK_RECONNECT_RESPONSE
+from .conftest import MOCK_REVOCATION_RESPONSE
+from .conftest import URI
+
+NOTIFICATION = Message.parse(json.dumps(MOCK_NOTIFICATION_RESPONSE))
+REVOCATION = Message.parse(json.dumps(MOCK_REVOCATION_RESPONSE))
+KEEPALIVE = Message.parse(json.dumps(MOCK_KEEPALIVE_RESPONSE))
+RECONNECT = Message.parse(json.dumps(MOCK_RECONNECT_RESPONSE))
+
+
+def test_dispatch_by_message_and_subscription_type() -> None:
+    dispatcher = Dispatcher()
+    notifications: list[Message] = []
+    revocations: list[Message] = []
+    dispatcher.register(notifications.append, "channel.follow")
+    dispatcher.register(revocations.append, "channel.follow", message_type="revocation")
+
+    results = [dispatcher.dispatch(message) for message in (NOTIFICATION, REVOCATION)]
+
+    assert results == [True, True]
+    assert notifications == [NOTIFICATION]
+    assert revocations == [REVOCATION]
+
+
+def test_dispatch_unregistered_message() -> None:
+    dispatcher = Dispatcher()
+    handled: list[Message] = []
+    dispatcher.register(handled.append, "channel.raid")
+
+    assert dispatcher.dispatch(NOTIFICATION) is False
+    assert handled == []
+
+
+def test_internal_messages_never_reach_handlers() -> None:
+    dispatcher = Dispatcher()
+    handled: list[Message] = []
+    dispatcher.register(handled.append, "")
+
+    assert dispatcher.dispatch(KEEPALIVE) is False
+    assert dispatcher.dispatch(RECONNECT) is False
+    assert handled == []
+
+
+def test_register_internal_message_type_raises() -> None:
+    dispatcher = Dispatcher()
+
+    with pytest.raises(ValueError, match="handled internally"):
+        dispatcher.register(print, "", message_type="session_keepalive")
+
+
+def test_on_decorator_registers_in_order() -> None:
+    dispatcher = Dispatcher()
+    calls: list[str] = []
+
+    @dispatcher.on("channel.follow")
+    def first(message: Message) -> None:
+        calls.append("first")
+
+    @dispatcher.on("channel.follow")
+    def second(message: Message) -> None:
+        calls.append("second")
+
+    dispatcher.dispatch(NOTIFICATION)
+
+    assert calls == ["first", "second"]
+    assert first.__name__ == "first"
+
+
+def test_failing_handler_does_not_stop_others(caplog: pytest.LogCaptureFixture) -> None:
+    dispatcher = Dispatcher()
+    handled: list[Message] = []
+    dispatcher.register(lambda message: 1 / 0, "channel.follow")
+    dispatcher.register(handled.append, "channel.follow")
+
+    with caplog.at_level(logging.ERROR):
+        dispatcher.dispatch(NOTIFICATION)
+
+    assert handled == [NOTIFICATION]
+    assert "Handler failed" in caplog.text
+
+
+def test_run_session_until_closed() -> None:
+    dispatcher = Dispatcher()
+    handled: list[Message] = []
+    dispatcher.register(handled.append, "channel.follow")
+    dispatcher.register(handled.append, "channel.follow", message_type="revocation")
+    session = get_session(URI)
+
+    while len(handled) < 2:
+        message = session.get_message()
+        assert message is not None
+        dispatcher.dispatch(message)
+
+    session.close()
+    dispatcher.run(session)
+
+    assert [message.message_type for message in handled] == ["notification", "revocation"]
+
+
+def _notification(broadcaster_user_id: str) -> Message:
+    contents = copy.deepcopy(MOCK_NOTIFICATION_RESPONSE)
+    contents["payload"]["subscription"]["condition"]["broadcaster_user_id"] = broadcaster_user_id
+    return Message.parse(json.dumps(contents))
+
+
+def test_broadcaster_key() -> None:
+    assert broadcaster_key(NOTIFICATION) == "12826"
+    assert broadcaster_key(REVOCATION) == "12826"
+    assert broadcaster_key(KEEPALIVE) == ""
+
+
+def test_executor_keeps_order_per_key() -> None:
+    messages = [_notification(str(number % 3)) for number in range(30)]
+    handled: list[Message] = []
+
+    with OrderedExecutor(max_workers=3) as executor:
+        dispatcher = Dispatcher(executor=executor)
+        dispatcher.register(handled.append, "channel.follow")
+        dispatcher.run(messages)
+
+    for key in ("0", "1", "2"):
+        expected = [message for message in messages if broadcaster_key(message) == key]
+        assert [message for message in handled if broadcaster_key(message) == key] == expected
+
+
+def test_executor_slow_handler_does_not_stall_other_keys() -> None:
+    release = threading.Event()
+    handled = threading.Event()
+
+    def handler(message: Message) -> None:
+        if message.subscription_type == "channel.follow":
+            release.wait()
+
+        else:
+            handled.set()
+
+    raid = copy.deepcopy(MOCK_NOTIFICATION_RESPONSE)
+    raid["metadata"]["subscription_type"] = "channel.raid"
+
+    def key(message: Message) -> int:
+        # Integers hash to themselves, pinning each subscription type to its own worker
+        return 0 if message.subscription_type == "channel.follow" else 1
+
+    with OrderedExecutor(max_workers=2) as executor:
+        dispatcher = Dispatcher(executor=executor, key=key)
+        dispatcher.register(handler, "channel.follow")
+        dispatcher.register(handler, "channel.raid")
+
+        dispatcher.dispatch(NOTIFICATION)
+        dispatcher.dispatch(Message.parse(json.dumps(raid)))
+
+        assert handled.wait(1.0)
+        release.set()
@@ -1,189 +1,24 @@
 from __future__ import annotations
 
-import copy
-import dataclasses
-import json
-import queue
+import contextlib
 import threading
 import time
-import uuid
-from collections.abc import Generator
-from typing import Any
 
 import pytest
-from websockets.sync.server import ServerConnection
-from websockets.sync.server import serve
+import websockets.sync.client
 
+from eggbot_twitch.twitchevent import Message
+from eggbot_twitch.twitchevent import OverflowPolicy
+from eggbot_twitch.twitchevent import ReconnectPolicy
 from eggbot_twitch.twitchevent import _eventclient as eventclient_module
+from eggbot_twitch.twitchevent import _reconnectpolicy as reconnectpolicy_module
 from eggbot_twitch.twitchevent import get_session
+from eggbot_twitch.twitchevent import get_sessions
+from eggbot_twitch.twitchevent._session import Session
 
-MOCK_HANDSHAKE_RESPONSE: dict[str, Any] = {
-    "metadata": {
-        "message_id": "c7f09613-7b34-4093-b44c-305c6a36bb04",
-        "message_type": "session_welcome",
-        "message_timestamp": "2025-09-09T03:19:44.99039766Z",
-    },
-    "payload": {
-        "session": {
-            "id": "mock_session_id",
-            "status": "connected",
-            "connected_at": "2025-09-09T03:19:44.986763032Z",
-            "keepalive_timeout_seconds": 10,
-            "reconnect_url": None,
-            "recovery_url": None,
-        }
-    },
-}
-
-MOCK_NOTIFICATION_RESPONSE: dict[str, Any] = {
-    "metadata": {
-        "message_id": "befa7b53-d79d-478f-86b9-120f112b044e",
-        "message_type": "notification",
-        "message_timestamp": "2022-11-16T10:11:12.464757833Z",
-        "subscription_type": "channel.follow",
-        "subscription_version": "1",
-    },
-    "payload": {
-        "subscription": {
-            "id": "f1c2a387-161a-49f9-a165-0f21d7a4e1c4",
-            "status": "enabled",
-            "type": "channel.follow",
-            "version": "1",
-            "cost": 1,
-            "condition": {"broadcaster_user_id": "12826"},
-            "transport": {"method": "websocket", "session_id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB"},
-            "created_at": "2022-11-16T10:11:12.464757833Z",
-        },
-        "event": {
-            "user_id": "1337",
-            "user_login": "awesome_user",
-            "user_name": "Awesome_User",
-            "broadcaster_user_id": "12826",
-            "broadcaster_user_login": "twitch",
-            "broadcaster_user_name": "Twitch",
-            "followed_at": "2023-07-15T18:16:11.17106713Z",
-        },
-    },
-}
-
-MOCK_RECONNECT_RESPONSE: dict[str, Any] = {
-    "metadata": {
-        "message_id": "84c1e79a-2a4b-4c13-ba0b-4312293e9308",
-        "message_type": "session_reconnect",
-        "message_timestamp": "2022-11-18T09:10:11.634234626Z",
-    },
-    "payload": {
-        "session": {
-            "id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB",
-            "status": "reconnecting",
-            "keepalive_timeout_seconds": None,
-            "reconnect_url": "wss://eventsub.wss.twitch.tv?...",
-            "connected_at": "2022-11-16T10:11:12.634234626Z",
-        }
-    },
-}
-
-MOCK_REVOCATION_RESPONSE: dict[str, Any] = {
-    "metadata": {
-        "message_id": "84c1e79a-2a4b-4c13-ba0b-4312293e9308",
-        "message_type": "revocation",
-        "message_timestamp": "2022-11-16T10:11:12.464757833Z",
-        "subscription_type": "channel.follow",
-        "subscription_version": "1",
-    },
-    "payload": {
-        "subscription": {
-            "id": "f1c2a387-161a-49f9-a165-0f21d7a4e1c4",
-            "status": "authorization_revoked",
-            "type": "channel.follow",
-            "version": "1",
-            "cost": 1,
-            "condition": {"broadcaster_user_id": "12826"},
-            "transport": {"method": "websocket", "session_id": "AQoQexAWVYKSTIu4ec_2VAxyuhAB"},
-            "created_at": "2022-11-16T10:11:12.464757833Z",
-        }
-    },
-}
-
-MOCK_KEEPALIVE_RESPONSE: dict[str, Any] = {
-    "metadata": {
-        "message_id": "84c1e79a-2a4b-4c13-ba0b-4312293e9308",
-        "message_type": "session_keepalive",
-        "message_timestamp": "2023-07-19T10:11:12.634234626Z",
-    },
-    "payload": {},
-}
-
-
-@dataclasses.dataclass(frozen=True)
-class Client:
-    uid: str
-    connection: ServerConnection
-    send_queue: queue.Queue[str] = dataclasses.field(default_factory=queue.Queue)
-
-
-class MockEventServer(threading.Thread):
-
-    def __init__(self, host: str, port: int) -> None:
-        super().__init__()
-        self.host = host.replace("ws://", "").replace("wss://", "")
-        self.port = port
-        self.server = serve(self.handler, self.host, self.port)
-
-        self.is_serving = threading.Event()
-        self.clients: set[Client] = set()
-
-    def run(self) -> None:
-        """Run the websocket server forever."""
-        self.is_serving.set()
-        self.server.serve_forever()
-
-    def handler(self, websocket: ServerConnection) -> None:
-        # Runs in a thread on client connection, handled by server
-        client = Client(str(uuid.uuid4()), websocket)
-
-        messages = [
-            copy.deepcopy(MOCK_HANDSHAKE_RESPONSE),
-            copy.deepcopy(MOCK_NOTIFICATION_RESPONSE),
-            copy.deepcopy(MOCK_RECONNECT_RESPONSE),
-            copy.deepcopy(MOCK_REVOCATION_RESPONSE),
-            copy.deepcopy(MOCK_KEEPALIVE_RESPONSE),
-        ]
-
-        for message in messages:
-            if "session" in message["payload"]:
-                message["payload"]["session"]["id"] = f"mock_session_id:{client.uid}"
-            client.send_queue.put(json.dumps(message))
-
-        while self.is_serving.is_set():
-            try:
-                send_message = client.send_queue.get(timeout=0.1)
-                client.connection.send(send_message)
-
-            except queue.Empty:
-                continue
-
-
-HOST = "ws://localhost"
-PORT = 5006
-URI = "ws://localhost:5006"
-
-
-@pytest.fixture(scope="session", autouse=True)
-def session_for_tests() -> Generator[None, None, None]:
-    server = MockEventServer(HOST, PORT)
-
-    try:
-        server.start()
-        yield None
-
-    finally:
-        server.is_serving.clear()
-        # Odd timing behavior from GHA. Without a delay here to allow the handler
-        # to exit, coverage will not see the branch exit.
-        time.sleep(0.2)
-        server.server.shutdown()
-        server.join()
+from .conftest import URI
+
+NO_DELAY = ReconnectPolicy(base_delay=0.0)
 
 
 def test_start_session_thread() -> None:
@@ -193,7 +28,11 @@ def test_start_session_thread() -> None:
     session.close()
 
     assert session.session_id.startswith("mock_session_id")
-    assert len(messages) == 4
+    assert [message.message_type for message in messages] == [
+        "notification",
+        "revocation",
+        "session_keepalive",
+    ]
 
 
 def test_start_session_thread_hard_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -209,4 +48,443 @@ def test_start_session_retries_and_fails_without_server() -> None:
     pattern = "Failed to establish connection to websocket server after 3 retries"
 
     with pytest.raises(ConnectionError, match=pattern):
-        get_session("ws://localhost:9999")
+        get_session("ws://localhost:9999", reconnect_policy=NO_DELAY)
+
+
+def test_start_many_sessions_together() -> None:
+    """Start several sessions at once, each with its own session id."""
+    sessions = get_sessions([URI, URI, URI])
+    for session in sessions:
+        session.close()
+
+    assert len({session.session_id for session in sessions}) == 3
+    assert all(session.ready.is_set() for session in sessions)
+
+
+def test_start_many_sessions_closes_all_on_failure() -> None:
+    """If one session fails to start, every session is closed."""
+    pattern = "Failed to establish connection to websocket server after 3 retries"
+
+    with pytest.raises(ConnectionError, match=pattern):
+        get_sessions([URI, "ws://localhost:9999"], reconnect_policy=NO_DELAY)
+
+
+def test_welcome_timeout_is_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A welcome that never arrives is retried, then reported once retries run out."""
+    monkeypatch.setattr(eventclient_module, "_INITIAL_MESSAGE_TIMEOUT_SECONDS", 0.1)
+    pattern = "Failed to establish connection to websocket server after 3 retries"
+
+    start = time.monotonic()
+    with pytest.raises(ConnectionError, match=pattern) as err:
+        get_session(URI + "/silent", reconnect_policy=NO_DELAY)
+
+    assert isinstance(err.value.__cause__, TimeoutError)
+    assert time.monotonic() - start < 2.0
+
+
+def test_handshake_timeout_is_retried(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A TimeoutError from connect, as on an opening handshake timeout, is retried."""
+    real_connect = websockets.sync.client.connect
+    attempts: list[str] = []
+
+    def flaky_connect(uri: str) -> websockets.sync.client.ClientConnection:
+        attempts.append(uri)
+        if len(attempts) == 1:
+            raise TimeoutError("timed out during opening handshake")
+        return real_connect(uri)
+
+    monkeypatch.setattr(eventclient_module.websockets.sync.client, "connect", flaky_connect)
+
+    session = get_session(URI + "/no-reconnect", reconnect_policy=NO_DELAY)
+    session.close()
+
+    assert len(attempts) == 2
+    assert session.session_id.startswith("mock_session_id")
+
+
+def test_unexpected_error_recorded_on_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An error that is not retried ends the thread and is kept on the session."""
+
+    def broken_start(session: Session, welcome: Message) -> None:
+        raise KeyError("session")
+
+    monkeypatch.setattr(eventclient_module, "_start", broken_start)
+
+    with pytest.raises(ConnectionError) as err:
+        get_session(URI)
+
+    assert isinstance(err.value.__cause__, KeyError)
+
+
+def test_get_message_blocks_until_closed() -> None:
+    """Messages are returned as they arrive, None once the session is closed and drained."""
+    session = get_session(URI)
+    messages = [session.get_message() for _ in range(3)]
+    session.close()
+
+    assert all(message is not None for message in messages)
+    assert session.get_message() is None
+    assert list(session) == []
+
+
+def test_get_message_timeout() -> None:
+    session = get_session(URI)
+    messages = [session.get_message() for _ in range(3)]
+
+    result = session.get_message(timeout=0.1)
+    session.close()
+
+    assert len(messages) == 3
+    assert result is None
+
+
+def test_iterate_session_until_closed() -> None:
+    """Iterating the session ends once it is closed and every message is consumed."""
+    session = get_session(URI)
+    threading.Timer(0.5, session.close).start()
+
+    messages = list(session)
+
+    assert len(messages) == 3
+
+
+def test_get_batch() -> None:
+    """Every queued message is returned in batches, an empty batch once closed."""
+    session = get_session(URI)
+    messages: list[Message] = []
+    while len(messages) < 3:
+        messages.extend(session.get_batch())
+
+    timed_out = session.get_batch(timeout=0.1)
+    session.close()
+
+    assert len(messages) == 3
+    assert timed_out == []
+    assert session.get_batch() == []
+
+
+def test_message_iter_stops_when_closed() -> None:
+    """The polling iterator returns immediately once the session is closed and drained."""
+    session = get_session(URI)
+    session.close()
+
+    start = time.monotonic()
+    list(session.message_iter(max_poll_count=100))
+
+    assert time.monotonic() - start < 1.0
+
+
+def test_bounded_session_drops_keepalive() -> None:
+    session = get_session(URI, maxsize=1, overflow=OverflowPolicy.DROP_KEEPALIVE)
+
+    while session.queue_stats.dropped < 2:
+        time.sleep(0.01)
+
+    session.close()
+    messages = list(session)
+
+    assert [message.message_type for message in messages] == ["revocation"]
+    assert session.queue_stats.dropped == 2
+
+
+def test_close_releases_thread_blocked_on_full_queue() -> None:
+    session = get_session(URI + "/no-reconnect", maxsize=1)
+
+    # Allow the session thread to fill the queue and block on the next message
+    time.sleep(0.3)
+    assert session.messages.full()
+
+    session.close()
+
+    assert not session.thread.is_alive()
+    assert session.get_message() is not None
+
+
+def test_reconnect_hands_off_without_loss_or_duplicates() -> None:
+    """Messages from both connections arrive once each, then the new connection is used."""
+    session = get_session(URI)
+    first_session_id = session.session_id
+    messages = [session.get_message() for _ in range(3)]
+
+    result = session.get_message(timeout=0.3)
+    session.close()
+
+    assert [message.message_type for message in messages if message] == [
+        "notification",
+        "revocation",
+        "session_keepalive",
+    ]
+    assert result is None
+    assert session.session_id != first_session_id
+
+
+def test_reconnect_releases_old_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each handoff should swap the connection held by the session, not add to it."""
+    stacks: list[contextlib.ExitStack] = []
+    real_read_messages = eventclient_module._read_messages
+
+    def read_messages(
+        session: Session,
+        websocket: websockets.sync.client.ClientConnection,
+        connections: contextlib.ExitStack,
+    ) -> None:
+        stacks.append(connections)
+        real_read_messages(session, websocket, connections)
+
+    monkeypatch.setattr(eventclient_module, "_read_messages", read_messages)
+    session = get_session(URI)
+    first_session_id = session.session_id
+
+    while session.session_id == first_session_id:
+        time.sleep(0.01)
+    held = len(stacks[0]._exit_callbacks)  # type: ignore[attr-defined]
+    session.close()
+
+    assert held == 1
+
+
+def test_reconnect_after_old_connection_closes() -> None:
+    session = get_session(URI + "?reconnect_path=/slow-reconnect&redeliver=1")
+    first_session_id = session.session_id
+    messages = [session.get_message() for _ in range(3)]
+
+    while session.session_id == first_session_id:
+        time.sleep(0.01)
+    session.close()
+
+    assert [message.message_type for message in messages if message] == [
+        "notification",
+        "revocation",
+        "session_keepalive",
+    ]
+
+
+def test_reconnect_discards_messages_before_welcome() -> None:
+    session = get_session(URI + "?reconnect_path=/keepalive-first")
+    first_session_id = session.session_id
+    messages = [session.get_message() for _ in range(3)]
+
+    while session.session_id == first_session_id:
+        time.sleep(0.01)
+    session.close()
+
+    assert len(messages) == 3
+    assert list(session) == []
+
+
+def test_reconnect_welcome_timeout_keeps_current_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A handoff that is never welcomed keeps the session on its healthy connection."""
+    monkeypatch.setattr(eventclient_module, "_INITIAL_MESSAGE_TIMEOUT_SECONDS", 0.3)
+    session = get_session(URI + "?reconnect_path=/silent", reconnect_policy=NO_DELAY)
+    first_session_id = session.session_id
+
+    messages = [session.get_message(timeout=2.0) for _ in range(3)]
+    timeout_at = time.monotonic() + 2.0
+    while session.last_error is None and time.monotonic() < timeout_at:
+        time.sleep(0.01)
+    alive = session.thread.is_alive()
+    session.close()
+
+    assert [message.message_type for message in messages if message] == [
+        "notification",
+        "revocation",
+        "session_keepalive",
+    ]
+    assert isinstance(session.last_error, TimeoutError)
+    assert session.exception is None
+    assert session.session_id == first_session_id
+    assert alive
+
+
+def test_reconnect_connect_failure_keeps_current_connection(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    real_connect = websockets.sync.client.connect
+
+    def refuse_reconnect_url(uri: str) -> websockets.sync.client.ClientConnection:
+        if "old=" in uri:
+            raise ConnectionRefusedError("refused")
+        return real_connect(uri)
+
+    monkeypatch.setattr(eventclient_module.websockets.sync.client, "connect", refuse_reconnect_url)
+    session = get_session(URI)
+    first_session_id = session.session_id
+
+    messages = [session.get_message(timeout=2.0) for _ in range(3)]
+    session.close()
+
+    assert all(message is not None for message in messages)
+    assert isinstance(session.last_error, ConnectionRefusedError)
+    assert session.session_id == first_session_id
+
+
+def test_close_during_reconnect() -> None:
+    session = get_session(URI + "?reconnect_path=/silent")
+    time.sleep(0.2)
+
+    start = time.monotonic()
+    session.close()
+
+    assert time.monotonic() - start < 1.0
+
+
+def test_messages_before_welcome_are_discarded() -> None:
+    session = get_session(URI + "/keepalive-first")
+    session.close()
+
+    assert session.session_id.startswith("mock_session_id")
+    assert list(session) == []
+
+
+def test_recent_message_ids_forget_oldest() -> None:
+    recent_ids = eventclient_module._RecentMessageIds(max_size=2)
+
+    assert [recent_ids.add(message_id) for message_id in "abab"] == [True, True, False, False]
+    assert recent_ids.add("c") is True
+    assert recent_ids.add("a") is True
+
+
+def test_last_frame_age() -> None:
+    session = get_session(URI)
+    messages = [session.get_message() for _ in range(3)]
+    age = session.last_frame_age
+    time.sleep(0.2)
+    session.close()
+
+    assert len(messages) == 3
+    assert session.keepalive_timeout_seconds == 10
+    assert age < 1.0
+    assert session.last_frame_age >= 0.2
+
+
+def test_keepalive_watchdog_reconnects(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A session silent past its keepalive timeout opens a new connection."""
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    session = get_session(URI + "/no-reconnect?keepalive_timeout=0.2", reconnect_policy=NO_DELAY)
+    first_session_id = session.session_id
+
+    timeout_at = time.monotonic() + 2.0
+    while session.session_id == first_session_id and time.monotonic() < timeout_at:
+        time.sleep(0.01)
+    session.close()
+
+    assert session.session_id != first_session_id
+
+
+def test_last_frame_age_before_first_frame() -> None:
+    session = Session(URI, False)
+
+    assert session.last_frame_age == 0.0
+
+
+def test_on_reconnect_called_for_new_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    reconnected = threading.Event()
+    calls: list[tuple[str, str]] = []
+
+    def on_reconnect(session: Session, previous_session_id: str) -> None:
+        calls.append((previous_session_id, session.session_id))
+        reconnected.set()
+
+    session = get_session(
+        URI + "/no-reconnect?keepalive_timeout=0.2",
+        reconnect_policy=NO_DELAY,
+        on_reconnect=on_reconnect,
+    )
+    first_session_id = session.session_id
+
+    reconnected.wait(2.0)
+    session.close()
+
+    assert calls[0][0] == first_session_id
+    assert calls[0][1] != first_session_id
+    assert session.generation == len(calls)
+
+
+def test_on_reconnect_failure_is_logged(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    reconnected = threading.Event()
+
+    def on_reconnect(session: Session, previous_session_id: str) -> None:
+        reconnected.set()
+        raise ValueError("boom")
+
+    session = get_session(
+        URI + "/no-reconnect?keepalive_timeout=0.2",
+        reconnect_policy=NO_DELAY,
+        on_reconnect=on_reconnect,
+    )
+
+    reconnected.wait(2.0)
+    time.sleep(0.05)
+    alive = session.thread.is_alive()
+    session.close()
+
+    assert alive
+    assert session.exception is None
+    assert "on_reconnect callback failed" in caplog.text
+
+
+def test_handoff_does_not_notify() -> None:
+    calls: list[str] = []
+    session = get_session(URI, on_reconnect=lambda session, old: calls.append(old))
+    first_session_id = session.session_id
+
+    timeout_at = time.monotonic() + 2.0
+    while session.session_id == first_session_id and time.monotonic() < timeout_at:
+        time.sleep(0.01)
+    session.close()
+
+    assert session.session_id != first_session_id
+    assert calls == []
+    assert session.generation == 0
+
+
+def test_keepalive_watchdog_disabled_without_timeout() -> None:
+    session = Session(URI, False)
+    session.last_frame_at = time.monotonic() - 3600
+
+    assert eventclient_module._keepalive_expired(session) is False
+
+
+def test_retries_follow_reconnect_policy() -> None:
+    pattern = "Failed to establish connection to websocket server after 1 retries"
+    policy = ReconnectPolicy(max_retries=1, base_delay=0.0)
+
+    with pytest.raises(ConnectionError, match=pattern):
+        get_session("ws://localhost:9999", reconnect_policy=policy)
+
+
+def test_retry_count_resets_once_welcomed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A session reconnects any number of times, as long as each connection is welcomed."""
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    policy = ReconnectPolicy(max_retries=1, base_delay=0.0)
+    session = get_session(URI + "/no-reconnect?keepalive_timeout=0.1", reconnect_policy=policy)
+    session_ids = {session.session_id}
+
+    timeout_at = time.monotonic() + 3.0
+    while len(session_ids) < 4 and time.monotonic() < timeout_at:
+        session_ids.add(session.session_id)
+        time.sleep(0.01)
+    session.close()
+
+    assert len(session_ids) == 4
+    assert session.exception is None
+
+
+def test_close_interrupts_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    monkeypatch.setattr(reconnectpolicy_module.random, "uniform", lambda low, high: high)
+    policy = ReconnectPolicy(base_delay=60.0, max_delay=60.0)
+    session = get_session(URI + "/no-reconnect?keepalive_timeout=0.1", reconnect_policy=policy)
+
+    time.sleep(0.5)
+    start = time.monotonic()
+    session.close()
+
+    assert time.monotonic() - start < 1.0
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from eggbot_twitch.twitchevent import Message
+
+from .conftest import MOCK_HANDSHAKE_RESPONSE
+from .conftest import MOCK_KEEPALIVE_RESPONSE
+from .conftest import MOCK_NOTIFICATION_RESPONSE
+
+
+def test_parse_metadata() -> None:
+    raw = json.dumps(MOCK_HANDSHAKE_RESPONSE)
+
+    message = Message.parse(raw)
+
+    assert message.raw == raw
+    assert message.message_id == "c7f09613-7b34-4093-b44c-305c6a36bb04"
+    assert message.message_type == "session_welcome"
+    assert message.message_timestamp == "2025-09-09T03:19:44.99039766Z"
+    assert message.subscription_type == ""
+    assert message.subscription_version == ""
+
+
+def test_parse_payload() -> None:
+    message = Message.parse(json.dumps(MOCK_NOTIFICATION_RESPONSE))
+
+    assert message.subscription_type == "channel.follow"
+    assert message.subscription_version == "1"
+    assert message.payload == MOCK_NOTIFICATION_RESPONSE["payload"]
+
+
+def test_parse_empty_payload() -> None:
+    message = Message.parse(json.dumps(MOCK_KEEPALIVE_RESPONSE))
+
+    assert message.message_type == "session_keepalive"
+    assert message.payload == {}
+
+
+def test_parse_any_member_order() -> None:
+    contents = {"payload": {}, "metadata": MOCK_KEEPALIVE_RESPONSE["metadata"]}
+
+    message = Message.parse(json.dumps(contents))
+
+    assert message.message_type == "session_keepalive"
+    assert message.payload == {}
+
+
+def test_parse_missing_metadata() -> None:
+    with pytest.raises(KeyError):
+        Message.parse(json.dumps({"payload": {}}))
+
+
+def test_parse_invalid_frame() -> None:
+    with pytest.raises(ValueError):
+        Message.parse("not json")
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+import pytest
+
+from eggbot_twitch.twitchevent import OverflowPolicy
+from eggbot_twitch.twitchevent import QueueStats
+from eggbot_twitch.twitchevent._messagequeue import MessageQueue
+
+
+def test_get_batch_returns_all_queued() -> None:
+    message_queue: MessageQueue[int] = MessageQueue()
+    for item in range(5):
+        message_queue.put(item)
+
+    assert message_queue.get_batch() == [0, 1, 2, 3, 4]
+    assert message_queue.empty()
+
+
+def test_get_batch_max_items() -> None:
+    message_queue: MessageQueue[int] = MessageQueue()
+    for item in range(5):
+        message_queue.put(item)
+
+    assert message_queue.get_batch(max_items=2) == [0, 1]
+    assert message_queue.qsize() == 3
+
+
+def test_get_batch_waits_for_first_item() -> None:
+    """With nothing queued, the first put wakes the waiting caller."""
+    message_queue: MessageQueue[int] = MessageQueue()
+    timer = threading.Timer(0.1, message_queue.put, args=(1,))
+    timer.start()
+
+    result = message_queue.get_batch()
+    timer.join()
+
+    assert result == [1]
+
+
+def test_get_batch_waits_for_first_item_with_timeout() -> None:
+    message_queue: MessageQueue[int] = MessageQueue()
+    timer = threading.Timer(0.1, message_queue.put, args=(1,))
+    timer.start()
+
+    result = message_queue.get_batch(timeout=5.0)
+    timer.join()
+
+    assert result == [1]
+
+
+def test_get_batch_timeout() -> None:
+    message_queue: MessageQueue[int] = MessageQueue()
+
+    start = time.monotonic()
+    result = message_queue.get_batch(timeout=0.1)
+
+    assert result == []
+    assert time.monotonic() - start >= 0.1
+
+
+def test_get_batch_frees_space_for_blocked_put() -> None:
+    """Taking a batch from a full queue releases producers waiting to put."""
+    message_queue: MessageQueue[int] = MessageQueue(maxsize=1)
+    message_queue.put(0)
+    producer = threading.Thread(target=message_queue.put, args=(1,))
+    producer.start()
+
+    first = message_queue.get_batch()
+    producer.join(timeout=1.0)
+
+    assert first == [0]
+    assert not producer.is_alive()
+    assert message_queue.get_batch() == [1]
+
+
+@pytest.mark.parametrize("timeout", [None, 1.0])
+def test_get_batch_shutdown(timeout: float | None) -> None:
+    """A shut down, empty queue raises ShutDown, including to already waiting callers."""
+    message_queue: MessageQueue[int] = MessageQueue()
+    timer = threading.Timer(0.1, message_queue.shutdown)
+    timer.start()
+
+    with pytest.raises(queue.ShutDown):
+        message_queue.get_batch(timeout=timeout)
+
+    timer.join()
+
+    with pytest.raises(queue.ShutDown):
+        message_queue.get_batch(timeout=timeout)
+
+
+def test_block_policy_blocks_when_full() -> None:
+    message_queue: MessageQueue[int] = MessageQueue(maxsize=1)
+    message_queue.put(0)
+
+    with pytest.raises(queue.Full):
+        message_queue.put(1, timeout=0.01)
+
+    assert message_queue.stats == QueueStats(dropped=0, spilled=0)
+
+
+def test_drop_oldest_policy() -> None:
+    message_queue: MessageQueue[int] = MessageQueue(2, OverflowPolicy.DROP_OLDEST)
+    for item in range(5):
+        message_queue.put(item)
+
+    assert message_queue.get_batch() == [3, 4]
+    assert message_queue.stats == QueueStats(dropped=3, spilled=0)
+
+
+def test_drop_keepalive_policy_drops_droppable_first() -> None:
+    def is_odd(item: int) -> bool:
+        return item % 2 == 1
+
+    message_queue: MessageQueue[int] = MessageQueue(3, OverflowPolicy.DROP_KEEPALIVE, is_odd)
+    for item in (0, 1, 2):
+        message_queue.put(item)
+
+    message_queue.put(4)  # Queue holds no odd item after this
+    message_queue.put(5)  # Incoming odd item is dropped itself
+    message_queue.put(6)  # Nothing droppable left, oldest is dropped
+
+    assert message_queue.get_batch() == [2, 4, 6]
+    assert message_queue.stats == QueueStats(dropped=3, spilled=0)
+
+
+def test_drop_keepalive_policy_without_predicate_drops_oldest() -> None:
+    message_queue: MessageQueue[int] = MessageQueue(1, OverflowPolicy.DROP_KEEPALIVE)
+    message_queue.put(0)
+    message_queue.put(1)
+
+    assert message_queue.get() == 1
+
+
+def test_drop_policy_keeps_task_count() -> None:
+    message_queue: MessageQueue[int] = MessageQueue(1, OverflowPolicy.DROP_OLDEST)
+    message_queue.put(0)
+    message_queue.put(1)
+    message_queue.get()
+    message_queue.task_done()
+
+    message_queue.join()
+
+
+def test_spill_policy_keeps_order() -> None:
+    message_queue: MessageQueue[int] = MessageQueue(2, OverflowPolicy.SPILL)
+    for item in range(6):
+        message_queue.put(item)
+
+    assert message_queue.qsize() == 6
+    assert len(message_queue.queue) == 2
+    assert message_queue.get() == 0
+    message_queue.put(6)
+    assert message_queue.get_batch() == [1, 2, 3, 4, 5, 6]
+    assert message_queue.stats == QueueStats(dropped=0, spilled=5)
+
+
+def test_spill_policy_reuses_drained_file() -> None:
+    message_queue: MessageQueue[str] = MessageQueue(1, OverflowPolicy.SPILL)
+    for item in ("a", "b", "c"):
+        message_queue.put(item)
+    assert message_queue.get_batch() == ["a", "b", "c"]
+
+    for item in ("d", "e"):
+        message_queue.put(item)
+
+    assert message_queue.get_batch() == ["d", "e"]
+    assert message_queue.stats == QueueStats(dropped=0, spilled=3)
+
+
+def test_overflow_policy_put_after_shutdown() -> None:
+    message_queue: MessageQueue[int] = MessageQueue(1, OverflowPolicy.DROP_OLDEST)
+    message_queue.shutdown()
+
+    with pytest.raises(queue.ShutDown):
+        message_queue.put(0)
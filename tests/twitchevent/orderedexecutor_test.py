@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from eggbot_twitch.twitchevent import OrderedExecutor
+
+
+def test_same_key_runs_in_submission_order() -> None:
+    results: list[int] = []
+
+    with OrderedExecutor(max_workers=4) as executor:
+        for number in range(50):
+            executor.submit("key", results.append, number)
+
+    assert results == list(range(50))
+
+
+def test_slow_key_does_not_stall_other_keys() -> None:
+    release = threading.Event()
+    ran = threading.Event()
+    executor = OrderedExecutor(max_workers=2)
+
+    # Integers hash to themselves, so keys 0 and 1 land on different workers
+    executor.submit(0, release.wait)
+    future = executor.submit(1, ran.set)
+
+    assert ran.wait(1.0)
+    assert future.result(1.0) is None
+
+    release.set()
+    executor.shutdown()
+
+
+def test_full_queue_blocks_submit() -> None:
+    release = threading.Event()
+    executor = OrderedExecutor(max_workers=1, queue_size=1)
+    executor.submit("key", release.wait)
+    executor.submit("key", time.sleep, 0)
+    submitted = threading.Event()
+
+    def submit() -> None:
+        executor.submit("key", time.sleep, 0)
+        submitted.set()
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+
+    assert not submitted.wait(0.2)
+
+    release.set()
+    thread.join()
+    executor.shutdown()
+
+    assert submitted.is_set()
+
+
+def test_future_captures_exception() -> None:
+    with OrderedExecutor(max_workers=1) as executor:
+        future = executor.submit("key", int, "not a number")
+
+    assert isinstance(future.exception(), ValueError)
+
+
+def test_cancelled_work_is_skipped() -> None:
+    release = threading.Event()
+    results: list[int] = []
+    executor = OrderedExecutor(max_workers=1)
+    executor.submit("key", release.wait)
+    future = executor.submit("key", results.append, 1)
+
+    assert future.cancel()
+
+    release.set()
+    executor.shutdown()
+
+    assert results == []
+
+
+def test_submit_after_shutdown_raises() -> None:
+    executor = OrderedExecutor(max_workers=1)
+    executor.shutdown(wait=False)
+
+    with pytest.raises(RuntimeError):
+        executor.submit("key", print)
+
+
+def test_max_workers_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        OrderedExecutor(max_workers=0)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from eggbot_twitch.twitchevent import ReconnectPolicy
+from eggbot_twitch.twitchevent import _reconnectpolicy as reconnectpolicy_module
+
+
+def test_delay_grows_exponentially_to_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(reconnectpolicy_module.random, "uniform", lambda low, high: (low, high))
+    policy = ReconnectPolicy(base_delay=0.5, max_delay=3.0)
+
+    windows = [policy.delay(retry) for retry in range(5)]
+
+    assert windows == [(0.0, 0.5), (0.0, 1.0), (0.0, 2.0), (0.0, 3.0), (0.0, 3.0)]
+
+
+def test_delay_is_jittered_across_window() -> None:
+    policy = ReconnectPolicy(base_delay=1.0, max_delay=1.0)
+
+    delays = [policy.delay(5) for _ in range(200)]
+
+    assert all(0.0 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_delay_with_large_retry_count() -> None:
+    policy = ReconnectPolicy(base_delay=1.0, max_delay=2.0)
+
+    assert 0.0 <= policy.delay(10_000) <= 2.0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_retries": -1}, {"base_delay": -1.0}, {"max_delay": -1.0}],
+)
+def test_invalid_policy(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        ReconnectPolicy(**kwargs)  # type: ignore[arg-type]
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Hashable
+
+import pytest
+
+from eggbot_twitch.twitchevent import ReconnectPolicy
+from eggbot_twitch.twitchevent import ShardManager
+from eggbot_twitch.twitchevent import ShardPoolFullError
+from eggbot_twitch.twitchevent import _eventclient as eventclient_module
+from eggbot_twitch.twitchevent import _shardmanager as shardmanager_module
+from eggbot_twitch.twitchevent._session import Session
+
+from .conftest import URI
+
+
+def test_assign_least_loaded_and_open_when_full() -> None:
+    with ShardManager(URI, capacity=2) as manager:
+        first = manager.assign("a")
+        same = manager.assign("b")
+        second = manager.assign("c")
+        manager.release("a")
+        refilled = manager.assign("d")
+
+        assert first is same
+        assert second is not first
+        assert refilled is first
+        assert manager.assign("c") is second
+        assert manager.loads == {first.session_id: 2, second.session_id: 1}
+        assert manager.sessions == [first, second]
+
+
+def test_release_unknown_key() -> None:
+    with ShardManager(URI) as manager:
+        manager.release("missing")
+
+        assert manager.sessions == []
+
+
+def test_merged_stream_from_all_sessions() -> None:
+    manager = ShardManager(URI, capacity=1)
+    manager.assign("a")
+    manager.assign("b")
+    threading.Timer(0.5, manager.close).start()
+
+    messages = list(manager)
+
+    assert len(messages) == 6
+    assert sum(message.message_type == "notification" for message in messages) == 2
+
+
+def test_dead_session_keys_are_reassigned(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    reassigned: list[tuple[Hashable, Session]] = []
+    moved = threading.Event()
+
+    def on_reassign(key: Hashable, session: Session) -> None:
+        reassigned.append((key, session))
+        moved.set()
+
+    manager = ShardManager(
+        URI + "/no-reconnect?keepalive_timeout=0.1",
+        on_reassign=on_reassign,
+        reconnect_policy=ReconnectPolicy(max_retries=0),
+    )
+    first = manager.assign("a")
+
+    assert moved.wait(2.0)
+    manager.close()
+
+    assert reassigned[0][0] == "a"
+    assert reassigned[0][1] is not first
+    assert first not in manager.sessions
+
+
+def test_failed_reassignment_is_logged(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    manager = ShardManager(
+        URI + "/no-reconnect?keepalive_timeout=0.1",
+        reconnect_policy=ReconnectPolicy(max_retries=0),
+    )
+    manager.assign("a")
+    monkeypatch.setattr(manager, "uri", "ws://localhost:9999")
+
+    timeout_at = time.monotonic() + 2.0
+    while manager.sessions and time.monotonic() < timeout_at:
+        time.sleep(0.01)
+    manager.close()
+
+    assert manager.sessions == []
+    assert manager.loads == {}
+
+
+def test_reconnected_session_keys_are_reassigned(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keys of a session that started over are created again on the same session."""
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    reassigned: list[tuple[Hashable, Session]] = []
+    moved = threading.Event()
+
+    def on_reassign(key: Hashable, session: Session) -> None:
+        reassigned.append((key, session))
+        moved.set()
+
+    manager = ShardManager(
+        URI + "/no-reconnect?keepalive_timeout=0.2",
+        on_reassign=on_reassign,
+        reconnect_policy=ReconnectPolicy(base_delay=0.0),
+    )
+    first = manager.assign("a")
+    first_session_id = first.session_id
+
+    assert moved.wait(2.0)
+    manager.close()
+
+    assert reassigned[0] == ("a", first)
+    assert first.session_id != first_session_id
+
+
+def test_reconnect_without_keys_is_ignored(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(eventclient_module, "_KEEPALIVE_GRACE_SECONDS", 0.0)
+    manager = ShardManager(
+        URI + "/no-reconnect?keepalive_timeout=0.2",
+        reconnect_policy=ReconnectPolicy(base_delay=0.0),
+    )
+    session = manager.assign("a")
+    manager.release("a")
+    first_session_id = session.session_id
+
+    timeout_at = time.monotonic() + 2.0
+    while session.session_id == first_session_id and time.monotonic() < timeout_at:
+        time.sleep(0.01)
+    manager.close()
+
+    assert session.session_id != first_session_id
+
+
+def test_assign_does_not_block_while_opening(monkeypatch: pytest.MonkeyPatch) -> None:
+    opening = threading.Event()
+    proceed = threading.Event()
+    real_get_session = shardmanager_module.get_session
+
+    def slow_get_session(*args: object, **kwargs: object) -> Session:
+        opening.set()
+        proceed.wait(2.0)
+        return real_get_session(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(shardmanager_module, "get_session", slow_get_session)
+    manager = ShardManager(URI)
+    assigner = threading.Thread(target=manager.assign, args=("a",))
+    assigner.start()
+
+    opening.wait(2.0)
+    sessions_while_opening = manager.sessions
+    proceed.set()
+    assigner.join()
+    loads = manager.loads
+    manager.close()
+
+    assert sessions_while_opening == []
+    assert list(loads.values()) == [1]
+
+
+def test_close_while_opening(monkeypatch: pytest.MonkeyPatch) -> None:
+    opening = threading.Event()
+    proceed = threading.Event()
+    opened: list[Session] = []
+    errors: list[Exception] = []
+    real_get_session = shardmanager_module.get_session
+
+    def slow_get_session(*args: object, **kwargs: object) -> Session:
+        opening.set()
+        proceed.wait(2.0)
+        opened.append(real_get_session(*args, **kwargs))  # type: ignore[arg-type]
+        return opened[0]
+
+    def assign() -> None:
+        try:
+            manager.assign("a")
+
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    monkeypatch.setattr(shardmanager_module, "get_session", slow_get_session)
+    manager = ShardManager(URI)
+    assigner = threading.Thread(target=assign)
+    assigner.start()
+
+    opening.wait(2.0)
+    manager.close()
+    proceed.set()
+    assigner.join()
+
+    assert len(errors) == 1
+    assert manager.sessions == []
+    assert not opened[0].active
+
+
+def test_reassign_without_callback() -> None:
+    with ShardManager(URI) as manager:
+        manager._reassign(["a", "b"])
+
+        assert list(manager.loads.values()) == [2]
+
+
+def test_reassign_stops_once_closed() -> None:
+    reassigned: list[Hashable] = []
+    manager = ShardManager(URI, on_reassign=lambda key, session: reassigned.append(key))
+    manager.close()
+
+    manager._reassign(["a"])
+
+    assert reassigned == []
+
+
+def test_assign_beyond_max_sessions_raises() -> None:
+    with ShardManager(URI, capacity=1, max_sessions=1) as manager:
+        manager.assign("a")
+
+        with pytest.raises(ShardPoolFullError):
+            manager.assign("b")
+
+        assert len(manager.sessions) == 1
+
+
+def test_assign_waits_for_session_being_opened(monkeypatch: pytest.MonkeyPatch) -> None:
+    """At max_sessions, a key should wait for the session being opened to join the pool."""
+    opened: list[Session] = []
+    real_get_session = shardmanager_module.get_session
+
+    def slow_get_session(*args: object, **kwargs: object) -> Session:
+        time.sleep(0.2)
+        opened.append(real_get_session(*args, **kwargs))  # type: ignore[arg-type]
+        return opened[-1]
+
+    monkeypatch.setattr(shardmanager_module, "get_session", slow_get_session)
+    manager = ShardManager(URI, capacity=2, max_sessions=1)
+    sessions: list[Session] = []
+    assigners = [
+        threading.Thread(target=lambda key=key: sessions.append(manager.assign(key)))
+        for key in ("a", "b")
+    ]
+    for assigner in assigners:
+        assigner.start()
+    for assigner in assigners:
+        assigner.join()
+    manager.close()
+
+    assert len(opened) == 1
+    assert sessions == [opened[0], opened[0]]
+
+
+def test_failed_open_frees_its_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    manager = ShardManager("ws://localhost:9999", max_sessions=1)
+    monkeypatch.setattr(eventclient_module, "_CONNECTION_TIMEOUT_SECONDS", 0.1)
+
+    for _ in range(2):
+        with pytest.raises((ConnectionError, TimeoutError)):
+            manager.assign("a")
+
+    manager.close()
+
+
+def test_reassign_continues_after_callback_failure(caplog: pytest.LogCaptureFixture) -> None:
+    reassigned: list[Hashable] = []
+
+    def on_reassign(key: Hashable, session: Session) -> None:
+        reassigned.append(key)
+        raise ValueError("boom")
+
+    with ShardManager(URI, on_reassign=on_reassign) as manager:
+        manager._reassign(["a", "b"])
+
+    assert reassigned == ["a", "b"]
+    assert "on_reassign callback failed for a" in caplog.text
+
+
+def test_reassign_into_full_pool_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    with ShardManager(URI, capacity=1, max_sessions=1) as manager:
+        manager.assign("a")
+        manager._reassign(["b"])
+
+        assert manager.loads == {manager.sessions[0].session_id: 1}
+
+    assert "Failed to reassign b" in caplog.text
+
+
+def test_assign_after_close_raises() -> None:
+    manager = ShardManager(URI)
+    manager.close()
+
+    with pytest.raises(RuntimeError):
+        manager.assign("a")
+
+
+def test_capacity_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        ShardManager(URI, capacity=0)
+
+
+def test_max_sessions_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        ShardManager(URI, max_sessions=0)